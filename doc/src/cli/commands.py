@@ -268,6 +268,55 @@ def run_pipeline(
         return 1
 
 
+def run_tts_worker(
+    language: str,
+    queue_path: str,
+    config_dir: str = "./configs",
+    output_dir: str = "./output",
+    verbose: bool = False
+) -> int:
+    """
+    Run a TTS worker against a shared work queue until it is drained.
+    
+    Several workers can run at once, on this host or on others sharing the
+    queue database and output directory.
+    
+    Args:
+        language: Locale whose TTS settings and voices to use
+        queue_path: Queue database created by a queued tts step
+        config_dir: Configuration directory
+        output_dir: Output directory
+        verbose: Enable verbose output
+        
+    Returns:
+        Exit code (0 for success)
+    """
+    from tts.tts_worker import TTSWorker
+    
+    if not Path(queue_path).exists():
+        print_error(f"TTS queue not found: {queue_path}")
+        return 1
+    
+    try:
+        config_loader = ConfigLoader(config_dir, output_dir, use_timestamp=False)
+        config = config_loader.load_language(language)
+        config.verbose = verbose
+        
+        print_info(f"Starting TTS worker for {language} on {queue_path}")
+        stats = asyncio.run(TTSWorker(config, Path(queue_path)).run())
+        print_info(f"TTS worker finished: {stats['done']} done, {stats['retried']} retried, "
+                   f"{stats['failed']} failed, {stats['lost']} lost to expired leases")
+        return 0
+        
+    except ValueError as e:
+        print_error(f"Configuration error: {e}")
+        return 1
+    except Exception as e:
+        print_error(f"TTS worker failed: {e}")
+        logger.exception("TTS worker error")
+        return 1
+
+
 def list_languages(config_dir: str = "./configs") -> int:
     """
     List all available language configurations.
@@ -32,6 +32,7 @@ from cli.utils import (
 from config.config_loader import ConfigLoader
 from config.locale_manager import LocaleConfigManager
 from tts.voice_validator import VoiceValidator
+from tts.artifact_manifest import ArtifactManifest, MANIFEST_FILENAME
 from cli.voice_quality_commands import VoiceQualityManager
 
 
@@ -434,12 +435,7 @@ class InteractiveUI:
                     # Check subdirectories in each timestamp
                     subdirs = ['conversations', 'audio', 'final']
                     for subdir in subdirs:
-                        subdir_path = ts_dir / subdir
-                        if subdir_path.exists():
-                            file_count = len(list(subdir_path.rglob('*')))
-                            print(f"    ✓ {subdir}: {file_count} files")
-                        else:
-                            print(f"    ✗ {subdir}: not found")
+                        self._print_subdir_status(ts_dir / subdir)
                 
                 if len(timestamp_dirs) > 5:
                     print(f"\n  ... and {len(timestamp_dirs) - 5} more generation(s)")
@@ -455,17 +451,37 @@ class InteractiveUI:
                 if has_old_structure:
                     print("  Found old directory structure (without timestamps):")
                     for subdir in subdirs:
-                        subdir_path = output_path / subdir
-                        if subdir_path.exists():
-                            file_count = len(list(subdir_path.rglob('*')))
-                            print(f"    ✓ {subdir}: {file_count} files")
-                        else:
-                            print(f"    ✗ {subdir}: not found")
+                        self._print_subdir_status(output_path / subdir)
                 else:
                     print("  ✗ No generations found")
         else:
             print("  ✗ Output directory does not exist")
     
+    def _print_subdir_status(self, subdir_path: Path):
+        """
+        Print the status line for one output subdirectory.
+        
+        Audio directories with artifact manifests are summarized from the
+        manifests instead of walking every conversation folder.
+        """
+        if not subdir_path.exists():
+            print(f"    ✗ {subdir_path.name}: not found")
+            return
+        
+        manifest_paths = sorted(subdir_path.glob(f"*/{MANIFEST_FILENAME}"))
+        if not manifest_paths:
+            file_count = len(list(subdir_path.rglob('*')))
+            print(f"    ✓ {subdir_path.name}: {file_count} files")
+            return
+        
+        for manifest_path in manifest_paths:
+            summary = ArtifactManifest(manifest_path.parent).summary()
+            file_count = sum(summary["artifacts"].values())
+            status = "✓" if summary["incomplete"] == 0 else "⚠"
+            print(f"    {status} {subdir_path.name}/{manifest_path.parent.name}: "
+                  f"{summary['complete']} complete, {summary['incomplete']} incomplete conversations "
+                  f"({file_count} files, {summary['total_bytes'] / 1_048_576:.1f} MB)")
+    
     def _view_recent_runs(self):
         """View information about recent pipeline runs."""
         print_info("Recent runs feature not yet implemented.")
@@ -132,6 +132,60 @@ class Config:
     # Voice profiles for intelligent voice assignment (optional)
     voice_profiles: Optional[Dict] = None
     
+    # Audio assembly backend: "numpy" (single-pass buffer) or "pydub" (legacy)
+    audio_combiner_backend: str = "numpy"
+    
+    # TTS engine: "elevenlabs" or "local" (offline tone synthesizer for development/load tests)
+    voice_backend: str = "elevenlabs"
+    
+    # TTS request batching: "off", "stitch" (previous/next text) or "merge" (same-speaker runs)
+    voice_batch_mode: str = "off"
+    
+    # Intermediate audio between TTS and packaging: "memory" (combine -> effects -> 16 kHz
+    # in one pass, only the final file is written) or "files" (combined WAV on disk)
+    voice_intermediate_storage: str = "memory"
+    voice_keep_combined_wav: bool = False  # Also write the full-rate combined WAV in memory mode
+    voice_debug_flac: bool = False  # FLAC copy of the combined audio for debugging
+    
+    # Queued TTS: plan jobs into a SQLite work queue and drain it with worker processes
+    voice_work_queue: bool = False
+    voice_queue_local_workers: int = 2  # Worker processes started on this host (0 = external workers only)
+    voice_worker_concurrency: int = 5  # Jobs in flight per worker
+    voice_queue_visibility_timeout: float = 300.0  # Seconds before an unacked job is handed out again
+    voice_queue_max_attempts: int = 3
+    
+    # Voice scheduler: balance voice assignments by load and TTS error rate, with state
+    # persisted per locale across runs (random selection when disabled)
+    voice_scheduler_enabled: bool = True
+    voice_scheduler_state_file: Optional[Path] = None
+    
+    # Worker processes for the packaging resample stage (None = CPU count)
+    post_processing_resample_workers: Optional[int] = None
+    
+    # Audio ZIP packaging: "stored" or "deflated", and number of shard archives
+    post_processing_zip_compression: str = "stored"
+    post_processing_zip_shards: int = 1
+    
+    # Translation memory: per-sentence translations cached in SQLite and shared by all
+    # translators, keyed by service, model, language pair and normalized source text
+    translation_memory_enabled: bool = True
+    translation_memory_path: Optional[Path] = None
+    
+    # Segments per translation batch: Qwen-MT delimited requests and Google batch calls
+    # (1 = one request per turn)
+    translation_batch_size: int = 1
+    
+    # Concurrent translation requests (Google thread pool size, Qwen request limit)
+    max_concurrent_translations: int = 10
+    
+    # Resume interrupted file/conversation translations from their progress sidecar
+    translation_resume: bool = True
+    
+    # Argos: never download packages or the package index (offline), and worker
+    # processes for file translation, each holding the model resident (0 = in-process)
+    translation_argos_offline: bool = False
+    translation_argos_workers: int = 0
+    
     # Locale identifier (e.g., 'ms-my', 'ar-sa')
     locale: Optional[str] = None
     
@@ -340,7 +394,9 @@ class ConfigLoader:
         
         if not openai_api_key:
             raise ValueError("OPENAI_API_KEY environment variable not set")
-        if not elevenlabs_api_key:
+        # The offline TTS backend does not need an ElevenLabs key
+        voice_backend = self.common_config["voice_generation"].get("backend", "elevenlabs")
+        if not elevenlabs_api_key and voice_backend == "elevenlabs":
             raise ValueError("ELEVENLABS_API_KEY environment variable not set")
         
         # Extract locale info
@@ -418,6 +474,9 @@ class ConfigLoader:
         # Add LLM settings
         llm_config = self.common_config.get("llm", {})
         
+        # Translation cache settings (file cache and sentence-level memory)
+        translation_cache_config = self.common_config.get("translation_cache", {})
+        
         # Apply CLI overrides for LLM settings
         if model_override:
             llm_config["model"] = model_override
@@ -438,7 +497,7 @@ class ConfigLoader:
         return Config(
             # Environment variables
             openai_api_key=openai_api_key,
-            elevenlabs_api_key=elevenlabs_api_key,
+            elevenlabs_api_key=elevenlabs_api_key or "",
             
             # Base paths
             base_dir=self.base_dir,
@@ -493,6 +552,19 @@ class ConfigLoader:
                 "background_noise_level": 0.3,
                 "call_end_volume": 0.5
             }),
+            audio_combiner_backend=self.common_config["voice_generation"].get("combiner_backend", "numpy"),
+            voice_backend=voice_backend,
+            voice_batch_mode=self.common_config["voice_generation"].get("batch_mode", "off"),
+            voice_intermediate_storage=self.common_config["voice_generation"].get("intermediate_audio", {}).get("storage", "memory"),
+            voice_keep_combined_wav=self.common_config["voice_generation"].get("intermediate_audio", {}).get("keep_combined_wav", False),
+            voice_debug_flac=self.common_config["voice_generation"].get("intermediate_audio", {}).get("debug_flac", False),
+            voice_work_queue=self.common_config["voice_generation"].get("work_queue", {}).get("enabled", False),
+            voice_queue_local_workers=self.common_config["voice_generation"].get("work_queue", {}).get("local_workers", 2),
+            voice_worker_concurrency=self.common_config["voice_generation"].get("work_queue", {}).get("worker_concurrency", 5),
+            voice_queue_visibility_timeout=self.common_config["voice_generation"].get("work_queue", {}).get("visibility_timeout_seconds", 300.0),
+            voice_queue_max_attempts=self.common_config["voice_generation"].get("work_queue", {}).get("max_attempts", 3),
+            voice_scheduler_enabled=self.common_config["voice_generation"].get("voice_scheduler", {}).get("enabled", True),
+            voice_scheduler_state_file=self.output_dir / locale_id / "voice_scheduler.json",
             
             # Enhanced voice settings
             voice_stability=self.common_config["voice_generation"]["voice_settings"]["stability"],
@@ -519,6 +591,19 @@ class ConfigLoader:
             post_processing_legit_audio_zip_output=legit_audio_zip,
             post_processing_scam_label=self.common_config["post_processing"]["scam_label"],
             post_processing_legit_label=self.common_config["post_processing"]["legit_label"],
+            post_processing_resample_workers=self.common_config["post_processing"].get("resample_workers"),
+            post_processing_zip_compression=self.common_config["post_processing"].get("zip_compression", "stored"),
+            post_processing_zip_shards=self.common_config["post_processing"].get("zip_shards", 1),
+            
+            # Translation memory
+            translation_memory_enabled=translation_cache_config.get("memory_enabled", True),
+            translation_memory_path=(self.base_dir / translation_cache_config.get("cache_dir", "data/translation_cache")
+                                     / translation_cache_config.get("memory_file", "translation_memory.sqlite")),
+            translation_batch_size=self.common_config.get("translation", {}).get("batch_size", 1),
+            max_concurrent_translations=self.common_config.get("translation", {}).get("max_concurrent_translations", 10),
+            translation_resume=self.common_config.get("translation", {}).get("resume", True),
+            translation_argos_offline=self.common_config.get("translation", {}).get("argos", {}).get("offline", False),
+            translation_argos_workers=self.common_config.get("translation", {}).get("argos", {}).get("workers", 0),
             
             # LLM settings
             llm_provider=llm_config.get("provider", "openai"),
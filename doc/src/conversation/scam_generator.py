@@ -17,6 +17,9 @@ from src.conversation.schemas import ScamConversationResponse
 from src.conversation.seed_manager import SeedManager, ScamSeed
 from src.conversation.character_manager import CharacterManager
 from src.utils.logging_utils import ConditionalLogger
+from src.utils.placeholder_engine import PlaceholderEngine
+# Same module path as the tts package, so generation and TTS share one scheduler registry
+from tts.voice_scheduler import get_voice_scheduler
 
 
 logger = logging.getLogger(__name__)
@@ -118,6 +121,12 @@ class ScamGenerator:
         else:
             self.placeholder_json_compact = "{}"
         
+        # Compiled map for filling placeholder tags the model leaves in the dialogue
+        self.placeholder_engine = PlaceholderEngine(
+            {name: mapping.get('substitutions', []) for name, mapping in self.placeholder_mappings.items()},
+            seed=getattr(config, 'generation_random_seed', None)
+        )
+        
         # Pre-compute locale-static prompt section for optimal caching
         self.locale_static_prompt = self._build_locale_static_prompt()
         self.clogger.debug(f"Pre-computed locale-static prompt for {config.language} ({config.region})")
@@ -502,6 +511,12 @@ Select contextually appropriate values from the arrays and incorporate them natu
         # Save conversations
         self._save_conversations(all_conversations)
         
+        # Persist voice assignment counts for later runs and the TTS stage
+        if getattr(self.config, 'voice_scheduler_enabled', False):
+            get_voice_scheduler(
+                self.config.voice_scheduler_state_file, getattr(self.config, 'voice_profiles', None)
+            ).save()
+        
         # Add small delay to allow async cleanup
         await asyncio.sleep(0.1)
         
@@ -602,41 +617,88 @@ Select contextually appropriate values from the arrays and incorporate them natu
                 # Legacy format - just dialogue list
                 conversation["dialogue"] = dialogue
             
+            # Fill placeholder tags the model copied from the seed instead of localizing
+            if self.placeholder_engine and conversation["dialogue"]:
+                filled_texts = self.placeholder_engine.fill_conversation(
+                    [turn["text"] for turn in conversation["dialogue"]], conversation_id
+                )
+                for turn, filled_text in zip(conversation["dialogue"], filled_texts):
+                    turn["text"] = filled_text
+            
             # Add voice mapping from character profiles if available
             if character_profiles and self.character_manager:
-                scammer_voice = self.character_manager.get_voice_for_profile(character_profiles["scammer"].profile_id)
-                victim_voice = self.character_manager.get_voice_for_profile(character_profiles["victim"].profile_id)
-                
-                if scammer_voice and victim_voice:
-                    # Check for voice duplication and reassign if necessary
-                    if scammer_voice == victim_voice:
-                        # Get alternative voice for victim from available voices
-                        if hasattr(self.config, 'voice_profiles') and self.config.voice_profiles:
-                            available_voices = []
-                            if 'available_voices' in self.config.voice_profiles:
-                                available_voices = list(self.config.voice_profiles['available_voices'].keys())
-                            elif 'character_voice_mappings' in self.config.voice_profiles:
-                                # Get unique voices from mappings
-                                available_voices = list(set(self.config.voice_profiles['character_voice_mappings'].values()))
-                            
-                            # Filter out the scammer's voice and select an alternative
-                            alternative_voices = [v for v in available_voices if v != scammer_voice]
-                            if alternative_voices:
-                                victim_voice = random.choice(alternative_voices)
-                                self.clogger.debug(f"Voice collision detected for conversation {conversation_id}, reassigned victim voice to {victim_voice}")
-                            else:
-                                self.clogger.warning(f"Voice collision detected but no alternative voices available for conversation {conversation_id}")
-                    
-                    conversation["voice_mapping"] = {
-                        "caller": scammer_voice,  # Scammer is always the caller
-                        "callee": victim_voice    # Victim is always the callee
-                    }
-                    self.clogger.debug(f"Assigned voices for conversation {conversation_id}: caller={scammer_voice}, callee={victim_voice}")
+                voice_mapping = self._assign_voices(character_profiles, conversation_id)
+                if voice_mapping:
+                    conversation["voice_mapping"] = voice_mapping
+                    self.clogger.debug(f"Assigned voices for conversation {conversation_id}: "
+                                     f"caller={voice_mapping['caller']}, callee={voice_mapping['callee']}")
             
             return conversation
         
         return None
 
+    def _assign_voices(self, character_profiles: Dict, conversation_id: int) -> Optional[Dict[str, str]]:
+        """
+        Pick caller and callee voices for a conversation's character profiles.
+        
+        With the voice scheduler enabled, each role gets the least loaded healthy
+        voice matching its profile's gender and age range (falling back to the
+        mapped voice's attributes when the profile allows any). Otherwise the
+        profile's mapped voice is used, re-drawing the victim voice on a collision.
+        
+        Args:
+            character_profiles: Dictionary with "scammer" and "victim" profiles
+            conversation_id: Conversation ID for logging
+            
+        Returns:
+            Dictionary with "caller" and "callee" voice names, or None if no mapping applies
+        """
+        scammer = character_profiles["scammer"]
+        victim = character_profiles["victim"]
+        scammer_voice = self.character_manager.get_voice_for_profile(scammer.profile_id)
+        victim_voice = self.character_manager.get_voice_for_profile(victim.profile_id)
+        voice_profiles = getattr(self.config, 'voice_profiles', None) or {}
+        available_voices = list(voice_profiles.get('available_voices', {}).keys())
+        
+        if getattr(self.config, 'voice_scheduler_enabled', False) and available_voices:
+            scheduler = get_voice_scheduler(self.config.voice_scheduler_state_file, voice_profiles)
+            
+            def constraints(profile, mapped_voice):
+                gender = profile.gender if profile.gender != "any" else scheduler.voice_gender(mapped_voice)
+                age_range = profile.age_range if profile.age_range != "any" else scheduler.voice_age(mapped_voice)
+                return gender, age_range
+            
+            caller = scheduler.choose(available_voices, *constraints(scammer, scammer_voice))
+            callee = scheduler.choose(available_voices, *constraints(victim, victim_voice),
+                                      exclude=[caller] if caller else [])
+            if caller and callee:
+                return {"caller": caller, "callee": callee}
+            self.clogger.warning(f"Voice scheduler found no voices for conversation {conversation_id}; "
+                                 f"using mapped voices")
+        
+        if not (scammer_voice and victim_voice):
+            return None
+        
+        # Check for voice duplication and reassign if necessary
+        if scammer_voice == victim_voice:
+            # Get alternative voice for victim from available voices
+            if not available_voices and 'character_voice_mappings' in voice_profiles:
+                # Get unique voices from mappings
+                available_voices = list(set(voice_profiles['character_voice_mappings'].values()))
+            
+            # Filter out the scammer's voice and select an alternative
+            alternative_voices = [v for v in available_voices if v != scammer_voice]
+            if alternative_voices:
+                victim_voice = random.choice(alternative_voices)
+                self.clogger.debug(f"Voice collision detected for conversation {conversation_id}, reassigned victim voice to {victim_voice}")
+            else:
+                self.clogger.warning(f"Voice collision detected but no alternative voices available for conversation {conversation_id}")
+        
+        return {
+            "caller": scammer_voice,  # Scammer is always the caller
+            "callee": victim_voice    # Victim is always the callee
+        }
+
     async def _generate_dialogue(self, seed_text: str, num_turns: int,
                                 victim_awareness: str, scam_type: str = None,
                                 character_profiles: Dict = None) -> Optional[List[Dict]]:
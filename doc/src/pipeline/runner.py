@@ -23,6 +23,8 @@ logging.getLogger("asyncio").setLevel(logging.CRITICAL)
 from src.conversation.scam_generator import ScamGenerator
 from src.conversation.legit_generator import LegitGenerator
 from src.tts.voice_synthesizer import VoiceSynthesizer
+from src.tts.work_queue import TTSWorkQueue, QUEUE_FILENAME
+from src.tts.tts_worker import run_local_workers
 from src.postprocessing.json_formatter import JsonFormatter
 from src.postprocessing.audio_packager import AudioPackager
 from src.utils.logging_utils import format_completion_message
@@ -217,6 +219,10 @@ class PipelineRunner:
             files_found.append("legit_conversations.json")
         logger.info(f"Found conversation files: {', '.join(files_found)}")
         
+        if getattr(self.config, 'voice_work_queue', False):
+            await self._run_queued_tts(synthesizer, scam_exists, legit_exists)
+            return
+        
         # Process scam audio if file exists
         if scam_exists:
             if self.config.verbose:
@@ -237,6 +243,51 @@ class PipelineRunner:
                 is_scam=False
             )
     
+    async def _run_queued_tts(self, synthesizer: VoiceSynthesizer, scam_exists: bool, legit_exists: bool):
+        """
+        Queue TTS jobs for the available conversation files and drain the queue with worker processes.
+        
+        Args:
+            synthesizer: Synthesizer used to plan requests and pick voices
+            scam_exists: Whether the scam conversation file exists
+            legit_exists: Whether the legit conversation file exists
+        """
+        queue_path = self.config.output_dir / QUEUE_FILENAME
+        queue = TTSWorkQueue(
+            queue_path,
+            visibility_timeout=self.config.voice_queue_visibility_timeout,
+            max_attempts=self.config.voice_queue_max_attempts
+        )
+        try:
+            if scam_exists:
+                synthesizer.enqueue_audio(
+                    self.config.voice_input_file_scam, self.config.voice_output_dir_scam, queue, is_scam=True
+                )
+            if legit_exists:
+                synthesizer.enqueue_audio(
+                    self.config.voice_input_file_legit, self.config.voice_output_dir_legit, queue, is_scam=False
+                )
+        finally:
+            queue.close()
+        
+        workers = self.config.voice_queue_local_workers
+        if workers < 1:
+            print(f"TTS jobs queued in {queue_path}. Start workers with: "
+                  f"python main.py --locale {self.config.locale} --tts-worker {queue_path}")
+            return
+        
+        logger.info(f"Draining TTS queue {queue_path} with {workers} local workers")
+        totals = await asyncio.to_thread(run_local_workers, self.config, queue_path, workers)
+        
+        queue = TTSWorkQueue(queue_path)
+        try:
+            counts = queue.counts()
+        finally:
+            queue.close()
+        logger.info(f"TTS workers finished: {totals}; queue: {counts}")
+        if counts.get("failed"):
+            print(f"\n⚠️  {counts['failed']} TTS job(s) failed after retries. See {queue_path} for errors.")
+    
     def run_postprocessing(self):
         """Run postprocessing: format JSON and package audio."""
         if self.config.verbose:
@@ -7,17 +7,96 @@ import logging
 import os
 import subprocess
 import random
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Tuple, Optional
 
 from config.config_loader import Config
+from tts.audio_io import read_wav, write_wav, to_float32, resample
+from tts.audio_index import AudioIndex, get_audio_index, audio_stats
 from utils.logging_utils import ConditionalLogger
 import shutil 
 
 logger = logging.getLogger(__name__)
 
 
+# Target format for packaged audio
+TARGET_SAMPLE_RATE = 16000
+# Only final processed conversation files are packaged, so only they are resampled
+RESAMPLE_PATTERN = "*_final.wav"
+# Read size when streaming files into ZIP archives
+ZIP_CHUNK_SIZE = 1024 * 1024
+# PCM audio barely compresses, so archives are stored by default
+ZIP_COMPRESSION_METHODS = {
+    "stored": zipfile.ZIP_STORED,
+    "deflated": zipfile.ZIP_DEFLATED
+}
+
+
+def resample_file(input_path: str, output_path: str,
+                  sample_rate: int = TARGET_SAMPLE_RATE) -> Tuple[str, str, Optional[str], Optional[Dict]]:
+    """
+    Resample a WAV file to mono at the target rate, in-process with ffmpeg as fallback.
+    
+    Runs in worker processes, so it must stay a module-level function.
+    
+    Args:
+        input_path: Source WAV file
+        output_path: Destination WAV file
+        sample_rate: Target sample rate in Hz
+        
+    Returns:
+        Tuple of (input path, status, error message, audio stats of the output)
+        where status is "copied", "resampled", "ffmpeg" or "failed"; stats are
+        None when the output could not be read back
+    """
+    tmp_path = output_path + ".tmp"
+    try:
+        samples, rate = read_wav(input_path)
+        if samples.ndim == 1 and rate == sample_rate:
+            # Already in the target format (e.g. produced by the in-memory effects chain)
+            shutil.copyfile(input_path, tmp_path)
+            os.replace(tmp_path, output_path)
+            return input_path, "copied", None, audio_stats(samples, rate)
+        
+        audio = to_float32(samples)
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1)
+        resampled = resample(audio, rate, sample_rate)
+        write_wav(tmp_path, resampled, sample_rate)
+        os.replace(tmp_path, output_path)
+        return input_path, "resampled", None, audio_stats(resampled, sample_rate)
+    except Exception as e:
+        in_process_error = str(e)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    
+    # Fallback for files the in-process reader cannot handle
+    command = [
+        "ffmpeg",
+        "-y",  # Overwrite output file if it exists
+        "-i", input_path,
+        "-ar", str(sample_rate),  # Set sample rate to 16kHz
+        "-ac", "1",      # Set to mono
+        "-b:a", "64k",   # Set audio bitrate to 64kbps
+        output_path
+    ]
+    try:
+        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if result.returncode == 0:
+            try:
+                samples, rate = read_wav(output_path)
+                stats = audio_stats(samples, rate)
+            except Exception:
+                stats = None
+            return input_path, "ffmpeg", None, stats
+        return input_path, "failed", f"{in_process_error}; ffmpeg: {result.stderr.decode(errors='ignore')[-200:]}", None
+    except Exception as e:
+        return input_path, "failed", f"{in_process_error}; ffmpeg: {e}", None
+
+
 class AudioPackager:
     """
     Packages audio files into ZIP archives for distribution.
@@ -32,6 +111,13 @@ class AudioPackager:
         """
         self.config = config
         self.clogger = ConditionalLogger(__name__, config.verbose)
+        self.resample_workers = getattr(config, 'post_processing_resample_workers', None) or os.cpu_count() or 1
+        compression = getattr(config, 'post_processing_zip_compression', 'stored')
+        if compression not in ZIP_COMPRESSION_METHODS:
+            raise ValueError(f"Unsupported zip compression '{compression}'. "
+                             f"Choose from: {', '.join(ZIP_COMPRESSION_METHODS)}")
+        self.zip_compression = ZIP_COMPRESSION_METHODS[compression]
+        self.zip_shards = getattr(config, 'post_processing_zip_shards', 1) or 1
         logger.info("Audio packager initialized")
         logger.info(f"Scam audio directory: {self.config.post_processing_scam_audio_dir}")
     
@@ -83,49 +169,136 @@ class AudioPackager:
     
     def _resample_audio_directory(self, root_dir: Path):
         """
-        Resample audio files in a directory structure.
+        Resample final audio files in a directory structure using a process pool.
+        
+        Outputs indexed for the source's current size and mtime are skipped, so
+        re-running the packager only touches conversations that changed.
         
         Args:
             root_dir: Root directory containing audio folders
         """
         self.clogger.info(f"Resampling audio files in {root_dir}")
-        # Loop over each folder in the root directory
-        for folder_name in os.listdir(root_dir):
-            folder_path = os.path.join(root_dir, folder_name)
-            if not os.path.isdir(folder_path):
+        
+        index = get_audio_index(root_dir)
+        pending = []
+        skipped = 0
+        in_place = 0
+        for folder_path in sorted(root_dir.iterdir()):
+            if not folder_path.is_dir():
                 continue
             
-            output_dir = folder_path  # Write resampled files to the same folder as the original files
+            # Write resampled files to the same folder as the original files
+            for file_path in sorted(folder_path.glob(RESAMPLE_PATTERN)):
+                row = index.get(file_path)
+                if self._is_target_format(row):
+                    # Packaged as is, no _sampled copy needed
+                    in_place += 1
+                    continue
+                output_path = file_path.with_name(f"{file_path.stem}_sampled.wav")
+                source_stat = file_path.stat()
+                if self._is_up_to_date(index, source_stat, output_path):
+                    skipped += 1
+                    continue
+                pending.append((str(file_path), str(output_path), source_stat))
+        
+        if not pending:
+            self.clogger.info(
+                f"All {skipped + in_place} audio files in {root_dir} are already resampled "
+                f"({in_place} already at {TARGET_SAMPLE_RATE} Hz mono)"
+            )
+            self._report_audio_statistics(root_dir)
+            return
+        
+        workers = max(1, min(self.resample_workers, len(pending)))
+        start_time = time.time()
+        inputs = [task[0] for task in pending]
+        outputs = [task[1] for task in pending]
+        
+        if workers == 1:
+            results = list(map(resample_file, inputs, outputs))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chunksize = max(1, len(pending) // (workers * 4))
+                results = list(executor.map(resample_file, inputs, outputs, chunksize=chunksize))
+        
+        duration = time.time() - start_time
+        status_counts = {}
+        for (_, output_path, source_stat), (input_path, status, error, stats) in zip(pending, results):
+            status_counts[status] = status_counts.get(status, 0) + 1
+            if status == "failed":
+                self.clogger.warning(f"Failed to resample {Path(input_path).name}: {error}")
+                continue
+            self.clogger.debug(f"Resampled {Path(input_path).name} ({status})")
             
-            # Loop over each file in the folder
-            for file_name in os.listdir(folder_path):
-                if file_name.lower().endswith('.wav'):
-                    if file_name.endswith('_sampled.wav'):
-                        continue
-                    file_path = os.path.join(folder_path, file_name)
-                    conversation_id_str = file_name.split(".")[0]
-                    output_path = os.path.join(output_dir, f"{conversation_id_str}_sampled.wav")
-
-                    self.clogger.debug(f"Resampling {file_name} to {output_path}")
-                    # Use ffmpeg to resample to 16kHz, mono, 64kbps
-                    command = [
-                        "ffmpeg",
-                        "-y",  # Overwrite output file if it exists
-                        "-i", file_path,
-                        "-ar", "16000",  # Set sample rate to 16kHz
-                        "-ac", "1",      # Set to mono
-                        "-b:a", "64k",   # Set audio bitrate to 64kbps
-                        output_path
-                    ]
-                    
-                    try:
-                        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                        if result.returncode == 0:
-                            self.clogger.info(f"Resampled {file_name} to {output_path}")
-                        else:
-                            self.clogger.warning(f"Failed to resample {file_name}: {result.stderr.decode()}")
-                    except Exception as e:
-                        self.clogger.error(f"Error resampling {file_name}: {e}")
+            if stats is not None:
+                # The source size and mtime this output was made from decide freshness on the next run
+                index.record_stats(
+                    Path(output_path), stats,
+                    source_size=source_stat.st_size, source_mtime_ns=source_stat.st_mtime_ns
+                )
+        
+        files_per_sec = len(pending) / duration if duration > 0 else float(len(pending))
+        summary = ", ".join(f"{count} {status}" for status, count in sorted(status_counts.items()))
+        self.clogger.info(
+            f"Resampled {len(pending)} files in {duration:.2f}s ({files_per_sec:.1f} files/sec, "
+            f"{workers} workers): {summary}; {skipped} already up to date, "
+            f"{in_place} already at {TARGET_SAMPLE_RATE} Hz mono",
+            force=True
+        )
+        self._report_audio_statistics(root_dir)
+    
+    def _report_audio_statistics(self, root_dir: Path):
+        """
+        Log dataset audio statistics from the audio index and compact it.
+        
+        Args:
+            root_dir: Audio output directory
+        """
+        index = get_audio_index(root_dir)
+        index.compact()
+        stats = index.summary("final")
+        if stats["files"]:
+            loudness = f"{stats['mean_rms_dbfs']:.1f} dBFS" if stats["mean_rms_dbfs"] is not None else "n/a"
+            self.clogger.info(
+                f"{root_dir.name}: {stats['files']} conversations, {stats['total_duration_hours']:.2f} h of audio "
+                f"(mean {stats['mean_duration_seconds']:.1f}s, {loudness})",
+                force=True
+            )
+    
+    def _is_target_format(self, row: Optional[Dict]) -> bool:
+        """
+        Check whether an audio index row describes a file already in the packaged format.
+        
+        Args:
+            row: Audio index row for the file, or None if not indexed
+            
+        Returns:
+            True if the file is 16 kHz mono
+        """
+        return row is not None and (row["sample_rate"], row["channels"]) == (TARGET_SAMPLE_RATE, 1)
+    
+    def _is_up_to_date(self, index: AudioIndex, source_stat: os.stat_result, output: Path) -> bool:
+        """
+        Check whether a resampled output was made from the current source file.
+        
+        Like the sound effect cache, this compares size as well as mtime, so a
+        source rewritten within the mtime resolution is still picked up.
+        
+        Args:
+            index: Audio index of the output directory
+            source_stat: Current stat of the source audio file
+            output: Resampled output file
+            
+        Returns:
+            True if the output is indexed, unchanged since, and was made from a
+            source of the same size and mtime
+        """
+        row = index.get(output)  # None if the output is missing or changed after indexing
+        return (
+            row is not None
+            and row.get("source_size") == source_stat.st_size
+            and row.get("source_mtime_ns") == source_stat.st_mtime_ns
+        )
     
     def _package_scam_audio(self):
         """
@@ -172,7 +345,7 @@ class AudioPackager:
     def _collect_audio_files(self, audio_dir: Path) -> List[Tuple[Path, str]]:
         """
         Collect all final audio files from conversation subdirectories.
-        Prioritizes resampled files in _sampled directories.
+        Uses final files already at 16 kHz mono, otherwise their resampled copies.
         
         Args:
             audio_dir: Base audio directory
@@ -181,25 +354,26 @@ class AudioPackager:
             List of (file_path, archive_name) tuples
         """
         files_to_zip = []
+        index = get_audio_index(audio_dir)
         
         for subdir in audio_dir.iterdir():
             if subdir.is_dir() and subdir.name.startswith("conversation_"):
-                # Prefer the "_sampled.wav" version if it exists, otherwise use the original version
-                for pattern in ["*_final_sampled.wav"]:
-                    final_files = list(subdir.glob(pattern))
-                    
-                    if final_files:
-                        # Use the first matching file
-                        file_path = final_files[0]
-                        # Rename the file for the archive: remove '_final_sampled' from the filename and use '.wav'
-                        new_file_name = file_path.name.replace('_final_sampled', '').replace('_combined', '')
-                        new_file_path = file_path.parent / new_file_name
-                        if not new_file_path.exists():
-                            file_path.rename(new_file_path)
-                        file_path = new_file_path
-                        archive_name = f"{subdir.name}_{new_file_name}"
-                        files_to_zip.append((file_path, archive_name))
-                        break
+                # Final files already at 16 kHz mono are packaged directly; others
+                # through the "_sampled.wav" copy made by the resampling stage
+                final_files = [
+                    path for path in subdir.glob(RESAMPLE_PATTERN)
+                    if self._is_target_format(index.get(path))
+                ] or list(subdir.glob("*_final_sampled.wav"))
+                
+                if final_files:
+                    # Use the first matching file
+                    file_path = final_files[0]
+                    # Name the archive entry without '_final_sampled'/'_final'; the file on disk
+                    # keeps its name so the resampling stage can tell it is up to date
+                    new_file_name = (file_path.name.replace('_final_sampled', '')
+                                     .replace('_final', '').replace('_combined', ''))
+                    archive_name = f"{subdir.name}_{new_file_name}"
+                    files_to_zip.append((file_path, archive_name))
 
         if not files_to_zip:
             self.clogger.warning(f"No audio files found to package in {audio_dir}")
@@ -210,7 +384,7 @@ class AudioPackager:
     
     def _create_zip(self, files_to_zip: List[Tuple[Path, str]], output_path: Path):
         """
-        Create a ZIP archive with the specified files.
+        Create a ZIP archive (or several shard archives) with the specified files.
         Sets random creation dates between 2025-07-01 and 2025-07-15.
         
         Args:
@@ -224,23 +398,54 @@ class AudioPackager:
         start_date = datetime(2025, 7, 1)
         end_date = datetime(2025, 7, 15)
         
-        # Create ZIP file
-        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for file_path, archive_name in files_to_zip:
-                # Generate random date between 2025-07-01 and 2025-07-15
-                random_days = random.randint(0, (end_date - start_date).days)
-                random_date = start_date + timedelta(days=random_days)
-                
-                # Add random time within the day
-                random_hours = random.randint(0, 23)
-                random_minutes = random.randint(0, 59)
-                random_seconds = random.randint(0, 59)
-                random_date = random_date.replace(
-                    hour=random_hours, 
-                    minute=random_minutes, 
-                    second=random_seconds
-                )
-                
+        # Draw dates up front so shard workers don't share the random generator
+        entries = []
+        for file_path, archive_name in files_to_zip:
+            # Generate random date between 2025-07-01 and 2025-07-15
+            random_days = random.randint(0, (end_date - start_date).days)
+            random_date = start_date + timedelta(days=random_days)
+            
+            # Add random time within the day
+            random_hours = random.randint(0, 23)
+            random_minutes = random.randint(0, 59)
+            random_seconds = random.randint(0, 59)
+            random_date = random_date.replace(
+                hour=random_hours, 
+                minute=random_minutes, 
+                second=random_seconds
+            )
+            entries.append((file_path, archive_name, random_date))
+        
+        shard_count = max(1, min(self.zip_shards, len(entries)))
+        if shard_count == 1:
+            self._write_zip_shard(entries, output_path)
+            archives = [output_path]
+        else:
+            archives = [
+                output_path.with_name(f"{output_path.stem}_part{index + 1:02d}{output_path.suffix}")
+                for index in range(shard_count)
+            ]
+            shards = [entries[index::shard_count] for index in range(shard_count)]
+            with ThreadPoolExecutor(max_workers=shard_count) as executor:
+                list(executor.map(self._write_zip_shard, shards, archives))
+        
+        # Log file size
+        for archive in archives:
+            size_mb = archive.stat().st_size / (1024 * 1024)
+            self.clogger.debug(f"Created ZIP archive: {archive} ({size_mb:.1f} MB)")
+    
+    def _write_zip_shard(self, entries: List[Tuple[Path, str, datetime]], output_path: Path):
+        """
+        Stream files into a single ZIP archive in fixed-size chunks.
+        
+        Memory use is bounded by ZIP_CHUNK_SIZE regardless of file size or count.
+        
+        Args:
+            entries: List of (file_path, archive_name, date) tuples
+            output_path: Path for the output ZIP file
+        """
+        with zipfile.ZipFile(output_path, 'w', self.zip_compression) as zipf:
+            for file_path, archive_name, random_date in entries:
                 self.clogger.debug(f"Adding {archive_name} to archive with date {random_date}")
                 
                 # Create ZipInfo with custom date
@@ -253,11 +458,9 @@ class AudioPackager:
                     random_date.minute,
                     random_date.second
                 )
+                zip_info.compress_type = self.zip_compression
+                zip_info.file_size = file_path.stat().st_size
                 
-                # Read file content and add to zip with custom date
-                with open(file_path, 'rb') as f:
-                    zipf.writestr(zip_info, f.read())
-        
-        # Log file size
-        size_mb = output_path.stat().st_size / (1024 * 1024)
-        self.clogger.debug(f"Created ZIP archive: {output_path} ({size_mb:.1f} MB)")
\ No newline at end of file
+                # Copy file content into the archive in chunks
+                with open(file_path, 'rb') as src, zipf.open(zip_info, 'w') as dst:
+                    shutil.copyfileobj(src, dst, ZIP_CHUNK_SIZE)
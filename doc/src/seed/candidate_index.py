@@ -0,0 +1,110 @@
+"""
+Local TF-IDF retrieval of OLD candidate rows for the seed deduper.
+
+All rows (OLD and NEW) are vectorized once into a sparse TF-IDF matrix of
+word unigrams and bigrams over "summary + seed". For a NEW row, cosine
+similarity against the OLD rows of the same type is one sparse product, and
+only the top-k OLD rows go on to the LLM. No network access is needed.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def row_text(row: Dict[str, Any]) -> str:
+    """Text used for retrieval: summary and seed together."""
+    return f"{row['summary']} {row['seed']}"
+
+
+def tokenize(text: str, ngram: int = 2) -> List[str]:
+    """Lowercased word n-grams from 1 up to ngram words."""
+    words = TOKEN_PATTERN.findall(text.lower())
+    terms = list(words)
+    for n in range(2, ngram + 1):
+        terms.extend(" ".join(words[i:i + n]) for i in range(len(words) - n + 1))
+    return terms
+
+
+class CandidateIndex:
+    """
+    TF-IDF index over OLD rows, grouped by type, queried with NEW rows.
+
+    Term weights use sublinear term frequency (1 + log tf) and smoothed IDF
+    fitted on OLD and NEW rows together; every row vector is L2-normalized,
+    so a dot product is the cosine similarity.
+    """
+
+    def __init__(self, old_rows: List[Dict[str, Any]], new_rows: Iterable[Dict[str, Any]], ngram: int = 2):
+        rows = list(old_rows) + list(new_rows)
+        counts = [Counter(tokenize(row_text(r), ngram)) for r in rows]
+
+        vocabulary: Dict[str, int] = {}
+        doc_freq: List[int] = []
+        for c in counts:
+            for term in c:
+                if term not in vocabulary:
+                    vocabulary[term] = len(vocabulary)
+                    doc_freq.append(0)
+                doc_freq[vocabulary[term]] += 1
+        idf = np.log((1 + len(rows)) / (1 + np.asarray(doc_freq, dtype=np.float64))) + 1.0
+
+        indptr, indices, data = [0], [], []
+        for c in counts:
+            cols = [vocabulary[term] for term in c]
+            weights = np.array([1.0 + math.log(tf) for tf in c.values()]) * idf[cols] if cols else np.array([])
+            norm = np.linalg.norm(weights)
+            indices.extend(cols)
+            data.extend((weights / norm) if norm else weights)
+            indptr.append(len(indices))
+        matrix = csr_matrix((data, indices, indptr), shape=(len(rows), len(vocabulary)))
+
+        # Row position by id, and OLD positions grouped by type
+        self.matrix = matrix
+        self.position = {r["id"]: i for i, r in enumerate(rows)}
+        self.old_by_type: Dict[str, List[Dict[str, Any]]] = {}
+        for r in old_rows:
+            self.old_by_type.setdefault(str(r["type"]), []).append(r)
+        self._old_matrix = {
+            t: matrix[[self.position[r["id"]] for r in group]]
+            for t, group in self.old_by_type.items()
+        }
+
+    def scores(self, new_row: Dict[str, Any]) -> np.ndarray:
+        """Cosine similarity of new_row to every OLD row of its type, in OLD order."""
+        t = str(new_row["type"])
+        if t not in self._old_matrix:
+            return np.zeros(0)
+        query = self.matrix[self.position[new_row["id"]]]
+        return (self._old_matrix[t] @ query.T).toarray().ravel()
+
+    def top_k(self, new_row: Dict[str, Any], k: int,
+              exclude: Optional[Set[int]] = None) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Nearest OLD rows of the same type.
+
+        Only the k best are sorted (argpartition), not the whole type group.
+
+        Args:
+            new_row: Query row (must have been indexed)
+            k: Number of candidates (0 = all, ranked)
+            exclude: OLD ids to skip (removed or consumed)
+
+        Returns:
+            (old_row, score) pairs, best first; ties keep OLD order
+        """
+        group = self.old_by_type.get(str(new_row["type"]), [])
+        sims = self.scores(new_row)
+        keep = np.array([r["id"] not in exclude for r in group], dtype=bool) if exclude else np.ones(len(group), bool)
+        positions = np.flatnonzero(keep)
+        if k and len(positions) > k:
+            positions = positions[np.argpartition(-sims[positions], k - 1)[:k]]
+        # Best score first, then OLD order
+        positions = positions[np.lexsort((positions, -sims[positions]))]
+        return [(group[i], float(sims[i])) for i in positions]
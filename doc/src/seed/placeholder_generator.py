@@ -3,8 +3,26 @@ from llm_core.api_provider import LLM
 from llm_core.api_call import make_api_call
 from tqdm import tqdm
 import json
+import math
 import asyncio
 import os
+import re
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Placeholders every seed uses; always offered to the LLM
+REQUIRED_PLACEHOLDERS = ["<caller_name>", "<callee_name>"]
+
+def normalize_placeholder_name(name):
+    """
+    Canonical form of a placeholder name, so that "<Bank Name>", "bank-name" and
+    "<bank_name>" all map to "<bank_name>".
+    """
+    core = re.sub(r"[^a-z0-9]+", "_", name.strip().strip("<>").lower()).strip("_")
+    return f"<{core}>"
+
+def _tokens(text):
+    return set(TOKEN_PATTERN.findall(text.lower()))
 
 class PlaceholderGenerator:
     """
@@ -13,7 +31,8 @@ class PlaceholderGenerator:
       2) propose new ones (with name + description + example).
     """
 
-    def __init__(self, seeds_path, seeds_and_placeholders_path=None, placeholders_path=None):
+    def __init__(self, seeds_path, seeds_and_placeholders_path=None, placeholders_path=None,
+                 max_concurrent=1, catalog_top_k=0):
         """
         seeds_path: path to a JSON file containing newly generated seeds that need placeholders
 
@@ -24,12 +43,27 @@ class PlaceholderGenerator:
         placeholders_path: path to a JSON file containing the catalog of placeholders,
         if the file already exists, we will load from it, otherwise start with a default list.
         If None, defaults to "placeholders.json".
+
+        max_concurrent: seeds processed in parallel per wave. With 1, seeds are processed
+        one at a time and each sees every placeholder added before it.
+
+        catalog_top_k: if >0, offer the LLM only this many catalog placeholders per seed,
+        ranked by lexical similarity to the seed (plus <caller_name>/<callee_name>),
+        instead of the whole catalog.
         """
         self.seeds_and_placeholders_path = seeds_and_placeholders_path or "seeds_and_placeholders.json"
         self.placeholders_path = placeholders_path or "placeholders.json"
 
+        self.max_concurrent = max(1, max_concurrent)
+        self.catalog_top_k = catalog_top_k
+
         self.seeds = self.load_seeds(seeds_path)
         self.placeholders = self.initialize_placeholders()
+        # Normalized name -> catalog name, used to merge proposals that differ only in spelling
+        self.name_index = {}
+        for placeholder in self.placeholders:
+            self.name_index.setdefault(normalize_placeholder_name(placeholder["placeholder_name"]),
+                                       placeholder["placeholder_name"])
         self.seeds_and_placeholders = self.initialize_seeds_and_placeholders()
 
         self.llm = LLM(provider="openai", model="gpt-5", use_response_api=True).get_llm()
@@ -90,6 +124,8 @@ class PlaceholderGenerator:
             return default_placeholders
 
     async def generate_placeholders_for_seeds(self):
+        if self.max_concurrent > 1:
+            return await self._generate_placeholders_in_waves()
         results = self.seeds_and_placeholders
         for seed_record in tqdm(self.seeds, desc="Generating placeholders"):
             try:
@@ -110,22 +146,95 @@ class PlaceholderGenerator:
             json.dump(results, f, indent=4, ensure_ascii=False)
         return results
 
+    async def _generate_placeholders_in_waves(self):
+        """
+        Process seeds in waves of max_concurrent parallel LLM calls.
+
+        Every seed in a wave sees the catalog as it was when the wave started.
+        Responses are then merged in seed order, so proposals from the same wave
+        are deduplicated through the normalized-name index before the next wave.
+        """
+        results = self.seeds_and_placeholders
+        with tqdm(total=len(self.seeds), desc="Generating placeholders") as pbar:
+            for start in range(0, len(self.seeds), self.max_concurrent):
+                wave = self.seeds[start:start + self.max_concurrent]
+                responses = await asyncio.gather(
+                    *(self._request_placeholders(seed_record["seed"]) for seed_record in wave),
+                    return_exceptions=True
+                )
+                for seed_record, response in zip(wave, responses):
+                    if isinstance(response, Exception):
+                        print(f"Error generating placeholders for seed '{seed_record['seed']}': {response}")
+                        continue
+                    placeholders = self._merge_placeholders(response)
+                    if placeholders:
+                        results.append({
+                            "type": seed_record["type"],
+                            "summary": seed_record["summary"],
+                            "seed": seed_record["seed"],
+                            "placeholders": placeholders}
+                        )
+                pbar.update(len(wave))
+
+        with open(self.seeds_and_placeholders_path, "w") as f:
+            json.dump(results, f, indent=4, ensure_ascii=False)
+        return results
+
     async def _generate_placeholders_from_one_seed(self, seed):
         """
         Ask the LLM to select existing placeholders and add new ones.
         Returns a flat list of placeholder NAMES used for this seed.
         """
+        response = await self._request_placeholders(seed)
+        return self._merge_placeholders(response)
 
+    async def _request_placeholders(self, seed):
+        """Send one seed, with the relevant part of the catalog, to the LLM."""
         system_prompt = self._create_system_prompt()
-        user_prompt = self._create_user_prompt(seed)
+        user_prompt = self._create_user_prompt(seed, self._catalog_subset(seed))
 
-        response = await make_api_call(
+        return await make_api_call(
             llm=self.llm,
             system_prompt=system_prompt,
             user_prompt=user_prompt,
             response_schema=PlaceholderCandidate
         )
 
+    def _catalog_subset(self, seed):
+        """
+        Catalog placeholders to offer for a seed.
+
+        With catalog_top_k, entries are ranked by the IDF-weighted overlap of their
+        name/description/example words with the seed; the required placeholders
+        are always kept, and catalog order is preserved.
+        """
+        if not self.catalog_top_k or len(self.placeholders) <= self.catalog_top_k:
+            return self.placeholders
+
+        entry_tokens = [
+            _tokens(f"{p['placeholder_name']} {p.get('description', '')} {p.get('example', '')}")
+            for p in self.placeholders
+        ]
+        doc_freq = {}
+        for tokens in entry_tokens:
+            for token in tokens:
+                doc_freq[token] = doc_freq.get(token, 0) + 1
+        seed_tokens = _tokens(seed)
+        n = len(self.placeholders)
+
+        def score(i):
+            return sum(math.log((1 + n) / (1 + doc_freq[t])) + 1.0 for t in entry_tokens[i] & seed_tokens)
+
+        required = {i for i, p in enumerate(self.placeholders) if p["placeholder_name"] in REQUIRED_PLACEHOLDERS}
+        ranked = sorted((i for i in range(n) if i not in required), key=lambda i: (-score(i), i))
+        keep = required | set(ranked[:max(0, self.catalog_top_k - len(required))])
+        return [p for i, p in enumerate(self.placeholders) if i in keep]
+
+    def _merge_placeholders(self, response):
+        """
+        Validate an LLM response and merge its new placeholders into the catalog.
+        Returns a flat list of placeholder NAMES used for this seed.
+        """
         placeholders_for_this_seed = []
 
         selected = list(response.selected_placeholders)
@@ -139,7 +248,8 @@ class PlaceholderGenerator:
         # We want to ensure:
         # 1) The total number of placeholders (selected + added) is between 4 and 6.
         # 2) The selected placeholders are unique and in the provided list.
-        # 3) The added placeholders are unique and not already in the provided list.
+        # 3) The added placeholders are unique and not already in the provided list
+        #    (names are compared in normalized form; a re-proposed one maps to the catalog entry).
         # 4) <caller_name> and <callee_name> are always included.
 
         # check 1)
@@ -148,21 +258,26 @@ class PlaceholderGenerator:
                   "which is outside the ideal range of 4 to 6.")
 
         # check 2)
-        existed_placeholder_names = list(set([p["placeholder_name"] for p in self.placeholders]))
         for selected_placeholder in selected:
-            if selected_placeholder in existed_placeholder_names:
-                placeholders_for_this_seed.append(selected_placeholder)
-            else:
+            name = self.name_index.get(normalize_placeholder_name(selected_placeholder))
+            if name is None:
                 print(f"Warning: Selected placeholder '{selected_placeholder}' not found in provided list -> Skipped.")
+            elif name not in placeholders_for_this_seed:
+                placeholders_for_this_seed.append(name)
 
         # Check 3)
         for added_placeholder in added:
-            if added_placeholder["placeholder_name"] not in existed_placeholder_names:
-                placeholders_for_this_seed.append(added_placeholder["placeholder_name"])
+            key = normalize_placeholder_name(added_placeholder["placeholder_name"])
+            if key not in self.name_index:
+                added_placeholder["placeholder_name"] = key
                 self.placeholders.append(added_placeholder)
-                existed_placeholder_names.append(added_placeholder["placeholder_name"])
+                self.name_index[key] = key
+                placeholders_for_this_seed.append(key)
             else:
-                print(f"Warning: Placeholder '{added_placeholder['placeholder_name']}' already exists -> Skipped.")
+                name = self.name_index[key]
+                print(f"Warning: Placeholder '{added_placeholder['placeholder_name']}' already exists as '{name}' -> Reused.")
+                if name not in placeholders_for_this_seed:
+                    placeholders_for_this_seed.append(name)
 
         # Check 4)
         if "<caller_name>" not in placeholders_for_this_seed:
@@ -174,11 +289,12 @@ class PlaceholderGenerator:
 
         return placeholders_for_this_seed
 
-    def _create_user_prompt(self, seed: str):
+    def _create_user_prompt(self, seed: str, placeholders=None):
+        placeholders = self.placeholders if placeholders is None else placeholders
         provided_placeholders_str = ", ".join(
             f"{p['placeholder_name']} (e.g., {p['example']})"
-            for p in self.placeholders
-        ) if self.placeholders else "(none)"
+            for p in placeholders
+        ) if placeholders else "(none)"
 
         return (
             f"Seed: {seed}\n"
@@ -209,7 +325,7 @@ class PlaceholderGenerator:
 
 # Example usage:
 if __name__ == "__main__":
-    generator = PlaceholderGenerator(seeds_path="./seeds_scamGen_filtered.json")
+    generator = PlaceholderGenerator(seeds_path="./seeds_scamGen_filtered.json", max_concurrent=8, catalog_top_k=30)
     asyncio.run(generator.generate_placeholders_for_seeds())
     with open(generator.placeholders_path, "w") as f:
         json.dump(generator.placeholders, f, indent=4, ensure_ascii=False)
@@ -45,16 +45,25 @@ $ python3 scam_deduper_llm.py \
     --summary-threshold 0.80 \
     --seed-dup-threshold 0.92 \
     --seed-merge-threshold 0.85 \
-    --max-candidates 50
+    --max-candidates 10
 
 Notes:
 - Set --decision-mode to "llm" to trust the model's "decision" verbatim.
 - Set --decision-mode to "auto" (default) to derive the decision from the LLM similarity scores
   using the thresholds (still logs the model's suggested decision/rationale).
-- To limit cost, you can cap comparisons per NEW row with --max-candidates (top-K by a quick heuristic length/keyword match).
+- To limit cost, comparisons per NEW row are capped with --max-candidates (default 10; 0 compares every OLD row
+  of the same type). With --retrieval tfidf (default), all rows are vectorized once into a local TF-IDF index
+  (candidate_index.py, no network) and only the top-K nearest OLD rows are sent to the LLM; --retrieval heuristic
+  uses the older keyword-overlap/length-gap ranking. The audit reports how many comparisons were avoided.
+- Pass --async to judge all (NEW, candidate) pairs concurrently (--concurrency requests at a time) with the async
+  OpenAI client; decisions are still applied in NEW-row order, so results match the serial mode.
+- Verdicts are cached in --judgment-cache (JSONL keyed by a hash of model, prompt and both rows' content), so
+  re-running over a growing seed table only judges new pairs. Pass --judgment-cache "" to disable.
 """
 
 import argparse
+import asyncio
+import hashlib
 import json
 import os
 import sys
@@ -63,12 +72,16 @@ from typing import Dict, List, Any, Tuple, Set, Optional
 from dotenv import load_dotenv
 load_dotenv()
 
+from candidate_index import CandidateIndex
+from utils_async import run_concurrent_tasks
+
 try:
     # Official OpenAI Python SDK (v1+)
     # pip install --upgrade openai
-    from openai import OpenAI
+    from openai import OpenAI, AsyncOpenAI
 except Exception:
     OpenAI = None
+    AsyncOpenAI = None
 
 SYSTEM_PROMPT = """You are a meticulous data deduplication assistant. 
 You will be given two scam entries: an OLD canonical case and a NEW incoming case. 
@@ -105,46 +118,156 @@ summary: {new_summary}
 seed: {new_seed}
 """
 
+def build_messages(old_row: Dict[str, Any], new_row: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Chat messages asking the LLM to compare one OLD vs one NEW entry."""
+    content = USER_TEMPLATE.format(
+        old_type=str(old_row["type"]),
+        old_summary=str(old_row["summary"]),
+        old_seed=str(old_row["seed"]),
+        new_type=str(new_row["type"]),
+        new_summary=str(new_row["summary"]),
+        new_seed=str(new_row["seed"]),
+    )
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": content},
+    ]
+
+def parse_verdict(text: str) -> Dict[str, Any]:
+    """Parse and validate the LLM's JSON verdict."""
+    data = json.loads(text)
+    # Basic validation
+    for k in ["summary_similarity", "seed_similarity", "decision", "rationale"]:
+        if k not in data:
+            raise ValueError(f"LLM JSON missing key: {k}")
+    # Coerce numeric
+    data["summary_similarity"] = float(data["summary_similarity"])
+    data["seed_similarity"] = float(data["seed_similarity"])
+    # Normalize decision
+    data["decision"] = str(data["decision"]).lower().strip()
+    if data["decision"] not in {"duplicate", "distinct"}:
+        data["decision"] = "distinct"
+    return data
+
 def llm_compare(client, model: str, old_row: Dict[str, Any], new_row: Dict[str, Any], temperature: float = 0.0, max_retries: int = 3) -> Dict[str, Any]:
     """Call the LLM once to compare one OLD vs one NEW entry and return a parsed JSON dict."""
     last_err = None
     for _ in range(max_retries):
         try:
-            content = USER_TEMPLATE.format(
-                old_type=str(old_row["type"]),
-                old_summary=str(old_row["summary"]),
-                old_seed=str(old_row["seed"]),
-                new_type=str(new_row["type"]),
-                new_summary=str(new_row["summary"]),
-                new_seed=str(new_row["seed"]),
-            )
             resp = client.chat.completions.create(
                 model=model,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": content},
-                ],
+                messages=build_messages(old_row, new_row),
                 response_format={"type": "json_object"},
             )
-            text = resp.choices[0].message.content
-            data = json.loads(text)
-            # Basic validation
-            for k in ["summary_similarity", "seed_similarity", "decision", "rationale"]:
-                if k not in data:
-                    raise ValueError(f"LLM JSON missing key: {k}")
-            # Coerce numeric
-            data["summary_similarity"] = float(data["summary_similarity"])
-            data["seed_similarity"] = float(data["seed_similarity"])
-            # Normalize decision
-            data["decision"] = str(data["decision"]).lower().strip()
-            if data["decision"] not in {"duplicate", "distinct"}:
-                data["decision"] = "distinct"
-            return data
+            return parse_verdict(resp.choices[0].message.content)
         except Exception as e:
             last_err = e
             time.sleep(1.2)
     raise RuntimeError(f"LLM compare failed after retries: {last_err}")
 
+async def llm_compare_async(client, model: str, old_row: Dict[str, Any], new_row: Dict[str, Any], max_retries: int = 3) -> Dict[str, Any]:
+    """Async llm_compare for an AsyncOpenAI client."""
+    last_err = None
+    for _ in range(max_retries):
+        try:
+            resp = await client.chat.completions.create(
+                model=model,
+                messages=build_messages(old_row, new_row),
+                response_format={"type": "json_object"},
+            )
+            return parse_verdict(resp.choices[0].message.content)
+        except Exception as e:
+            last_err = e
+            await asyncio.sleep(1.2)
+    raise RuntimeError(f"LLM compare failed after retries: {last_err}")
+
+class JudgmentCache:
+    """
+    Verdicts on disk (JSONL), keyed by a hash of the model, the prompt and both rows' content.
+
+    Keys ignore row ids, which shift as the tables grow. Each new verdict is
+    appended as soon as it arrives, so an interrupted run keeps its progress.
+    """
+
+    def __init__(self, path: str, model: str):
+        self.path = path
+        self.model = model
+        self.verdicts: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self.verdicts[entry["key"]] = entry["verdict"]
+                    except (ValueError, KeyError, TypeError):
+                        continue  # partly written line from an interrupted run
+
+    def key(self, old_row: Dict[str, Any], new_row: Dict[str, Any]) -> str:
+        content = [self.model, SYSTEM_PROMPT, USER_TEMPLATE] + [
+            str(r[k]) for r in (old_row, new_row) for k in ("type", "summary", "seed")
+        ]
+        return hashlib.sha256(json.dumps(content, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def get(self, old_row: Dict[str, Any], new_row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        verdict = self.verdicts.get(self.key(old_row, new_row))
+        if verdict is not None:
+            self.hits += 1
+        return verdict
+
+    def put(self, old_row: Dict[str, Any], new_row: Dict[str, Any], verdict: Dict[str, Any]) -> None:
+        key = self.key(old_row, new_row)
+        self.verdicts[key] = verdict
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"key": key, "verdict": verdict}, ensure_ascii=False) + "\n")
+
+Pair = Tuple[Dict[str, Any], Dict[str, Any]]
+
+def judge_pairs(client, model: str, pairs: List[Pair], cache: Optional[JudgmentCache], temperature: float = 0.0) -> Dict[Tuple[int, int], Dict[str, Any]]:
+    """Judge (old_row, new_row) pairs one at a time. Returns verdicts keyed by (old id, new id)."""
+    verdicts = {}
+    for old_row, new_row in pairs:
+        verdict = cache.get(old_row, new_row) if cache else None
+        if verdict is None:
+            verdict = llm_compare(client, model, old_row, new_row, temperature=temperature)
+            if cache:
+                cache.put(old_row, new_row, verdict)
+        verdicts[(old_row["id"], new_row["id"])] = verdict
+    return verdicts
+
+async def judge_pairs_async(client, model: str, pairs: List[Pair], cache: Optional[JudgmentCache], max_concurrent: int) -> Dict[Tuple[int, int], Dict[str, Any]]:
+    """
+    Judge (old_row, new_row) pairs concurrently, at most max_concurrent requests at a time.
+
+    Cached pairs are not sent. If any pair still fails after retries, the
+    first error is raised once every request has finished; the verdicts that
+    did arrive are already in the cache for the next run.
+    """
+    verdicts = {}
+    todo: List[Pair] = []
+    for old_row, new_row in pairs:
+        verdict = cache.get(old_row, new_row) if cache else None
+        if verdict is None:
+            todo.append((old_row, new_row))
+        else:
+            verdicts[(old_row["id"], new_row["id"])] = verdict
+
+    async def judge(old_row, new_row):
+        verdict = await llm_compare_async(client, model, old_row, new_row)
+        if cache:
+            cache.put(old_row, new_row, verdict)
+        return verdict
+
+    results = await run_concurrent_tasks(
+        [judge(old_row, new_row) for old_row, new_row in todo], max_concurrent, description="Judging pairs"
+    )
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        raise RuntimeError(f"{len(errors)} of {len(todo)} comparisons failed; first error: {errors[0]}")
+    for (old_row, new_row), verdict in zip(todo, results):
+        verdicts[(old_row["id"], new_row["id"])] = verdict
+    return verdicts
+
 def load_rows(path: str) -> List[Dict[str, Any]]:
     with open(path, "r", encoding="utf-8") as f:
         data = json.load(f)
@@ -170,6 +293,14 @@ def assign_ids(old_rows: List[Dict[str, Any]], new_rows: List[Dict[str, Any]]) -
             r["id"] = next_id
         next_id = max(next_id, r["id"] + 1)
 
+def quick_score(new_row: Dict[str, Any], old_row: Dict[str, Any]) -> Tuple[int, int]:
+    """Crude ranking: shared lowercase tokens between summary+seed fields; tie-break by length gap."""
+    otext = (str(old_row["summary"]) + " " + str(old_row["seed"])).lower()
+    ntext = (str(new_row["summary"]) + " " + str(new_row["seed"])).lower()
+    overlap = len(set(otext.split()) & set(ntext.split()))
+    length_gap = abs(len(otext) - len(ntext))
+    return (overlap, -length_gap)
+
 def choose_best_match(judgments: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]]) -> Optional[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]]:
     """
     judgments is a list of tuples: (old_row, new_row, verdict_dict)
@@ -191,9 +322,16 @@ def main():
                         help="Use LLM's decision verbatim ('llm') or derive via thresholds ('auto').")
     parser.add_argument("--summary-threshold", type=float, default=0.80, help="Auto mode: min summary similarity to consider.")
     parser.add_argument("--seed-dup-threshold", type=float, default=0.92, help="Auto mode: seed >= this => duplicate.")
-    parser.add_argument("--max-candidates", type=int, default=0,
-                        help="If >0, limit OLD comparisons per NEW to this number via a quick heuristic (same type only).")
+    parser.add_argument("--max-candidates", type=int, default=10,
+                        help="If >0, send only the top-K retrieved OLD rows (same type) per NEW row to the LLM; 0 compares all.")
+    parser.add_argument("--retrieval", choices=["tfidf", "heuristic"], default="tfidf",
+                        help="Candidate ranking: local TF-IDF cosine similarity ('tfidf') or keyword overlap ('heuristic').")
     parser.add_argument("--temperature", type=float, default=0.0)
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Judge all pairs concurrently with the async client (decisions are still applied in order).")
+    parser.add_argument("--concurrency", type=int, default=8, help="Async mode: maximum LLM requests in flight.")
+    parser.add_argument("--judgment-cache", default="judgments_cache.jsonl",
+                        help="JSONL file caching verdicts by content hash; empty string disables.")
     args = parser.parse_args()
 
     if os.getenv("OPENAI_API_KEY") in (None, "", "YOUR_API_KEY"):
@@ -203,8 +341,6 @@ def main():
         print("ERROR: OpenAI SDK not installed. Run: pip install --upgrade openai", file=sys.stderr)
         sys.exit(2)
 
-    client = OpenAI()
-
     old_rows = load_rows(args.old)
     new_rows = load_rows(args.new)
 
@@ -216,6 +352,38 @@ def main():
     for r in old_rows:
         by_type_old.setdefault(str(r["type"]), []).append(r)
 
+    # Vectorize all rows once for candidate retrieval
+    index = CandidateIndex(old_rows, new_rows) if args.retrieval == "tfidf" and args.max_candidates else None
+    candidate_pairs = 0  # same-type (new, old) pairs that were available
+    llm_comparisons = 0
+
+    # Retrieve candidates for every NEW row up front (same type only)
+    plans: List[Tuple[Dict[str, Any], List[Dict[str, Any]], Dict[int, float]]] = []
+    for new_row in new_rows:
+        t = str(new_row["type"])
+        candidates = by_type_old.get(t, [])
+        candidate_pairs += len(candidates)
+        retrieval_scores: Dict[int, float] = {}
+
+        # Cap comparisons to the top-K retrieved OLD rows
+        if args.max_candidates and len(candidates) > args.max_candidates:
+            if index is not None:
+                ranked = index.top_k(new_row, args.max_candidates)
+                candidates = [r for r, _ in ranked]
+                retrieval_scores = {r["id"]: round(score, 4) for r, score in ranked}
+            else:
+                candidates = sorted(candidates, key=lambda r: quick_score(new_row, r), reverse=True)[: args.max_candidates]
+        llm_comparisons += len(candidates)
+        plans.append((new_row, candidates, retrieval_scores))
+
+    # Judge every (OLD candidate, NEW) pair once, reusing cached verdicts
+    pairs = [(old_row, new_row) for new_row, candidates, _ in plans for old_row in candidates]
+    cache = JudgmentCache(args.judgment_cache, args.model) if args.judgment_cache else None
+    if args.use_async:
+        verdicts = asyncio.run(judge_pairs_async(AsyncOpenAI(), args.model, pairs, cache, args.concurrency))
+    else:
+        verdicts = judge_pairs(OpenAI(), args.model, pairs, cache, temperature=args.temperature)
+
     # We will mark removed ids and collect appended merged rows
     removed: Set[int] = set()
     matches_report: List[Dict[str, Any]] = []  # for audit
@@ -223,30 +391,12 @@ def main():
     # Track "consumed" old rows that have been merged so they don't get reused
     consumed_old: Set[int] = set()
 
-    # Process each NEW row
-    for new_row in new_rows:
-        t = str(new_row["type"])
-        candidates = [r for r in by_type_old.get(t, []) if r["id"] not in removed and r["id"] not in consumed_old]
-
-        # Optional quick cap to reduce cost: simple heuristic - prioritize closer length & keyword overlap
-        if args.max_candidates and len(candidates) > args.max_candidates:
-            # crude score: shared lowercase tokens between summary+seed fields; tie-break by length gap
-            def quick_score(old_r):
-                otext = (str(old_r["summary"]) + " " + str(old_r["seed"])).lower()
-                ntext = (str(new_row["summary"]) + " " + str(new_row["seed"])).lower()
-                otoks = set(otext.split())
-                ntoks = set(ntext.split())
-                overlap = len(otoks & ntoks)
-                length_gap = abs(len(otext) - len(ntext))
-                return (overlap, -length_gap)
-            candidates = sorted(candidates, key=quick_score, reverse=True)[: args.max_candidates]
-
-        judgments: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]] = []
-
-        # Compare against each OLD candidate of same type
-        for old_row in candidates:
-            verdict = llm_compare(client, args.model, old_row, new_row, temperature=args.temperature)
-            judgments.append((old_row, new_row, verdict))
+    # Apply decisions in NEW-row order: removed/consumed_old depend on it
+    for new_row, candidates, retrieval_scores in plans:
+        candidates = [r for r in candidates if r["id"] not in removed and r["id"] not in consumed_old]
+        judgments: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]] = [
+            (old_row, new_row, verdicts[(old_row["id"], new_row["id"])]) for old_row in candidates
+        ]
 
         # If no OLD of same type, keep NEW as distinct
         if not judgments:
@@ -254,7 +404,9 @@ def main():
                 "new_id": new_row["id"],
                 "matched_old_id": None,
                 "decision_used": "distinct",
-                "llm_suggested": None
+                "llm_suggested": None,
+                "candidates_compared": 0,
+                "retrieval_score": None
             })
             continue
 
@@ -281,7 +433,9 @@ def main():
                 "new_id": new_row["id"],
                 "matched_old_id": old_row["id"],
                 "decision_used": "duplicate",
-                "llm_suggested": verdict
+                "llm_suggested": verdict,
+                "candidates_compared": len(candidates),
+                "retrieval_score": retrieval_scores.get(old_row["id"])
             })
 
         else:  # distinct
@@ -289,7 +443,9 @@ def main():
                 "new_id": new_row["id"],
                 "matched_old_id": old_row["id"],
                 "decision_used": "distinct",
-                "llm_suggested": verdict
+                "llm_suggested": verdict,
+                "candidates_compared": len(candidates),
+                "retrieval_score": retrieval_scores.get(old_row["id"])
             })
 
     # Build the final table:
@@ -300,6 +456,15 @@ def main():
     # Sort by type then id for neatness
     final_rows.sort(key=lambda r: (str(r["type"]), int(r["id"]) if isinstance(r["id"], int) else 999999))
 
+    retrieval_report = {
+        "method": args.retrieval if args.max_candidates else "none",
+        "max_candidates": args.max_candidates,
+        "candidate_pairs": candidate_pairs,
+        "llm_comparisons": llm_comparisons,
+        "comparisons_avoided": candidate_pairs - llm_comparisons,
+        "cached_judgments": cache.hits if cache else 0,
+    }
+
     # Write outputs
     with open(args.output, "w", encoding="utf-8") as f:
         json.dump(final_rows, f, ensure_ascii=False, indent=2)
@@ -307,6 +472,7 @@ def main():
     if args.audit:
         audit = {
             "removed": sorted(list(removed)),
+            "retrieval": retrieval_report,
             "matches": matches_report
         }
         with open(args.audit, "w", encoding="utf-8") as f:
@@ -316,6 +482,9 @@ def main():
     print(f"OLD rows: {len(old_rows)} | NEW rows: {len(new_rows)}")
     print(f"Removed: {len(removed)} -> {sorted(list(removed))[:10]}{'...' if len(removed) > 10 else ''}")
     print(f"Final table size: {len(final_rows)}")
+    print(f"LLM comparisons: {llm_comparisons} of {candidate_pairs} same-type pairs "
+          f"({candidate_pairs - llm_comparisons} avoided by {retrieval_report['method']} retrieval, "
+          f"{retrieval_report['cached_judgments']} answered from cache)")
     print(f"Wrote: {args.output}")
     if args.audit:
         print(f"Wrote audit: {args.audit}")
@@ -2,10 +2,15 @@
 Argos Translate implementation for the translation module with async support.
 """
 
+import time
 import logging
+import threading
 import asyncio
-import re
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
 import argostranslate.package
+import argostranslate.settings
 import argostranslate.translate
 
 from translation.translator import BaseTranslator
@@ -16,11 +21,76 @@ from translation.language_codes import get_language_code
 logger = logging.getLogger(__name__)
 
 
+# Refresh the cached package index only when it is older than this (and online)
+INDEX_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+# Lines per worker task when translating files
+WORKER_CHUNK_LINES = 64
+
+# Translations loaded in this process, keyed by (source, target) Argos codes
+_loaded_translations: Dict[Tuple[str, str], object] = {}
+_loaded_translations_lock = threading.Lock()
+
+
+def _load_translation(source_code: str, target_code: str):
+    """
+    Installed translation for a language pair, loaded once per process.
+    
+    Args:
+        source_code: Argos source language code
+        target_code: Argos target language code
+    
+    Returns:
+        Argos translation object, or None if the pair is not installed
+    """
+    key = (source_code, target_code)
+    with _loaded_translations_lock:
+        if key not in _loaded_translations:
+            languages = {lang.code: lang for lang in argostranslate.translate.get_installed_languages()}
+            from_lang, to_lang = languages.get(source_code), languages.get(target_code)
+            translation = from_lang.get_translation(to_lang) if from_lang and to_lang else None
+            if translation is None:
+                return None
+            _loaded_translations[key] = translation
+        return _loaded_translations[key]
+
+
+def _translate_lines(source_code: str, target_code: str, lines: List[str]) -> List[str]:
+    """
+    Translate a chunk of lines with the process's resident model.
+    
+    Module-level so it can run in a worker process.
+    
+    Args:
+        source_code: Argos source language code
+        target_code: Argos target language code
+        lines: Lines with placeholders already masked
+    
+    Returns:
+        Translated lines
+    """
+    translation = _load_translation(source_code, target_code)
+    if translation is None:
+        raise ValueError(f"Argos package {source_code} -> {target_code} is not installed")
+    return [translation.translate(line) for line in lines]
+
+
 class ArgosTranslator(BaseTranslator):
     """
     Argos Translate implementation of the translator interface with async support.
+    
+    Offline-first: installed packages are used as they are, and the package
+    index is only refreshed (when stale) to install a missing pair. Each
+    language pair's model is loaded once and kept resident. With worker
+    processes configured, file translation runs chunks of lines in parallel
+    processes that each hold their own copy of the model.
     """
     
+    service = "argos"
+    
+    # Distinct file lines handed to translate_batch at a time
+    file_batch_lines = WORKER_CHUNK_LINES
+    
     def __init__(self, config: Config):
         """
         Initialize the Argos translator.
@@ -29,45 +99,54 @@ class ArgosTranslator(BaseTranslator):
             config: Configuration object
         """
         super().__init__(config)
-        self.installed_packages = {}
-        self.semaphore = asyncio.Semaphore(5)  # Limit concurrent Argos translations
+        self.offline = getattr(config, 'translation_argos_offline', False)
+        self.workers = max(0, getattr(config, 'translation_argos_workers', 0))
+        self.semaphore = asyncio.Semaphore(max(5, self.workers))  # Limit concurrent Argos translations
+        self._pool: Optional[ProcessPoolExecutor] = None
         self._initialize_packages()
     
     def _initialize_packages(self):
-        """Download and install required translation packages."""
-        logger.info("Initializing Argos Translate packages...")
-        
-        # Update package index
+        """Log installed translation packages (no network access)."""
+        installed = argostranslate.package.get_installed_packages()
+        logger.info(f"Argos Translate: {len(installed)} installed packages"
+                    f"{' (offline)' if self.offline else ''}")
+    
+    def _refresh_package_index(self):
+        """Download the package index if the cached copy is missing or stale."""
+        index_path = argostranslate.settings.local_package_index
+        if index_path.exists() and time.time() - index_path.stat().st_mtime < INDEX_MAX_AGE_SECONDS:
+            return
+        logger.info("Updating Argos package index...")
         argostranslate.package.update_package_index()
-        
-        # Get available packages
-        available_packages = argostranslate.package.get_available_packages()
-        logger.debug(f"Found {len(available_packages)} available packages")
     
     def _get_translation_package(self, from_code: str, to_code: str):
         """
-        Get or install the translation package for a language pair.
+        Get the resident translation for a language pair, installing it if needed.
         
         Args:
             from_code: Source language code
             to_code: Target language code
-            
+        
         Returns:
-            Translation package
+            Tuple of (Argos source code, Argos target code, translation object)
         """
         # Map language codes for Argos
         source_code = get_language_code('argos', from_code)
         target_code = get_language_code('argos', to_code)
         
-        package_key = f"{source_code}-{target_code}"
+        translation = _load_translation(source_code, target_code)
+        if translation is not None:
+            return source_code, target_code, translation
         
-        if package_key in self.installed_packages:
-            return self.installed_packages[package_key]
+        if self.offline:
+            raise ValueError(f"Argos package {source_code} -> {target_code} is not installed "
+                             f"and translation.argos.offline is set")
         
         # Find and install package
+        self._refresh_package_index()
         available_packages = argostranslate.package.get_available_packages()
         package = next(
-            (pkg for pkg in available_packages 
+            (pkg for pkg in available_packages
              if pkg.from_code == source_code and pkg.to_code == target_code),
             None
         )
@@ -78,16 +157,84 @@ class ArgosTranslator(BaseTranslator):
         logger.info(f"Installing Argos package: {source_code} -> {target_code}")
         argostranslate.package.install_from_path(package.download())
         
-        # Get installed package
-        installed_packages = argostranslate.translate.get_installed_languages()
-        for from_lang in installed_packages:
-            if from_lang.code == source_code:
-                for to_lang in from_lang.get_translation(target_code):
-                    if to_lang.code == target_code:
-                        self.installed_packages[package_key] = (from_lang, to_lang)
-                        return self.installed_packages[package_key]
+        translation = _load_translation(source_code, target_code)
+        if translation is None:
+            raise ValueError(f"Failed to install package for {source_code} -> {target_code}")
+        return source_code, target_code, translation
+    
+    def _worker_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Worker process pool, started on first use (None without workers)."""
+        if self.workers and self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+    
+    def close(self):
+        """Shut down the worker process pool."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+    
+    def _mask_placeholders(self, text: str) -> Tuple[str, List[str]]:
+        """
+        Replace placeholder codes with markers the model leaves alone.
+        
+        Args:
+            text: Source text
         
-        raise ValueError(f"Failed to install package for {source_code} -> {target_code}")
+        Returns:
+            Tuple of (masked text, placeholder codes in marker order)
+        """
+        placeholders = self.placeholder_pattern.findall(text)
+        temp_text = text
+        
+        # Use a pattern that translation services are less likely to modify
+        for i, placeholder in enumerate(placeholders):
+            temp_text = temp_text.replace(placeholder, f"###PH{i}###")
+        return temp_text, placeholders
+    
+    def _restore_placeholders(self, translated: str, placeholders: List[str]) -> str:
+        """
+        Put placeholder codes back in place of their markers.
+        
+        Args:
+            translated: Translated masked text
+            placeholders: Placeholder codes from _mask_placeholders
+        
+        Returns:
+            Translated text with placeholder codes
+        """
+        for i, placeholder in enumerate(placeholders):
+            # Replace our marker back with original placeholder
+            translated = translated.replace(f"###PH{i}###", placeholder)
+            # Also try variations in case translation modified it
+            translated = translated.replace(f"### PH{i} ###", placeholder)
+            translated = translated.replace(f"###ph{i}###", placeholder)
+            translated = translated.replace(f"### ph{i} ###", placeholder)
+        return translated
+    
+    async def _translate_masked(self, lines: List[str], from_code: str, to_code: str) -> List[str]:
+        """
+        Translate masked lines on the worker pool, or a thread without workers.
+        
+        Args:
+            lines: Lines with placeholders masked
+            from_code: Source language code
+            to_code: Target language code
+        
+        Returns:
+            Translated lines
+        """
+        # Get translation package (loads the model once per pair)
+        source_code, target_code, translation = await asyncio.to_thread(
+            self._get_translation_package, from_code, to_code
+        )
+        pool = self._worker_pool()
+        if pool is None:
+            return await asyncio.to_thread(lambda: [translation.translate(line) for line in lines])
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool, _translate_lines, source_code, target_code, lines)
     
     async def translate_text(self, text: str, from_code: str, to_code: str) -> str:
         """
@@ -97,43 +244,68 @@ class ArgosTranslator(BaseTranslator):
             text: Text to translate
             from_code: Source language code
             to_code: Target language code
-            
+        
         Returns:
             Translated text
         """
         if not text.strip():
             return text
         
+        remembered = await self._recall(text, from_code, to_code)
+        if remembered is not None:
+            return remembered
+        
         async with self.semaphore:
             try:
                 # Preserve placeholders
-                placeholders = self.placeholder_pattern.findall(text)
-                temp_text = text
-                
-                # Replace placeholders with temporary markers
-                # Use a pattern that translation services are less likely to modify
-                for i, placeholder in enumerate(placeholders):
-                    temp_text = temp_text.replace(placeholder, f"###PH{i}###")
-                
-                # Get translation package (this is sync but fast)
-                from_lang, to_lang = self._get_translation_package(from_code, to_code)
-                
-                # Translate using asyncio.to_thread to avoid blocking
-                translation = from_lang.get_translation(to_lang)
-                translated = await asyncio.to_thread(translation.translate, temp_text)
-                
-                # Restore placeholders
-                for i, placeholder in enumerate(placeholders):
-                    # Replace our marker back with original placeholder
-                    translated = translated.replace(f"###PH{i}###", placeholder)
-                    # Also try variations in case translation modified it
-                    translated = translated.replace(f"### PH{i} ###", placeholder)
-                    translated = translated.replace(f"###ph{i}###", placeholder)
-                    translated = translated.replace(f"### ph{i} ###", placeholder)
+                temp_text, placeholders = self._mask_placeholders(text)
+                translated = (await self._translate_masked([temp_text], from_code, to_code))[0]
+                translated = self._restore_placeholders(translated, placeholders)
                 
                 self.clogger.debug(f"Translated: '{text[:50]}...' -> '{translated[:50]}...'")
+                await self._remember(text, from_code, to_code, translated)
                 return translated
-                
+            
             except Exception as e:
                 logger.error(f"Argos translation failed: {e}")
-                return text  # Return original text if translation fails
\ No newline at end of file
+                return text  # Return original text if translation fails
+    
+    async def translate_batch(self, texts: List[str], from_code: str, to_code: str) -> List[str]:
+        """
+        Translate many segments as one job on the resident model.
+        
+        Segments missing from the translation memory are masked and split into
+        WORKER_CHUNK_LINES chunks, which run concurrently on the worker pool.
+        
+        Args:
+            texts: Segments to translate
+            from_code: Source language code
+            to_code: Target language code
+        
+        Returns:
+            Translated segments in input order (originals where translation failed)
+        """
+        results = list(texts)
+        pending = [i for i, text in enumerate(texts) if text.strip()]
+        if self.memory and pending:
+            remembered = await self._recall_many([texts[i] for i in pending], from_code, to_code)
+            for i, translated in zip(pending, remembered):
+                if translated is not None:
+                    results[i] = translated
+            pending = [i for i, translated in zip(pending, remembered) if translated is None]
+        
+        async def translate_chunk(indexes: List[int]):
+            masked = [self._mask_placeholders(texts[i]) for i in indexes]
+            async with self.semaphore:
+                try:
+                    translated = await self._translate_masked([line for line, _ in masked], from_code, to_code)
+                except Exception as e:
+                    logger.error(f"Argos translation of {len(indexes)} lines failed: {e}")
+                    return
+            for i, line, (_, placeholders) in zip(indexes, translated, masked):
+                results[i] = self._restore_placeholders(line, placeholders)
+            await self._remember_many([(texts[i], results[i]) for i in indexes], from_code, to_code)
+        
+        chunks = [pending[start:start + WORKER_CHUNK_LINES] for start in range(0, len(pending), WORKER_CHUNK_LINES)]
+        await asyncio.gather(*(translate_chunk(chunk) for chunk in chunks))
+        return results
@@ -4,8 +4,10 @@ Google Translate implementation for the translation module with async support.
 
 import logging
 import asyncio
+import threading
 import time
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from deep_translator import GoogleTranslator as GoogleTranslatorClient
 
 from translation.translator import BaseTranslator
@@ -19,8 +21,14 @@ logger = logging.getLogger(__name__)
 class GoogleTranslator(BaseTranslator):
     """
     Google Translate implementation of the translator interface with async support.
+    
+    Blocking deep_translator calls run on a dedicated thread pool sized by
+    max_concurrent_translations. Clients keep per-request state, so each pool
+    thread builds one client per language pair and reuses it.
     """
     
+    service = "google"
+    
     def __init__(self, config: Config):
         """
         Initialize the Google translator.
@@ -31,8 +39,59 @@ class GoogleTranslator(BaseTranslator):
         super().__init__(config)
         self.retry_count = 3
         self.retry_delay = 1.0
-        # Create a semaphore for rate limiting Google Translate requests
-        self.semaphore = asyncio.Semaphore(5)  # Conservative limit
+        
+        # Bounded pool for the blocking deep_translator calls
+        self.max_concurrent = max(1, getattr(config, 'max_concurrent_translations', 5))
+        self.batch_size = max(1, getattr(config, 'translation_batch_size', 1))
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix="google-translate")
+        self._clients = threading.local()
+    
+    def close(self):
+        """Shut down the translation thread pool."""
+        self.executor.shutdown(wait=False)
+    
+    def _client(self, source_code: str, target_code: str) -> GoogleTranslatorClient:
+        """
+        Client for a language pair, created once per pool thread.
+        
+        Args:
+            source_code: Google source language code
+            target_code: Google target language code
+        
+        Returns:
+            deep_translator client owned by the calling thread
+        """
+        clients: Dict[Tuple[str, str], GoogleTranslatorClient] = getattr(self._clients, "by_pair", None)
+        if clients is None:
+            clients = self._clients.by_pair = {}
+        key = (source_code, target_code)
+        if key not in clients:
+            clients[key] = GoogleTranslatorClient(source=source_code, target=target_code)
+        return clients[key]
+    
+    def _translate_blocking(self, texts: List[str], source_code: str, target_code: str) -> List[str]:
+        """
+        Translate segments on a pool thread.
+        
+        Args:
+            texts: Segments to translate
+            source_code: Google source language code
+            target_code: Google target language code
+        
+        Returns:
+            Translated segments
+        """
+        client = self._client(source_code, target_code)
+        if len(texts) == 1:
+            return [client.translate(texts[0])]
+        return client.translate_batch(texts)
+    
+    async def _run_in_pool(self, texts: List[str], from_code: str, to_code: str) -> List[str]:
+        """Run a blocking translation on the translator's thread pool."""
+        source_code = get_language_code('google', from_code)
+        target_code = get_language_code('google', to_code)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._translate_blocking, texts, source_code, target_code)
     
     async def translate_text(self, text: str, from_code: str, to_code: str) -> str:
         """
@@ -42,37 +101,79 @@ class GoogleTranslator(BaseTranslator):
             text: Text to translate
             from_code: Source language code
             to_code: Target language code
-            
+        
         Returns:
             Translated text
         """
         if not text.strip():
             return text
         
-        # Map language codes for Google Translate
-        source_code = get_language_code('google', from_code)
-        target_code = get_language_code('google', to_code)
+        remembered = await self._recall(text, from_code, to_code)
+        if remembered is not None:
+            return remembered
+        
+        for attempt in range(self.retry_count):
+            try:
+                translated = (await self._run_in_pool([text], from_code, to_code))[0]
+                
+                if translated:
+                    self.clogger.debug(f"Translated: '{text[:50]}...' -> '{translated[:50]}...'")
+                    await self._remember(text, from_code, to_code, translated)
+                    return translated
+                else:
+                    raise Exception("Translation returned empty result")
+            
+            except Exception as e:
+                logger.warning(f"Translation attempt {attempt + 1} failed: {e}")
+                if attempt < self.retry_count - 1:
+                    await asyncio.sleep(self.retry_delay * (attempt + 1))
+                else:
+                    logger.error(f"Translation failed after {self.retry_count} attempts: {e}")
+                    return text  # Return original text if translation fails
+        
+        return text
+    
+    async def translate_batch(self, texts: List[str], from_code: str, to_code: str) -> List[str]:
+        """
+        Translate several segments with deep_translator's batch call.
+        
+        Segments missing from the translation memory are split into chunks of
+        translation_batch_size, each translated in one pool task. A chunk that
+        fails or comes back short is retried segment by segment.
+        
+        Args:
+            texts: Segments to translate
+            from_code: Source language code
+            to_code: Target language code
         
-        async with self.semaphore:
-            for attempt in range(self.retry_count):
+        Returns:
+            Translated segments in input order
+        """
+        results = list(texts)
+        pending = [i for i, text in enumerate(texts) if text.strip()]
+        if self.memory and pending:
+            remembered = await self._recall_many([texts[i] for i in pending], from_code, to_code)
+            for i, translated in zip(pending, remembered):
+                if translated is not None:
+                    results[i] = translated
+            pending = [i for i, translated in zip(pending, remembered) if translated is None]
+        
+        async def translate_chunk(indexes: List[int]):
+            if len(indexes) > 1:
                 try:
-                    # Use asyncio.to_thread to run the blocking deep_translator call
-                    translator = GoogleTranslatorClient(source=source_code, target=target_code)
-                    translated = await asyncio.to_thread(translator.translate, text)
-                    
-                    if translated:
-                        self.clogger.debug(f"Translated: '{text[:50]}...' -> '{translated[:50]}...'")
-                        return translated
-                    else:
-                        raise Exception("Translation returned empty result")
-                    
+                    translated = await self._run_in_pool([texts[i] for i in indexes], from_code, to_code)
+                    if len(translated) == len(indexes) and all(translated):
+                        for i, segment in zip(indexes, translated):
+                            results[i] = segment
+                        await self._remember_many([(texts[i], results[i]) for i in indexes], from_code, to_code)
+                        return
                 except Exception as e:
-                    logger.warning(f"Translation attempt {attempt + 1} failed: {e}")
-                    if attempt < self.retry_count - 1:
-                        await asyncio.sleep(self.retry_delay * (attempt + 1))
-                    else:
-                        logger.error(f"Translation failed after {self.retry_count} attempts: {e}")
-                        return text  # Return original text if translation fails
+                    logger.warning(f"Batch translation of {len(indexes)} segments failed: {e}")
+            segments = await asyncio.gather(*(self.translate_text(texts[i], from_code, to_code) for i in indexes))
+            for i, segment in zip(indexes, segments):
+                results[i] = segment
         
-        return text
+        chunks = [pending[start:start + self.batch_size] for start in range(0, len(pending), self.batch_size)]
+        await asyncio.gather(*(translate_chunk(chunk) for chunk in chunks))
+        return results
     
@@ -0,0 +1,183 @@
+"""
+Ordered streaming output for translation jobs, with resume.
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+# Sidecar file recording how much of the output is complete
+PROGRESS_SUFFIX = ".progress.json"
+
+# Minimum seconds between progress file updates (also written on close)
+PROGRESS_INTERVAL_SECONDS = 1.0
+
+# Jobs allowed to run ahead of the oldest unfinished one, per concurrent slot,
+# which bounds the reorder buffer when an early job is slow
+REORDER_WINDOW_FACTOR = 4
+
+
+class OrderedWriter:
+    """
+    Appends job results to a file in input order as soon as their prefix is complete.
+
+    Results arrive out of order and wait in a reorder buffer until every
+    earlier job has finished. Each job carries an input position (e.g. the
+    next unread line). A progress sidecar records the last flushed position
+    and the output size at that point. A later run opened with resume=True
+    truncates any partly written tail and continues from that position. The
+    sidecar is removed when the output is complete.
+    """
+
+    def __init__(self, path: Path, source: str = "", resume: bool = True):
+        """
+        Open an output file, resuming from its progress sidecar if possible.
+
+        Args:
+            path: Output file
+            source: Identifies the input (path, limits); progress for another source is ignored
+            resume: Whether to continue from saved progress
+        """
+        self.path = Path(path)
+        self.progress_path = self.path.with_name(self.path.name + PROGRESS_SUFFIX)
+        self.source = source
+        self.position = 0
+        self.next_index = 0
+        self._buffer: Dict[int, Tuple[List[str], int]] = {}
+        self._last_progress = 0.0
+        self._finished = False
+
+        state = self._read_progress() if resume else None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if state and self.path.exists() and self.path.stat().st_size >= state["bytes"]:
+            self._file = open(self.path, 'r+b')
+            self._file.truncate(state["bytes"])
+            self._file.seek(state["bytes"])
+            self.position = state["position"]
+            logger.info(f"Resuming {self.path} from position {self.position}")
+        else:
+            self._file = open(self.path, 'wb')
+        self.resumed_from = self.position
+
+    def _read_progress(self) -> Optional[Dict]:
+        """Saved progress for this source, or None."""
+        if not self.progress_path.exists():
+            return None
+        try:
+            with open(self.progress_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable progress file {self.progress_path}: {e}")
+            return None
+        return state if state.get("source") == self.source else None
+
+    def _save_progress(self):
+        """Flush output and record the position and size it covers."""
+        self._file.flush()
+        state = {"source": self.source, "position": self.position, "bytes": self._file.tell()}
+        tmp_path = self.progress_path.with_name(self.progress_path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.progress_path)
+        self._last_progress = time.monotonic()
+
+    @property
+    def buffered(self) -> int:
+        """Finished jobs waiting for an earlier one."""
+        return len(self._buffer)
+
+    def put(self, index: int, records: List[str], position: int):
+        """
+        Add a job's output and flush every job whose predecessors are done.
+
+        Args:
+            index: Job index in this run, starting at 0
+            records: Output lines for the job (may be empty)
+            position: Input position reached once this job is written
+        """
+        self._buffer[index] = (records, position)
+        flushed = False
+        while self.next_index in self._buffer:
+            records, position = self._buffer.pop(self.next_index)
+            for record in records:
+                self._file.write((record + "\n").encode('utf-8'))
+            self.position = position
+            self.next_index += 1
+            flushed = True
+        if flushed and time.monotonic() - self._last_progress >= PROGRESS_INTERVAL_SECONDS:
+            self._save_progress()
+
+    def close(self):
+        """Save progress and close without marking the output complete."""
+        if self._file.closed:
+            return
+        if self._buffer:
+            logger.warning(f"Discarding {len(self._buffer)} out-of-order results for {self.path}; "
+                           f"they are redone on resume")
+        self._save_progress()
+        self._file.close()
+
+    def finish(self):
+        """Close a complete output and remove its progress file."""
+        self._file.close()
+        self.progress_path.unlink(missing_ok=True)
+        self._finished = True
+
+    def __enter__(self) -> "OrderedWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self._finished:
+            self.close()
+
+
+async def run_ordered(jobs: List[Tuple[Callable[[], Awaitable[List[str]]], int]], writer: OrderedWriter,
+                      max_concurrent: int, on_done: Optional[Callable[[int], None]] = None):
+    """
+    Run jobs concurrently and stream their output through an OrderedWriter.
+
+    At most max_concurrent jobs run at once, and no job starts more than
+    max_concurrent * REORDER_WINDOW_FACTOR jobs ahead of the oldest unwritten
+    one. Unfinished jobs are cancelled if one fails.
+
+    Args:
+        jobs: (coroutine factory returning output lines, input position after the job) per job
+        writer: Destination, with next_index at 0
+        max_concurrent: Maximum jobs in flight
+        on_done: Called with the job index when a job finishes (e.g. progress bars)
+    """
+    max_concurrent = max(1, max_concurrent)
+    window = max_concurrent * REORDER_WINDOW_FACTOR
+
+    async def run_job(index: int, factory: Callable[[], Awaitable[List[str]]]):
+        return index, await factory()
+
+    pending = set()
+
+    async def collect():
+        nonlocal pending
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            index, records = task.result()
+            writer.put(index, records, jobs[index][1])
+            if on_done:
+                on_done(index)
+
+    try:
+        for index, (factory, _) in enumerate(jobs):
+            while len(pending) >= max_concurrent or (pending and index - writer.next_index >= window):
+                await collect()
+            pending.add(asyncio.create_task(run_job(index, factory)))
+        while pending:
+            await collect()
+    finally:
+        for task in pending:
+            task.cancel()
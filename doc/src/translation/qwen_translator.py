@@ -3,6 +3,7 @@ Qwen-MT translator implementation using OpenAI SDK with async support.
 """
 
 import os
+import re
 import logging
 import asyncio
 import time
@@ -11,22 +12,32 @@ from pathlib import Path
 import json
 
 from openai import OpenAI, AsyncOpenAI
-from tqdm import tqdm
 
 from translation.translator import BaseTranslator
 from config.config_loader import Config
 from translation.language_codes import get_language_code
+from utils.placeholder_engine import PlaceholderEngine
 
 
 logger = logging.getLogger(__name__)
 
 
+# Separator line between segments of a batched request; Qwen-MT keeps it as is
+SEGMENT_DELIMITER = "\n|||\n"
+SEGMENT_SPLIT_PATTERN = re.compile(r"\s*\|\|\|\s*")
+
+# Upper bound on source characters per batched request
+MAX_BATCH_CHARS = 4000
+
+
 class QwenTranslator(BaseTranslator):
     """
     Qwen-MT translator implementation using OpenAI SDK.
     Supports both synchronous and asynchronous translation with concurrent API calls.
     """
     
+    service = "qwen"
+    
     def __init__(self, config: Config):
         """
         Initialize the Qwen translator.
@@ -49,6 +60,10 @@ class QwenTranslator(BaseTranslator):
         self.max_concurrent = getattr(config, 'max_concurrent_translations', 10)
         self.semaphore = asyncio.Semaphore(self.max_concurrent)
         
+        # Segments per request when translating conversations (1 = one request per turn)
+        self.batch_size = max(1, getattr(config, 'translation_batch_size', 1))
+        self.batch_fallbacks = 0
+        
         # Retry settings
         self.retry_count = 3
         self.retry_delay = 1.0
@@ -64,6 +79,10 @@ class QwenTranslator(BaseTranslator):
             base_url=self.base_url
         )
     
+    @property
+    def memory_model(self) -> str:
+        """Qwen-MT model that translations are cached under."""
+        return self.model
     
     async def translate_text(self, text: str, from_code: str, to_code: str, 
                             terminology: Optional[Dict[str, str]] = None,
@@ -84,31 +103,63 @@ class QwenTranslator(BaseTranslator):
         if not text.strip():
             return text
         
+        # Terminology and domain change the output, so only plain requests use the memory
+        use_memory = not terminology and not domain
+        if use_memory:
+            remembered = await self._recall(text, from_code, to_code)
+            if remembered is not None:
+                return remembered
+        
+        translated = await self._request_translation(text, from_code, to_code, terminology, domain)
+        if translated is None:
+            return text  # Return original text if translation fails
+        
+        self.clogger.debug(f"Translated: '{text[:50]}...' -> '{translated[:50]}...'")
+        if use_memory and translated:
+            await self._remember(text, from_code, to_code, translated)
+        return translated
+    
+    async def _request_translation(self, content: str, from_code: str, to_code: str,
+                                   terminology: Optional[Dict[str, str]] = None,
+                                   domain: Optional[str] = None) -> Optional[str]:
+        """
+        Send one translation request with retries.
+        
+        Args:
+            content: Text to translate (one segment or a delimited batch)
+            from_code: Source language code
+            to_code: Target language code
+            terminology: Optional terminology mapping
+            domain: Optional domain
+            
+        Returns:
+            Translated content, or None if all attempts failed
+        """
         # Map language codes for Qwen-MT
         source_lang = get_language_code('qwen', from_code)
         target_lang = get_language_code('qwen', to_code)
         
+        # Prepare translation options
+        translation_options = {
+            "source_lang": source_lang,
+            "target_lang": target_lang
+        }
+        
+        # Add terminology if provided
+        if terminology:
+            translation_options["terminology"] = terminology
+        
+        # Add domain if provided
+        if domain:
+            translation_options["domain"] = domain
+        
         async with self.semaphore:
             for attempt in range(self.retry_count):
                 try:
-                    # Prepare translation options
-                    translation_options = {
-                        "source_lang": source_lang,
-                        "target_lang": target_lang
-                    }
-                    
-                    # Add terminology if provided
-                    if terminology:
-                        translation_options["terminology"] = terminology
-                    
-                    # Add domain if provided
-                    if domain:
-                        translation_options["domain"] = domain
-                    
                     # Make the async translation request
                     completion = await self.async_client.chat.completions.create(
                         model=self.model,
-                        messages=[{"role": "user", "content": text}],
+                        messages=[{"role": "user", "content": content}],
                         extra_body={"translation_options": translation_options}
                     )
                     
@@ -129,7 +180,6 @@ class QwenTranslator(BaseTranslator):
                             f"translate_{source_lang}_to_{target_lang}"
                         )
                     
-                    self.clogger.debug(f"Translated: '{text[:50]}...' -> '{translated[:50]}...'")
                     return translated
                     
                 except Exception as e:
@@ -138,7 +188,89 @@ class QwenTranslator(BaseTranslator):
                         await asyncio.sleep(self.retry_delay * (attempt + 1))
                     else:
                         logger.error(f"Async translation failed after {self.retry_count} attempts")
-                        return text  # Return original text if translation fails
+        return None
+    
+    async def translate_batch(self, texts: List[str], from_code: str, to_code: str) -> List[str]:
+        """
+        Translate many segments with few requests.
+        
+        Segments missing from the translation memory are joined with
+        SEGMENT_DELIMITER into requests of up to batch_size segments (and
+        MAX_BATCH_CHARS characters). A request whose reply does not split back
+        into the same number of segments is retried one segment at a time.
+        
+        Args:
+            texts: Segments to translate
+            from_code: Source language code
+            to_code: Target language code
+            
+        Returns:
+            Translated segments in input order (originals where translation failed)
+        """
+        results = list(texts)
+        pending = [i for i, text in enumerate(texts) if text.strip()]
+        if self.memory and pending:
+            remembered = await self._recall_many([texts[i] for i in pending], from_code, to_code)
+            for i, translated in zip(pending, remembered):
+                if translated is not None:
+                    results[i] = translated
+            pending = [i for i, translated in zip(pending, remembered) if translated is None]
+        
+        # Segments that contain the delimiter or line breaks cannot be split back reliably
+        batchable, singles = [], []
+        for i in pending:
+            splittable = SEGMENT_DELIMITER.strip() not in texts[i] and "\n" not in texts[i]
+            (batchable if splittable else singles).append(i)
+        
+        batches, current, current_chars = [], [], 0
+        for i in batchable:
+            if current and (len(current) >= self.batch_size or current_chars + len(texts[i]) > MAX_BATCH_CHARS):
+                batches.append(current)
+                current, current_chars = [], 0
+            current.append(i)
+            current_chars += len(texts[i])
+        if current:
+            batches.append(current)
+        
+        async def translate_indexes(indexes: List[int]):
+            if len(indexes) > 1:
+                translated = await self._translate_joined([texts[i] for i in indexes], from_code, to_code)
+                if translated is not None:
+                    for i, segment in zip(indexes, translated):
+                        results[i] = segment
+                    await self._remember_many([(texts[i], results[i]) for i in indexes], from_code, to_code)
+                    return
+            segments = await asyncio.gather(*(self.translate_text(texts[i], from_code, to_code) for i in indexes))
+            for i, segment in zip(indexes, segments):
+                results[i] = segment
+        
+        await asyncio.gather(*(translate_indexes(batch) for batch in batches),
+                             *(translate_indexes([i]) for i in singles))
+        return results
+    
+    async def _translate_joined(self, segments: List[str], from_code: str, to_code: str) -> Optional[List[str]]:
+        """
+        Translate several segments in one request.
+        
+        Args:
+            segments: Single-line segments without the delimiter
+            from_code: Source language code
+            to_code: Target language code
+            
+        Returns:
+            Translated segments, or None if the request failed or the segment count changed
+        """
+        translated = await self._request_translation(SEGMENT_DELIMITER.join(segments), from_code, to_code)
+        if translated is None:
+            return None
+        
+        parts = [part.strip() for part in SEGMENT_SPLIT_PATTERN.split(translated.strip())]
+        if len(parts) != len(segments) or not all(parts):
+            self.clogger.debug(f"Batch of {len(segments)} segments came back as {len(parts)}; "
+                               f"falling back to per-segment requests")
+            self.batch_fallbacks += 1
+            return None
+        return parts
     
     def _build_system_prompt(self, source_code: str, target_code: str,
                             terminology: Optional[Dict[str, str]] = None,
@@ -185,50 +317,22 @@ class QwenTranslator(BaseTranslator):
         # Load conversations using base class helper method
         conversations = self._load_conversations_from_json(input_path)
         
-        # Load placeholder mapping
-        with open(self.config.preprocessing_map_path, 'r', encoding='utf-8') as f:
-            placeholder_map = json.load(f)
-        
-        # Use semaphore for rate limiting with the specified concurrency
-        if max_concurrent != self.max_concurrent:
-            semaphore = asyncio.Semaphore(max_concurrent)
-        else:
-            semaphore = self.semaphore
-        
-        # Create tasks for concurrent translation with rate limiting
-        async def translate_with_semaphore(conv_idx: int, conversation: Dict) -> tuple:
-            async with semaphore:
-                result = await self._translate_conversation_async(
-                    conversation, conv_idx, len(conversations), 
-                    from_code, to_code, placeholder_map
-                )
-                return conv_idx, result
-        
-        tasks = [translate_with_semaphore(i, conv) for i, conv in enumerate(conversations)]
+        # Compile placeholder mapping once per translator
+        placeholder_engine = self._get_placeholder_engine()
         
-        # Execute translations concurrently with progress bar
-        self.clogger.info(f"Starting concurrent translation of {len(conversations)} conversations")
+        async def translate_conversation(conv_idx: int, conversation: Dict) -> Dict:
+            return await self._translate_conversation_async(
+                conversation, conv_idx, len(conversations),
+                from_code, to_code, placeholder_engine
+            )
         
-        with tqdm(total=len(tasks), desc="Translating conversations") as pbar:
-            results = []
-            for task in asyncio.as_completed(tasks):
-                conv_idx, translated_conv = await task
-                results.append((conv_idx, translated_conv))
-                pbar.update(1)
-        
-        # Sort results by original index and extract conversations
-        results.sort(key=lambda x: x[0])
-        translated_conversations = [conv for _, conv in results]
-        
-        # Save translated conversations
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(translated_conversations, f, ensure_ascii=False, indent=2)
-        
-        self.clogger.info(f"Translated {len(conversations)} conversations", force=True)
+        # Execute translations concurrently, streaming results to disk in order
+        await self._stream_conversations(conversations, input_path, output_path, translate_conversation, max_concurrent)
+        self._log_memory_summary()
     
     async def _translate_conversation_async(self, conversation: Dict, conv_idx: int, 
                                           total: int, from_code: str, to_code: str,
-                                          placeholder_map: Dict[str, Dict]) -> Dict:
+                                          placeholder_engine: PlaceholderEngine) -> Dict:
         """
         Translate a single conversation asynchronously.
         
@@ -238,30 +342,33 @@ class QwenTranslator(BaseTranslator):
             total: Total number of conversations
             from_code: Source language code
             to_code: Target language code
-            placeholder_map: Placeholder mapping dictionary
+            placeholder_engine: Compiled placeholder mapping
             
         Returns:
             Translated conversation dictionary
         """
         self.clogger.debug(f"Translating conversation {conv_idx + 1}/{total}")
         
-        # Create substitution cache for consistent replacements
-        substitution_cache = {}
-        
         translated_conv = conversation.copy()
         
         # Translate dialogue turns
         if "dialogue" in translated_conv:
-            for turn in translated_conv["dialogue"]:
-                # Translate text asynchronously
-                translated_text = await self.translate_text(
-                    turn["text"], from_code, to_code
-                )
-                
-                # Fill placeholders
-                turn["text"] = self._fill_placeholders(
-                    translated_text, placeholder_map, substitution_cache
+            if self.batch_size > 1:
+                translated_texts = await self.translate_batch(
+                    [turn["text"] for turn in translated_conv["dialogue"]], from_code, to_code
                 )
+            else:
+                translated_texts = []
+                for turn in translated_conv["dialogue"]:
+                    # Translate text asynchronously
+                    translated_texts.append(await self.translate_text(turn["text"], from_code, to_code))
+            
+            # Fill placeholders consistently across the conversation
+            filled_texts = self._fill_placeholders(
+                placeholder_engine, translated_texts, conversation.get("conversation_id", conv_idx)
+            )
+            for turn, filled_text in zip(translated_conv["dialogue"], filled_texts):
+                turn["text"] = filled_text
         
         # Update first_turn if present
         if translated_conv.get("dialogue"):
@@ -0,0 +1,237 @@
+"""
+Sentence-level translation memory shared by all translators.
+"""
+
+import time
+import sqlite3
+import logging
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+# Memory database kept next to the file-level translation cache by default
+MEMORY_FILENAME = "translation_memory.sqlite"
+
+# Seconds to wait for another process holding the write lock
+BUSY_TIMEOUT_SECONDS = 30.0
+
+# SQLite limit on host parameters is 999 on older builds; stay well below it
+LOOKUP_CHUNK_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    service TEXT NOT NULL,
+    model TEXT NOT NULL,
+    source_lang TEXT NOT NULL,
+    target_lang TEXT NOT NULL,
+    source_text TEXT NOT NULL,
+    translated_text TEXT NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (service, model, source_lang, target_lang, source_text)
+) WITHOUT ROWID;
+"""
+
+
+def normalize_source(text: str) -> str:
+    """
+    Normalize source text into a memory key.
+
+    Applies Unicode NFC and collapses runs of whitespace, so lines that differ
+    only in spacing or composed/decomposed characters share an entry.
+
+    Args:
+        text: Source text
+
+    Returns:
+        Normalized text
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class TranslationMemory:
+    """
+    Cache of translated strings keyed by (service, model, source language,
+    target language, normalized source text).
+
+    Entries live in one SQLite database in WAL mode, so concurrent runs and
+    translators read it without blocking each other. Lookups and stores are
+    counted per instance for hit-rate reporting.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Open (and create if needed) a translation memory.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self.stats = {"hits": 0, "misses": 0, "stored": 0}
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def lookup(self, service: str, model: str, source_lang: str, target_lang: str,
+               text: str) -> Optional[str]:
+        """
+        Look up a translation.
+
+        Args:
+            service: Translation service ("google", "qwen", "argos")
+            model: Model or engine version within the service ("" if none)
+            source_lang: Source language code
+            target_lang: Target language code
+            text: Source text
+
+        Returns:
+            Stored translation, or None on a miss
+        """
+        return self.lookup_many(service, model, source_lang, target_lang, [text])[0]
+
+    def lookup_many(self, service: str, model: str, source_lang: str, target_lang: str,
+                    texts: Iterable[str]) -> List[Optional[str]]:
+        """
+        Look up several translations in one query per chunk.
+
+        Args:
+            service: Translation service
+            model: Model or engine version within the service
+            source_lang: Source language code
+            target_lang: Target language code
+            texts: Source texts
+
+        Returns:
+            Stored translation or None per input text, in input order
+        """
+        keys = [normalize_source(text) for text in texts]
+        unique_keys = list(dict.fromkeys(keys))
+        found: Dict[str, str] = {}
+        with self._lock:
+            for start in range(0, len(unique_keys), LOOKUP_CHUNK_SIZE):
+                chunk = unique_keys[start:start + LOOKUP_CHUNK_SIZE]
+                rows = self._conn.execute(
+                    "SELECT source_text, translated_text FROM translations "
+                    "WHERE service = ? AND model = ? AND source_lang = ? AND target_lang = ? "
+                    f"AND source_text IN ({', '.join('?' * len(chunk))})",
+                    (service, model, source_lang, target_lang, *chunk)
+                ).fetchall()
+                found.update(rows)
+            if found:
+                self._conn.executemany(
+                    "UPDATE translations SET hits = hits + 1 WHERE service = ? AND model = ? "
+                    "AND source_lang = ? AND target_lang = ? AND source_text = ?",
+                    [(service, model, source_lang, target_lang, key) for key in found]
+                )
+
+            results = [found.get(key) for key in keys]
+            hits = sum(1 for result in results if result is not None)
+            self.stats["hits"] += hits
+            self.stats["misses"] += len(results) - hits
+        return results
+
+    def store(self, service: str, model: str, source_lang: str, target_lang: str,
+              text: str, translated: str):
+        """
+        Store a translation.
+
+        Args:
+            service: Translation service
+            model: Model or engine version within the service
+            source_lang: Source language code
+            target_lang: Target language code
+            text: Source text
+            translated: Translated text
+        """
+        self.store_many(service, model, source_lang, target_lang, [(text, translated)])
+
+    def store_many(self, service: str, model: str, source_lang: str, target_lang: str,
+                   pairs: Iterable[tuple]):
+        """
+        Store several translations in one transaction.
+
+        Args:
+            service: Translation service
+            model: Model or engine version within the service
+            source_lang: Source language code
+            target_lang: Target language code
+            pairs: (source text, translated text) tuples
+        """
+        now = time.time()
+        rows = [
+            (service, model, source_lang, target_lang, normalize_source(text), translated, now)
+            for text, translated in pairs
+        ]
+        if not rows:
+            return
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.executemany(
+                    "INSERT INTO translations "
+                    "(service, model, source_lang, target_lang, source_text, translated_text, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                    # Update in place so an existing entry keeps its hit count
+                    "ON CONFLICT (service, model, source_lang, target_lang, source_text) "
+                    "DO UPDATE SET translated_text = excluded.translated_text",
+                    rows
+                )
+                self._conn.execute("COMMIT")
+                self.stats["stored"] += len(rows)
+            except sqlite3.Error as e:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                logger.warning(f"Could not update translation memory {self.path}: {e}")
+
+    def hit_rate(self) -> float:
+        """Share of lookups answered from memory since this instance was opened."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def summary(self) -> Dict:
+        """
+        Counters for reporting.
+
+        Returns:
+            Dictionary with hits, misses, stored entries, hit rate and total entries
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            stats = dict(self.stats)
+        return {**stats, "hit_rate": round(self.hit_rate(), 3), "entries": entries}
+
+
+_memories: Dict[str, TranslationMemory] = {}
+_memories_lock = threading.Lock()
+
+
+def get_translation_memory(path: Path) -> TranslationMemory:
+    """
+    Get the process-wide translation memory for a database file.
+
+    Args:
+        path: SQLite database file
+
+    Returns:
+        Shared TranslationMemory instance
+    """
+    key = str(Path(path).resolve())
+    with _memories_lock:
+        if key not in _memories:
+            _memories[key] = TranslationMemory(path)
+        return _memories[key]
@@ -7,24 +7,39 @@ import logging
 import asyncio
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Awaitable, Callable, Dict, List, Optional
 import re
-import random
 from tqdm import tqdm
 
 from config.config_loader import Config
 from translation.language_codes import get_language_code
+from translation.translation_memory import get_translation_memory, normalize_source
+from translation.ordered_writer import OrderedWriter, run_ordered
 from utils.logging_utils import ConditionalLogger
+from utils.placeholder_engine import PlaceholderEngine
 
 
 logger = logging.getLogger(__name__)
 
 
+# Streamed conversation results kept next to the output until it is complete
+PARTIAL_SUFFIX = ".partial.jsonl"
+
+
 class BaseTranslator(ABC):
     """
     Abstract base class for translation services.
+    
+    Translators may hold thread or process pools (e.g. Argos workers); use
+    them as context managers, or call close() when done.
     """
     
+    # Service name used as the translation memory key (set by subclasses)
+    service = ""
+    
+    # Distinct file lines handed to translate_batch at a time
+    file_batch_lines = 1
+    
     def __init__(self, config: Config):
         """
         Initialize the translator.
@@ -34,6 +49,10 @@ class BaseTranslator(ABC):
         """
         self.config = config
         self.placeholder_pattern = re.compile(r'\{\d{5}\}')
+        self._placeholder_engine: Optional[PlaceholderEngine] = None
+        
+        # Continue interrupted file and conversation translations from their last flushed item
+        self.resume = getattr(config, 'translation_resume', True)
         self.clogger = ConditionalLogger(__name__, config.verbose)
         
         # Initialize token tracker if enabled
@@ -43,6 +62,98 @@ class BaseTranslator(ABC):
             self.token_tracker = TokenUsageTracker(verbose=False)
         else:
             self.token_tracker = None
+        
+        # Sentence-level translation memory shared by all translators
+        memory_path = getattr(config, 'translation_memory_path', None)
+        if getattr(config, 'translation_memory_enabled', False) and memory_path:
+            self.memory = get_translation_memory(memory_path)
+        else:
+            self.memory = None
+    
+    def close(self):
+        """Release thread or process pools held by the translator."""
+        pass
+    
+    def __enter__(self) -> "BaseTranslator":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    @property
+    def memory_model(self) -> str:
+        """Model or engine version that translations are cached under ("" for services without a model choice)."""
+        return ""
+    
+    async def _recall(self, text: str, from_code: str, to_code: str) -> Optional[str]:
+        """
+        Look up a translation in the translation memory.
+        
+        SQLite calls run in a worker thread so they do not block the event loop.
+        
+        Args:
+            text: Source text
+            from_code: Source language code
+            to_code: Target language code
+            
+        Returns:
+            Remembered translation, or None on a miss or without a memory
+        """
+        return (await self._recall_many([text], from_code, to_code))[0]
+    
+    async def _recall_many(self, texts: List[str], from_code: str, to_code: str) -> List[Optional[str]]:
+        """
+        Look up several translations in the translation memory in one query.
+        
+        Args:
+            texts: Source texts
+            from_code: Source language code
+            to_code: Target language code
+            
+        Returns:
+            Remembered translation or None per text (all None without a memory)
+        """
+        if not self.memory or not texts:
+            return [None] * len(texts)
+        return await asyncio.to_thread(
+            self.memory.lookup_many, self.service, self.memory_model, from_code, to_code, texts
+        )
+    
+    async def _remember(self, text: str, from_code: str, to_code: str, translated: str):
+        """
+        Store a successful translation in the translation memory.
+        
+        Args:
+            text: Source text
+            from_code: Source language code
+            to_code: Target language code
+            translated: Translated text
+        """
+        await self._remember_many([(text, translated)], from_code, to_code)
+    
+    async def _remember_many(self, pairs: List[tuple], from_code: str, to_code: str):
+        """
+        Store several translations in the translation memory in one transaction.
+        
+        Args:
+            pairs: (source text, translated text) tuples
+            from_code: Source language code
+            to_code: Target language code
+        """
+        if self.memory and pairs:
+            await asyncio.to_thread(
+                self.memory.store_many, self.service, self.memory_model, from_code, to_code, pairs
+            )
+    
+    def _log_memory_summary(self):
+        """Log translation memory hit rate for the run."""
+        if self.memory:
+            summary = self.memory.summary()
+            self.clogger.info(
+                f"Translation memory: {summary['hits']} hits, {summary['misses']} misses "
+                f"({summary['hit_rate']:.1%} hit rate), {summary['entries']} entries",
+                force=True
+            )
     
     def _load_conversations_from_json(self, input_path: Path) -> List[Dict]:
         """
@@ -85,12 +196,29 @@ class BaseTranslator(ABC):
         """
         pass
     
+    async def translate_batch(self, texts: List[str], from_code: str, to_code: str) -> List[str]:
+        """
+        Translate several segments; services with a batch API override this.
+        
+        Args:
+            texts: Segments to translate
+            from_code: Source language code
+            to_code: Target language code
+            
+        Returns:
+            Translated segments in input order
+        """
+        return list(await asyncio.gather(*(self.translate_text(text, from_code, to_code) for text in texts)))
+    
     async def translate_file(self, input_path: Path, output_path: Path, 
                             from_code: str, to_code: str, max_lines: Optional[int] = None,
                             max_concurrent: int = 10):
         """
         Translate a text file with concurrent processing.
         
+        Lines are written in input order as soon as every earlier line is
+        done, so an interrupted run resumes after the last written line.
+        
         Args:
             input_path: Input file path
             output_path: Output file path
@@ -114,41 +242,56 @@ class BaseTranslator(ABC):
             if max_lines:
                 lines = lines[:max_lines]
         
-        # Create semaphore for rate limiting
-        semaphore = asyncio.Semaphore(max_concurrent)
-        
-        async def translate_with_semaphore(line_text: str, line_num: int):
-            async with semaphore:
-                return await self.translate_text(line_text, from_code, to_code), line_num
-        
-        # Process lines concurrently
-        self.clogger.info(f"Starting concurrent translation of {len(lines)} lines")
-        
-        with tqdm(total=len(lines), desc="Translating lines", unit="line") as pbar:
-            # Create tasks for all lines
-            tasks = [translate_with_semaphore(line, i) for i, line in enumerate(lines) if line.strip()]
+        writer = OrderedWriter(output_path, source=f"{input_path}:{len(lines)}", resume=self.resume)
+        with writer:
+            # Chunks of non-empty lines from the resume point, each ending at an input position
+            chunks: List[tuple] = []
+            chunk: List[str] = []
+            for i in range(writer.position, len(lines)):
+                if lines[i].strip():
+                    chunk.append(lines[i])
+                if len(chunk) >= self.file_batch_lines:
+                    chunks.append((chunk, i + 1))
+                    chunk = []
+            last_position = chunks[-1][1] if chunks else writer.position
+            if last_position < len(lines):
+                chunks.append((chunk, len(lines)))
             
-            # Process with progress updates
-            translated_results = []
-            for task in asyncio.as_completed(tasks):
-                translated_text, line_num = await task
-                translated_results.append((line_num, translated_text))
-                pbar.update(1)
-        
-        # Sort results by original line order and write to file
-        translated_results.sort(key=lambda x: x[0])
-        
-        with open(output_path, 'w', encoding='utf-8') as outfile:
-            for _, translated_text in translated_results:
-                outfile.write(translated_text + '\n')
+            # Repeats (up to whitespace) of lines finished earlier in the run are not sent again
+            finished: Dict[str, str] = {}
+            
+            async def translate_chunk(chunk_lines: List[str]) -> List[str]:
+                keys = [normalize_source(line) for line in chunk_lines]
+                todo = [key for key in dict.fromkeys(keys) if key not in finished]
+                if todo:
+                    finished.update(zip(todo, await self.translate_batch(todo, from_code, to_code)))
+                return [finished[key] for key in keys]
+            
+            # Process lines concurrently, writing them in order as they complete
+            self.clogger.info(f"Starting concurrent translation of {len(lines) - writer.position} lines"
+                              f"{f' (resuming at line {writer.position + 1})' if writer.position else ''}")
+            
+            with tqdm(total=len(lines), initial=writer.position, desc="Translating lines", unit="line") as pbar:
+                chunk_starts = [writer.position] + [position for _, position in chunks]
+                await run_ordered(
+                    [(lambda chunk_lines=chunk_lines: translate_chunk(chunk_lines), position)
+                     for chunk_lines, position in chunks],
+                    writer, max_concurrent,
+                    on_done=lambda index: pbar.update(chunk_starts[index + 1] - chunk_starts[index])
+                )
+            writer.finish()
         
         self.clogger.info(f"Translation complete. Output: {output_path}", force=True)
+        self._log_memory_summary()
     
     async def translate_conversations(self, input_path: Path, output_path: Path,
                                      from_code: str, to_code: str, max_concurrent: int = 5):
         """
         Translate conversation JSON files with placeholder filling and concurrent processing.
         
+        Results stream to disk in input order and resume after interruption
+        (see _stream_conversations).
+        
         Args:
             input_path: Input JSON file path
             output_path: Output JSON file path
@@ -168,113 +311,122 @@ class BaseTranslator(ABC):
         # Load conversations using helper method
         conversations = self._load_conversations_from_json(input_path)
         
-        # Load placeholder mapping with reconciliation if needed
-        placeholder_map = self._load_placeholder_map()
-        
-        # Create semaphore for rate limiting
-        semaphore = asyncio.Semaphore(max_concurrent)
+        # Compile placeholder mapping (with reconciliation if needed) once per translator
+        placeholder_engine = self._get_placeholder_engine()
         
         async def translate_conversation(conv_idx: int, conversation: Dict) -> Dict:
-            async with semaphore:
-                # Validate conversation is a dictionary
-                if not isinstance(conversation, dict):
-                    logger.warning(f"Skipping non-dict conversation at index {conv_idx}: {type(conversation)}")
-                    return None
-                    
-                self.clogger.debug(f"Translating conversation {conv_idx + 1}/{len(conversations)}")
-                
-                # Create substitution cache for consistent replacements within conversation
-                substitution_cache = {}
-                
-                translated_conv = conversation.copy()
+            # Validate conversation is a dictionary
+            if not isinstance(conversation, dict):
+                logger.warning(f"Skipping non-dict conversation at index {conv_idx}: {type(conversation)}")
+                return None
                 
-                # Translate dialogue turns concurrently within the conversation
-                if "dialogue" in translated_conv:
-                    # Create tasks for all turns in this conversation
-                    turn_tasks = []
-                    for turn in translated_conv["dialogue"]:
-                        task = self.translate_text(turn["text"], from_code, to_code)
-                        turn_tasks.append(task)
-                    
-                    # Wait for all turn translations to complete
-                    translated_texts = await asyncio.gather(*turn_tasks)
-                    
-                    # Apply translations and fill placeholders
-                    for turn, translated_text in zip(translated_conv["dialogue"], translated_texts):
-                        turn["text"] = self._fill_placeholders(
-                            translated_text, placeholder_map, substitution_cache
-                        )
-                
-                # Update first_turn if present
-                if translated_conv.get("dialogue"):
-                    translated_conv["first_turn"] = translated_conv["dialogue"][0]["text"]
+            self.clogger.debug(f"Translating conversation {conv_idx + 1}/{len(conversations)}")
+            
+            translated_conv = conversation.copy()
+            
+            # Translate dialogue turns concurrently within the conversation
+            if "dialogue" in translated_conv:
+                translated_texts = await self.translate_batch(
+                    [turn["text"] for turn in translated_conv["dialogue"]], from_code, to_code
+                )
                 
-                return translated_conv
-        
-        # Process conversations concurrently while maintaining order
-        self.clogger.info(f"Starting concurrent translation of {len(conversations)} conversations")
-        
-        # Create tasks with indices to maintain order
-        async def translate_with_index(i: int, conv: Dict) -> tuple:
-            result = await translate_conversation(i, conv)
-            return i, result
+                # Fill placeholders consistently across the conversation and apply translations
+                filled_texts = self._fill_placeholders(
+                    placeholder_engine, translated_texts, conversation.get("conversation_id", conv_idx)
+                )
+                for turn, filled_text in zip(translated_conv["dialogue"], filled_texts):
+                    turn["text"] = filled_text
+            
+            # Update first_turn if present
+            if translated_conv.get("dialogue"):
+                translated_conv["first_turn"] = translated_conv["dialogue"][0]["text"]
+            
+            return translated_conv
         
-        tasks = [translate_with_index(i, conv) for i, conv in enumerate(conversations)]
+        await self._stream_conversations(conversations, input_path, output_path, translate_conversation, max_concurrent)
+        self._log_memory_summary()
+    
+    async def _stream_conversations(self, conversations: List[Dict], input_path: Path, output_path: Path,
+                                    translate_one: Callable[[int, Dict], Awaitable[Optional[Dict]]],
+                                    max_concurrent: int):
+        """
+        Translate conversations concurrently, streaming results to disk in input order.
         
-        with tqdm(total=len(conversations), desc="Translating conversations", unit="conv") as pbar:
-            # Process all tasks concurrently
-            results = []
-            for task in asyncio.as_completed(tasks):
-                index, translated_conv = await task
-                results.append((index, translated_conv))
-                pbar.update(1)
+        Finished conversations are appended to a JSONL file next to the output
+        as soon as all earlier ones are done, so an interrupted run resumes
+        after the last written conversation. The JSONL file is converted to
+        the output JSON array once every conversation is translated.
         
-        # Sort by original index and extract conversations (filter out None results)
-        results.sort(key=lambda x: x[0])
-        translated_conversations = [conv for _, conv in results if conv is not None]
+        Args:
+            conversations: Conversations to translate
+            input_path: Input JSON file path (identifies the job for resume)
+            output_path: Output JSON file path
+            translate_one: Coroutine translating (index, conversation), or returning None to skip it
+            max_concurrent: Maximum concurrent conversations to process
+        """
+        partial_path = output_path.with_name(output_path.name + PARTIAL_SUFFIX)
+        writer = OrderedWriter(partial_path, source=f"{input_path}:{len(conversations)}", resume=self.resume)
+        with writer:
+            async def translate_record(conv_idx: int) -> List[str]:
+                translated_conv = await translate_one(conv_idx, conversations[conv_idx])
+                return [json.dumps(translated_conv, ensure_ascii=False)] if translated_conv is not None else []
+            
+            # Process conversations concurrently while writing them in order
+            start = writer.position
+            self.clogger.info(f"Starting concurrent translation of {len(conversations) - start} conversations"
+                              f"{f' (resuming at conversation {start + 1})' if start else ''}")
+            
+            with tqdm(total=len(conversations), initial=start, desc="Translating conversations", unit="conv") as pbar:
+                await run_ordered(
+                    [(lambda conv_idx=conv_idx: translate_record(conv_idx), conv_idx + 1)
+                     for conv_idx in range(start, len(conversations))],
+                    writer, max_concurrent, on_done=lambda _: pbar.update(1)
+                )
+            writer.finish()
         
-        # Save translated conversations
+        # Convert the streamed JSONL into the output JSON array
+        with open(partial_path, 'r', encoding='utf-8') as f:
+            translated_conversations = [json.loads(line) for line in f if line.strip()]
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(translated_conversations, f, ensure_ascii=False, indent=2)
+        partial_path.unlink()
         
         self.clogger.info(f"Translated {len(conversations)} conversations", force=True)
     
-    def _fill_placeholders(self, text: str, placeholder_map: Dict[str, Dict],
-                          substitution_cache: Dict[str, str]) -> str:
+    def _fill_placeholders(self, placeholder_engine: PlaceholderEngine, texts: List[str],
+                          conversation_key) -> List[str]:
         """
-        Replace placeholder codes with appropriate substitutions.
+        Replace placeholder codes in a conversation's turns with substitutions.
         
         Args:
-            text: Text containing placeholders
-            placeholder_map: Mapping of codes to substitutions
-            substitution_cache: Cache for consistent substitutions
+            placeholder_engine: Compiled placeholder map
+            texts: Translated turn texts
+            conversation_key: Stable conversation key for the seeded RNG
             
         Returns:
-            Text with placeholders filled
+            Turn texts with placeholders filled (codes without a substitution are kept)
         """
-        def replace_placeholder(match):
-            code = match.group(0)
-            
-            # Check cache first
-            if code in substitution_cache:
-                return substitution_cache[code]
-            
-            # Get substitution from map
-            if code in placeholder_map:
-                entry = placeholder_map[code]
-                substitutions = entry.get('substitutions', [])
-                
-                if substitutions:
-                    # Choose random substitution and cache it
-                    substitution = random.choice(substitutions)
-                    substitution_cache[code] = substitution
-                    return substitution
-            
-            # Return code if no substitution found
-            self.clogger.warning(f"No substitution found for {code}")
-            return code
+        filled_texts = placeholder_engine.fill_conversation(texts, conversation_key)
+        for text in filled_texts:
+            for code in self.placeholder_pattern.findall(text):
+                self.clogger.warning(f"No substitution found for {code}")
+        return filled_texts
+    
+    def _get_placeholder_engine(self) -> PlaceholderEngine:
+        """
+        Placeholder engine for this translator, compiled on first use.
         
-        return self.placeholder_pattern.sub(replace_placeholder, text)
+        Choices are seeded from generation.random_seed when set, so re-runs
+        fill the same values.
+        
+        Returns:
+            Compiled PlaceholderEngine
+        """
+        if self._placeholder_engine is None:
+            self._placeholder_engine = PlaceholderEngine.from_code_map(
+                self._load_placeholder_map(), seed=getattr(self.config, 'generation_random_seed', None)
+            )
+        return self._placeholder_engine
     
     def _load_placeholder_map(self) -> Dict[str, Dict]:
         """
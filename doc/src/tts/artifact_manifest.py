@@ -0,0 +1,258 @@
+"""
+Append-only manifest of audio artifacts produced by the synthesizer.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from tts.audio_index import file_kind
+
+
+logger = logging.getLogger(__name__)
+
+
+# Manifest file kept at the root of each audio output directory
+MANIFEST_FILENAME = "manifest.jsonl"
+
+# Read size when hashing files already on disk
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Conversation statuses recorded before an outcome is known
+PENDING_STATUSES = ("queued", "started")
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactManifest:
+    """
+    One JSONL manifest per audio output directory.
+
+    Every produced file is appended as an artifact row (conversation, turn,
+    path, size, hash, status). Every conversation gets a conversation row when
+    it is queued or started and another when it finishes or fails. Each row is
+    written with a single O_APPEND write, so concurrent writers never interleave
+    partial lines, and readers take the latest row per key. Verification, resume and status reporting read this one
+    file instead of walking conversation directories.
+    """
+
+    def __init__(self, root: Path):
+        """
+        Initialize the manifest for an audio output directory.
+
+        Args:
+            root: Directory holding conversation_* folders
+        """
+        self.root = Path(root)
+        self.path = self.root / MANIFEST_FILENAME
+        self._artifacts: Optional[Dict[str, Dict]] = None
+        self._conversations: Optional[Dict[str, Dict]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def exists(self) -> bool:
+        """Whether a manifest has been written for this directory."""
+        return self.path.exists()
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether no artifacts have been recorded yet (e.g. output from before manifests)."""
+        with self._lock:
+            self._load()
+            return not self._artifacts
+
+    def _key(self, file_path: Path) -> str:
+        """Path of a file relative to the manifest root, in POSIX form."""
+        return Path(os.path.relpath(Path(file_path), self.root)).as_posix()
+
+    def _load(self):
+        """Read the manifest once, keeping the latest row per artifact and conversation."""
+        if self._artifacts is not None:
+            return
+        artifacts, conversations = {}, {}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        continue  # Torn line from an interrupted run
+                    if row.get("type") == "conversation":
+                        conversations[str(row["conversation_id"])] = row
+                    elif "path" in row:
+                        artifacts[row["path"]] = row
+        self._artifacts, self._conversations = artifacts, conversations
+
+    def _append(self, row: Dict):
+        """Append one row with a single atomic write."""
+        data = (json.dumps(row, ensure_ascii=False) + "\n").encode('utf-8')
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            logger.warning(f"Could not update artifact manifest {self.path}: {e}")
+
+    def record_artifact(self, conversation_id: int, file_path: Path, turn_id: Optional[int] = None,
+                        status: str = "ok") -> Dict:
+        """
+        Record a produced file.
+
+        Args:
+            conversation_id: Conversation the file belongs to
+            file_path: File that was written
+            turn_id: Turn number for turn files
+            status: "ok" or "failed"
+
+        Returns:
+            The stored row
+        """
+        file_path = Path(file_path)
+        row = {
+            "type": "artifact",
+            "conversation_id": conversation_id,
+            "turn_id": turn_id,
+            "kind": file_kind(file_path.name),
+            "path": self._key(file_path),
+            "status": status,
+            "time": round(time.time(), 3)
+        }
+        if status == "ok":
+            row["size"] = file_path.stat().st_size
+            row["sha256"] = hash_file(file_path)
+
+        with self._lock:
+            self._load()
+            self._append(row)
+            self._artifacts[row["path"]] = row
+        return row
+
+    def record_conversation(self, conversation_id: int, status: str, expected_turns: int,
+                            missing_turns: Optional[List[int]] = None) -> Dict:
+        """
+        Record the outcome of a conversation.
+
+        Args:
+            conversation_id: Conversation ID
+            status: "queued" or "started" before synthesis, then "complete" or "incomplete"
+            expected_turns: Number of dialogue turns
+            missing_turns: Turn IDs without audio
+
+        Returns:
+            The stored row
+        """
+        row = {
+            "type": "conversation",
+            "conversation_id": conversation_id,
+            "status": status,
+            "expected_turns": expected_turns,
+            "missing_turns": missing_turns or [],
+            "time": round(time.time(), 3)
+        }
+        with self._lock:
+            self._load()
+            self._append(row)
+            self._conversations[str(conversation_id)] = row
+        return row
+
+    def has_artifact(self, file_path: Path) -> bool:
+        """
+        Check whether a file was produced successfully, without touching the file.
+
+        Args:
+            file_path: Expected file
+
+        Returns:
+            True if the latest row for the file has status "ok"
+        """
+        with self._lock:
+            self._load()
+            row = self._artifacts.get(self._key(file_path))
+        return row is not None and row.get("status") == "ok"
+
+    def conversations(self) -> Dict[str, Dict]:
+        """Latest conversation row keyed by conversation ID."""
+        with self._lock:
+            self._load()
+            return dict(self._conversations)
+
+    def artifacts(self) -> List[Dict]:
+        """Latest artifact row for every recorded path."""
+        with self._lock:
+            self._load()
+            return list(self._artifacts.values())
+
+    def incomplete_conversations(self) -> Dict[str, List]:
+        """
+        Conversations whose latest outcome is not complete.
+
+        Conversations that were queued or started but never reached an outcome
+        (e.g. the run was killed) are included as "Not finished".
+
+        Returns:
+            Dictionary mapping conversation IDs to lists of missing turn IDs
+        """
+        return {
+            conversation_id: row.get("missing_turns") or (
+                ["Not finished"] if row.get("status") in PENDING_STATUSES else ["Incomplete"]
+            )
+            for conversation_id, row in self.conversations().items()
+            if row.get("status") != "complete"
+        }
+
+    def summary(self) -> Dict:
+        """
+        Count conversations and artifacts for status reporting.
+
+        Returns:
+            Dictionary with complete/incomplete conversation counts, artifact
+            counts per kind and total bytes
+        """
+        conversations = self.conversations()
+        artifacts = [row for row in self.artifacts() if row.get("status") == "ok"]
+        kinds: Dict[str, int] = {}
+        for row in artifacts:
+            kinds[row["kind"]] = kinds.get(row["kind"], 0) + 1
+        complete = sum(1 for row in conversations.values() if row.get("status") == "complete")
+        return {
+            "complete": complete,
+            "incomplete": len(conversations) - complete,
+            "artifacts": kinds,
+            "total_bytes": sum(row.get("size", 0) for row in artifacts)
+        }
+
+
+_manifests: Dict[str, ArtifactManifest] = {}
+_manifests_lock = threading.Lock()
+
+
+def get_artifact_manifest(root: Path) -> ArtifactManifest:
+    """
+    Get the process-wide artifact manifest for an output directory.
+
+    Args:
+        root: Directory holding conversation_* folders
+
+    Returns:
+        Shared ArtifactManifest instance
+    """
+    key = str(Path(root).resolve())
+    with _manifests_lock:
+        if key not in _manifests:
+            _manifests[key] = ArtifactManifest(root)
+        return _manifests[key]
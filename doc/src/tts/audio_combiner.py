@@ -4,16 +4,23 @@ Audio combiner for merging individual turn audio files into conversations.
 
 import logging
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
+import numpy as np
 from pydub import AudioSegment
 from config.config_loader import Config
+from tts.audio_io import decode_audio, write_wav, sample_rate_from_format
+from tts.audio_index import get_audio_index
 from utils.logging_utils import ConditionalLogger
 
 
 logger = logging.getLogger(__name__)
 
 
+# Suffixes of per-turn audio files picked up from a conversation directory
+TURN_AUDIO_EXTENSIONS = {'.mp3', '.wav', '.opus', '.ulaw', '.m4a', '.flac'}
+
+
 class AudioCombiner:
     """
     Combines individual audio turns into complete conversation files.
@@ -28,6 +35,8 @@ class AudioCombiner:
         """
         self.config = config
         self.clogger = ConditionalLogger(__name__, config.verbose)
+        self.backend = getattr(config, 'audio_combiner_backend', 'numpy')
+        self.sample_rate = sample_rate_from_format(config.voice_output_format)
     
     def combine_conversation(self, conversation_dir: Path, 
                            conversation_id: int) -> Optional[Path]:
@@ -43,22 +52,24 @@ class AudioCombiner:
         """
         self.clogger.debug(f"Combining audio files in {conversation_dir}")
         
-        # Get all turn audio files
-        audio_files = self._get_turn_files(conversation_dir)
-        
-        if not audio_files:
-            self.clogger.warning(f"No audio files found in {conversation_dir}")
-            return None
-        
         try:
-            # Load and combine audio files
-            combined_audio = self._combine_audio_files(audio_files)
-            
-            # Save combined audio
-            output_filename = f"conversation_{conversation_id:03d}_combined.wav"
-            output_path = conversation_dir / output_filename
+            output_path = self.combined_path(conversation_dir, conversation_id)
             
-            combined_audio.export(output_path, format="wav")
+            if self.backend == "pydub":
+                # Legacy path: repeated AudioSegment concatenation
+                audio_files = self._get_turn_files(conversation_dir)
+                if not audio_files:
+                    self.clogger.warning(f"No audio files found in {conversation_dir}")
+                    return None
+                combined_audio = self._combine_audio_files(audio_files)
+                combined_audio.export(output_path, format="wav")
+            else:
+                # Decode into one preallocated buffer and write it once
+                combined = self.combine_to_array(conversation_dir)
+                if combined is None:
+                    return None
+                samples, audio_files = combined
+                self.write_combined(output_path, samples, len(audio_files))
             
             self.clogger.debug(f"Combined {len(audio_files)} audio files into {output_path}")
             return output_path
@@ -67,6 +78,75 @@ class AudioCombiner:
             self.clogger.error(f"Error combining audio files: {e}")
             return None
     
+    def combined_path(self, conversation_dir: Path, conversation_id: int) -> Path:
+        """
+        Path of the combined WAV file for a conversation.
+        
+        Args:
+            conversation_dir: Conversation directory
+            conversation_id: Conversation ID for naming
+            
+        Returns:
+            Combined file path (the file may not exist in memory mode)
+        """
+        return conversation_dir / f"conversation_{conversation_id:03d}_combined.wav"
+    
+    def combine_to_array(self, conversation_dir: Path) -> Optional[Tuple[np.ndarray, List[Path]]]:
+        """
+        Combine the turns of a conversation in memory without writing a file.
+        
+        Turns not indexed yet are recorded in the audio index on the way.
+        
+        Args:
+            conversation_dir: Directory containing turn audio files
+            
+        Returns:
+            Tuple of (int16 mono samples at the output format rate, turn files in
+            order) or None if there are no turns
+        """
+        audio_files = self._get_turn_files(conversation_dir)
+        if not audio_files:
+            self.clogger.warning(f"No audio files found in {conversation_dir}")
+            return None
+        
+        samples, offsets = self._combine_audio_arrays(audio_files)
+        self._index_turns(conversation_dir, audio_files, samples, offsets)
+        return samples, audio_files
+    
+    def write_combined(self, output_path: Path, samples: np.ndarray, turns: int):
+        """
+        Write combined samples to a WAV file and record it in the audio index.
+        
+        Args:
+            output_path: Combined file path
+            samples: Combined int16 samples
+            turns: Number of turns in the conversation
+        """
+        write_wav(output_path, samples, self.sample_rate)
+        get_audio_index(output_path.parent.parent).record(output_path, samples, self.sample_rate, turns=turns)
+    
+    def _index_turns(self, conversation_dir: Path, audio_files: List[Path],
+                     samples: np.ndarray, offsets: List[int]):
+        """
+        Record turns not indexed yet in the audio index.
+        
+        Turns are sliced back out of the combined buffer, so encoded (MP3) turns
+        get indexed without another decode.
+        
+        Args:
+            conversation_dir: Conversation directory
+            audio_files: Turn files in order
+            samples: Combined samples
+            offsets: Start offset of each turn in samples
+        """
+        index = get_audio_index(conversation_dir.parent)
+        silence_samples = int(self.sample_rate * self.config.silence_duration_ms / 1000)
+        ends = [offset - silence_samples for offset in offsets[1:]] + [len(samples)]
+        
+        for audio_file, start, end in zip(audio_files, offsets, ends):
+            if index.get(audio_file) is None:
+                index.record(audio_file, samples[start:end], self.sample_rate)
+    
     def _get_turn_files(self, conversation_dir: Path) -> List[Path]:
         """
         Get all turn audio files in order.
@@ -80,8 +160,7 @@ class AudioCombiner:
         # Find all turn files (mp3, wav, or other audio formats)
         turn_files = list(conversation_dir.glob("turn_*.*"))
         # Filter to only audio files
-        audio_extensions = {'.mp3', '.wav', '.opus', '.ulaw', '.m4a', '.flac'}
-        turn_files = [f for f in turn_files if f.suffix.lower() in audio_extensions]
+        turn_files = [f for f in turn_files if f.suffix.lower() in TURN_AUDIO_EXTENSIONS]
         
         # Sort by turn number
         turn_files.sort(key=lambda x: int(x.stem.split('_')[1]))
@@ -109,4 +188,35 @@ class AudioCombiner:
             audio_segment = AudioSegment.from_file(audio_file)
             combined_audio = combined_audio + silence + audio_segment
         
-        return combined_audio
\ No newline at end of file
+        return combined_audio
+    
+    def _combine_audio_arrays(self, audio_files: List[Path]) -> Tuple[np.ndarray, List[int]]:
+        """
+        Combine multiple audio files into a single preallocated PCM buffer.
+        
+        Every turn is decoded once at the common sample rate, offsets are computed
+        up front and each turn is copied into place, so the cost is linear in the
+        total length instead of quadratic in the number of turns.
+        
+        Args:
+            audio_files: List of audio file paths
+            
+        Returns:
+            Tuple of (int16 mono samples, start offset in samples for each turn)
+        """
+        turns = [decode_audio(audio_file, self.sample_rate) for audio_file in audio_files]
+        silence_samples = int(self.sample_rate * self.config.silence_duration_ms / 1000)
+        
+        offsets = []
+        position = 0
+        for turn in turns:
+            offsets.append(position)
+            position += len(turn) + silence_samples
+        total_samples = position - silence_samples if turns else 0
+        
+        # Zero-initialised buffer doubles as the inter-turn silence
+        combined = np.zeros(total_samples, dtype=np.int16)
+        for offset, turn in zip(offsets, turns):
+            combined[offset:offset + len(turn)] = turn
+        
+        return combined, offsets
@@ -0,0 +1,253 @@
+"""
+Duration and loudness index for generated audio files.
+"""
+
+import os
+import json
+import math
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from tts.audio_io import dbfs, to_float32
+
+
+logger = logging.getLogger(__name__)
+
+
+# Index file kept at the root of each audio output directory
+AUDIO_INDEX_FILENAME = "audio_index.jsonl"
+
+# Columns produced by audio_stats
+STAT_FIELDS = ("duration_ms", "sample_rate", "channels", "frames", "rms_dbfs", "peak_dbfs")
+
+
+def audio_stats(samples: np.ndarray, sample_rate: int) -> Dict:
+    """
+    Compute duration and level statistics for an audio array.
+
+    Args:
+        samples: int16 array, or float array in [-1.0, 1.0]
+        sample_rate: Sample rate in Hz
+
+    Returns:
+        Dictionary with duration_ms, sample_rate, channels, frames, rms_dbfs and
+        peak_dbfs (levels are None for digital silence)
+    """
+    channels = 1 if samples.ndim == 1 else samples.shape[1]
+    frames = len(samples)
+    floats = to_float32(samples) if samples.dtype == np.int16 else samples
+    peak = float(np.max(np.abs(floats))) if floats.size else 0.0
+    rms_dbfs = dbfs(floats)
+    return {
+        "duration_ms": int(frames * 1000 / sample_rate) if sample_rate else 0,
+        "sample_rate": sample_rate,
+        "channels": channels,
+        "frames": frames,
+        "rms_dbfs": round(rms_dbfs, 2) if math.isfinite(rms_dbfs) else None,
+        "peak_dbfs": round(20 * math.log10(peak), 2) if peak > 0 else None
+    }
+
+
+def file_kind(name: str) -> str:
+    """Classify an audio file by its pipeline stage from its name."""
+    if name.startswith("turn_"):
+        return "turn"
+    for suffix, kind in (("_sampled.wav", "sampled"), ("_final.wav", "final"), ("_combined.wav", "combined"),
+                         ("_combined.flac", "debug")):
+        if name.endswith(suffix):
+            return kind
+    return "other"
+
+
+class AudioIndex:
+    """
+    Append-only JSONL index with one row per audio file.
+
+    Rows are keyed by path relative to the index root and carry the file size and
+    mtime they were computed for, so a row is ignored once its file changes.
+    Later rows for the same path replace earlier ones; ``compact`` rewrites the
+    file with one row per path.
+    """
+
+    def __init__(self, root: Path):
+        """
+        Initialize the index for an audio output directory.
+
+        Args:
+            root: Directory holding conversation_* folders
+        """
+        self.root = Path(root)
+        self.path = self.root / AUDIO_INDEX_FILENAME
+        self._rows: Optional[Dict[str, Dict]] = None
+        self._lock = threading.Lock()
+
+    def _key(self, file_path: Path) -> str:
+        """Path of a file relative to the index root, in POSIX form."""
+        return Path(os.path.relpath(Path(file_path), self.root)).as_posix()
+
+    def _load(self) -> Dict[str, Dict]:
+        """Read the index once, keeping the latest row per path."""
+        if self._rows is None:
+            rows = {}
+            if self.path.exists():
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            row = json.loads(line)
+                            rows[row["path"]] = row
+                        except (ValueError, KeyError):
+                            continue  # Torn or foreign line
+            self._rows = rows
+        return self._rows
+
+    def record(self, file_path: Path, samples: np.ndarray, sample_rate: int, **fields) -> Dict:
+        """
+        Compute statistics for audio just written and append them to the index.
+
+        Args:
+            file_path: Audio file that was written
+            samples: Samples that were written to it
+            sample_rate: Sample rate in Hz
+            **fields: Extra columns to store on the row
+
+        Returns:
+            The stored row
+        """
+        return self.record_stats(file_path, audio_stats(samples, sample_rate), **fields)
+
+    def record_stats(self, file_path: Path, stats: Dict, **fields) -> Dict:
+        """
+        Append precomputed statistics for a file to the index.
+
+        Args:
+            file_path: Audio file the statistics describe
+            stats: Output of audio_stats
+            **fields: Extra columns to store on the row
+
+        Returns:
+            The stored row
+        """
+        file_path = Path(file_path)
+        stat = file_path.stat()
+        row = {
+            "path": self._key(file_path),
+            "conversation": file_path.parent.name,
+            "kind": file_kind(file_path.name),
+            **stats,
+            **fields,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns
+        }
+
+        line = json.dumps(row, ensure_ascii=False) + "\n"
+        with self._lock:
+            rows = self._load()
+            try:
+                self.root.mkdir(parents=True, exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line)
+            except OSError as e:
+                logger.warning(f"Could not update audio index {self.path}: {e}")
+            rows[row["path"]] = row
+        return row
+
+    def get(self, file_path: Path) -> Optional[Dict]:
+        """
+        Look up the row for a file if it still describes the file on disk.
+
+        Args:
+            file_path: Audio file
+
+        Returns:
+            Row dictionary or None if missing or stale
+        """
+        with self._lock:
+            row = self._load().get(self._key(file_path))
+        if row is None:
+            return None
+        try:
+            stat = Path(file_path).stat()
+        except FileNotFoundError:
+            return None
+        if stat.st_size != row.get("size") or stat.st_mtime_ns != row.get("mtime_ns"):
+            return None
+        return row
+
+    def rows(self, kind: Optional[str] = None) -> List[Dict]:
+        """
+        Return the latest row for every indexed file.
+
+        Args:
+            kind: Only rows of this kind ("turn", "combined", "final", "sampled")
+
+        Returns:
+            Rows sorted by path
+        """
+        with self._lock:
+            rows = list(self._load().values())
+        if kind:
+            rows = [row for row in rows if row.get("kind") == kind]
+        return sorted(rows, key=lambda row: row["path"])
+
+    def summary(self, kind: Optional[str] = None) -> Dict:
+        """
+        Aggregate dataset statistics from the index without decoding audio.
+
+        Args:
+            kind: Only include rows of this kind
+
+        Returns:
+            Dictionary with files, total/mean duration and mean loudness
+        """
+        rows = self.rows(kind)
+        durations = [row["duration_ms"] for row in rows]
+        loudness = [row["rms_dbfs"] for row in rows if row.get("rms_dbfs") is not None]
+        return {
+            "files": len(rows),
+            "total_duration_hours": round(sum(durations) / 3_600_000, 3),
+            "mean_duration_seconds": round(sum(durations) / len(durations) / 1000, 2) if durations else 0.0,
+            "mean_rms_dbfs": round(sum(loudness) / len(loudness), 2) if loudness else None
+        }
+
+    def compact(self):
+        """Rewrite the index atomically with one row per file that still exists."""
+        with self._lock:
+            rows = self._load()
+            kept = {key: row for key, row in rows.items() if (self.root / key).exists()}
+            if not self.path.exists() and not kept:
+                return
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    for key in sorted(kept):
+                        f.write(json.dumps(kept[key], ensure_ascii=False) + "\n")
+                os.replace(tmp_path, self.path)
+                self._rows = kept
+            except OSError as e:
+                logger.warning(f"Could not compact audio index {self.path}: {e}")
+
+
+_indexes: Dict[str, AudioIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_audio_index(root: Path) -> AudioIndex:
+    """
+    Get the process-wide audio index for an output directory.
+
+    Args:
+        root: Directory holding conversation_* folders
+
+    Returns:
+        Shared AudioIndex instance
+    """
+    key = str(Path(root).resolve())
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = AudioIndex(root)
+        return _indexes[key]
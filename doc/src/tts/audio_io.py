@@ -0,0 +1,275 @@
+"""
+NumPy-based audio I/O helpers shared by the TTS audio stages.
+"""
+
+import re
+import shutil
+import subprocess
+import wave
+import logging
+from math import gcd
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+# Sample width used for every in-memory buffer (16-bit PCM)
+SAMPLE_WIDTH = 2
+INT16_MAX = 32767
+
+
+def sample_rate_from_format(format_str: str, default: int = 44100) -> int:
+    """
+    Extract the sample rate from an ElevenLabs output format string.
+
+    Args:
+        format_str: Format string like 'mp3_44100_128' or 'pcm_22050'
+        default: Sample rate to use when none can be parsed
+
+    Returns:
+        Sample rate in Hz
+    """
+    match = re.search(r'_(\d{4,6})(?:_|$)', format_str or "")
+    return int(match.group(1)) if match else default
+
+
+def decode_audio(path: Path, sample_rate: int, channels: int = 1) -> np.ndarray:
+    """
+    Decode an audio file into a 16-bit PCM array at the requested rate.
+
+    WAV files that already match the target layout are read directly; everything
+    else is piped through a single ffmpeg process as raw PCM. Falls back to pydub
+    when ffmpeg is not on PATH.
+
+    Args:
+        path: Audio file to decode
+        sample_rate: Target sample rate in Hz
+        channels: Target channel count
+
+    Returns:
+        int16 array of shape (frames,) for mono or (frames, channels)
+    """
+    path = Path(path)
+
+    if path.suffix.lower() == '.wav':
+        samples = _read_wav_if_matching(path, sample_rate, channels)
+        if samples is not None:
+            return samples
+
+    if shutil.which("ffmpeg"):
+        command = [
+            "ffmpeg", "-v", "error",
+            "-i", str(path),
+            "-f", "s16le",
+            "-acodec", "pcm_s16le",
+            "-ar", str(sample_rate),
+            "-ac", str(channels),
+            "-"
+        ]
+        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed to decode {path}: {result.stderr.decode(errors='ignore')[:200]}")
+        samples = np.frombuffer(result.stdout, dtype=np.int16)
+    else:
+        from pydub import AudioSegment
+        segment = AudioSegment.from_file(path)
+        segment = segment.set_frame_rate(sample_rate).set_channels(channels).set_sample_width(SAMPLE_WIDTH)
+        samples = np.frombuffer(segment.raw_data, dtype=np.int16)
+
+    if channels > 1:
+        samples = samples.reshape(-1, channels)
+    return samples
+
+
+def _read_wav_if_matching(path: Path, sample_rate: int, channels: int) -> Optional[np.ndarray]:
+    """
+    Read a WAV file with the stdlib reader if it already has the target layout.
+
+    Args:
+        path: WAV file path
+        sample_rate: Expected sample rate
+        channels: Expected channel count
+
+    Returns:
+        int16 array or None if the file needs conversion
+    """
+    try:
+        with wave.open(str(path), 'rb') as wav_file:
+            if (wav_file.getframerate() != sample_rate
+                    or wav_file.getnchannels() != channels
+                    or wav_file.getsampwidth() != SAMPLE_WIDTH):
+                return None
+            frames = wav_file.readframes(wav_file.getnframes())
+    except (wave.Error, EOFError):
+        return None
+
+    samples = np.frombuffer(frames, dtype=np.int16)
+    if channels > 1:
+        samples = samples.reshape(-1, channels)
+    return samples
+
+
+def read_wav(path: Path) -> Tuple[np.ndarray, int]:
+    """
+    Read a 16-bit PCM WAV file without resampling.
+
+    Args:
+        path: WAV file path
+
+    Returns:
+        Tuple of (int16 array shaped (frames,) or (frames, channels), sample rate)
+
+    Raises:
+        ValueError: If the file is not 16-bit PCM
+    """
+    with wave.open(str(path), 'rb') as wav_file:
+        if wav_file.getsampwidth() != SAMPLE_WIDTH:
+            raise ValueError(f"Unsupported sample width {wav_file.getsampwidth()} in {path}")
+        channels = wav_file.getnchannels()
+        sample_rate = wav_file.getframerate()
+        frames = wav_file.readframes(wav_file.getnframes())
+
+    samples = np.frombuffer(frames, dtype=np.int16)
+    if channels > 1:
+        samples = samples.reshape(-1, channels)
+    return samples, sample_rate
+
+
+def write_wav(path: Path, samples: np.ndarray, sample_rate: int):
+    """
+    Write a 16-bit PCM array to a WAV file in a single pass.
+
+    Args:
+        path: Output file path
+        samples: int16 array, or float array in [-1.0, 1.0]
+        sample_rate: Sample rate in Hz
+    """
+    if samples.dtype != np.int16:
+        samples = to_int16(samples)
+    channels = 1 if samples.ndim == 1 else samples.shape[1]
+
+    with wave.open(str(path), 'wb') as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(SAMPLE_WIDTH)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(np.ascontiguousarray(samples).tobytes())
+
+
+def write_flac(path: Path, samples: np.ndarray, sample_rate: int) -> bool:
+    """
+    Write a 16-bit PCM array to a FLAC file.
+
+    Uses soundfile when installed, otherwise pydub with ffmpeg.
+
+    Args:
+        path: Output file path
+        samples: int16 array, or float array in [-1.0, 1.0]
+        sample_rate: Sample rate in Hz
+
+    Returns:
+        True if the file was written, False if no FLAC encoder is available
+    """
+    if samples.dtype != np.int16:
+        samples = to_int16(samples)
+    samples = np.ascontiguousarray(samples)
+
+    try:
+        import soundfile
+        soundfile.write(str(path), samples, sample_rate, subtype='PCM_16', format='FLAC')
+        return True
+    except ImportError:
+        pass
+
+    if not shutil.which("ffmpeg"):
+        return False
+
+    from pydub import AudioSegment
+    channels = 1 if samples.ndim == 1 else samples.shape[1]
+    segment = AudioSegment(samples.tobytes(), frame_rate=sample_rate, sample_width=SAMPLE_WIDTH, channels=channels)
+    segment.export(path, format="flac")
+    return True
+
+
+def to_float32(samples: np.ndarray) -> np.ndarray:
+    """
+    Convert int16 PCM to float32 in [-1.0, 1.0].
+
+    Args:
+        samples: int16 array
+
+    Returns:
+        float32 array
+    """
+    return samples.astype(np.float32) / (INT16_MAX + 1)
+
+
+def to_int16(samples: np.ndarray) -> np.ndarray:
+    """
+    Convert float PCM in [-1.0, 1.0] to int16 with clipping.
+
+    Args:
+        samples: Float array
+
+    Returns:
+        int16 array
+    """
+    return np.clip(np.round(samples * (INT16_MAX + 1)), -INT16_MAX - 1, INT16_MAX).astype(np.int16)
+
+
+def dbfs(samples: np.ndarray) -> float:
+    """
+    Compute loudness in dBFS, matching pydub's AudioSegment.dBFS.
+
+    Args:
+        samples: int16 array, or float array in [-1.0, 1.0]
+
+    Returns:
+        RMS level in dBFS (-inf for silence)
+    """
+    if samples.dtype == np.int16:
+        samples = to_float32(samples)
+    if samples.size == 0:
+        return float('-inf')
+    rms = float(np.sqrt(np.mean(np.square(samples, dtype=np.float64))))
+    if rms == 0.0:
+        return float('-inf')
+    return 20 * np.log10(rms)
+
+
+def apply_gain_db(samples: np.ndarray, gain_db: float) -> np.ndarray:
+    """
+    Scale a float PCM array by a gain in decibels.
+
+    Args:
+        samples: Float array
+        gain_db: Gain in dB (negative to attenuate)
+
+    Returns:
+        Scaled float32 array
+    """
+    return (samples * np.float32(10 ** (gain_db / 20))).astype(np.float32)
+
+
+def resample(samples: np.ndarray, orig_rate: int, target_rate: int) -> np.ndarray:
+    """
+    Resample a float PCM array with a polyphase anti-aliasing filter.
+
+    Args:
+        samples: Float array of shape (frames,) or (frames, channels)
+        orig_rate: Source sample rate in Hz
+        target_rate: Target sample rate in Hz
+
+    Returns:
+        Resampled float32 array
+    """
+    if orig_rate == target_rate:
+        return samples.astype(np.float32, copy=False)
+
+    from scipy.signal import resample_poly
+
+    divisor = gcd(orig_rate, target_rate)
+    return resample_poly(samples, target_rate // divisor, orig_rate // divisor, axis=0).astype(np.float32)
@@ -5,11 +5,18 @@ Audio processing module for applying effects and filters.
 import random
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
+import numpy as np
 from pydub import AudioSegment
 from pydub.effects import low_pass_filter, high_pass_filter
 from config.config_loader import Config
+from tts.audio_io import (
+    decode_audio, write_wav, sample_rate_from_format,
+    to_float32, dbfs, apply_gain_db, resample
+)
+from tts.sound_effect_bank import get_sound_effect_bank
+from tts.audio_index import get_audio_index
 
 
 logger = logging.getLogger(__name__)
@@ -38,6 +45,13 @@ class AudioProcessor:
             'background_noise_level': 0.3,
             'call_end_volume': 0.5
         })
+        
+        # "numpy" runs the whole chain in memory; "pydub" keeps the legacy file-based chain
+        self.engine = self.effects_config.get('engine', 'numpy')
+        self.input_sample_rate = sample_rate_from_format(config.voice_output_format)
+        self.output_sample_rate = self.effects_config.get('output_sample_rate', 16000)
+        self.filter_order = self.effects_config.get('bandpass_order', 4)
+        self._sos_cache = {}
     
     def process_conversation_audio(self, audio_path: Path) -> Optional[Path]:
         """
@@ -50,6 +64,9 @@ class AudioProcessor:
             Path to the processed audio file or None if processing failed
         """
         try:
+            if self.engine != 'pydub':
+                return self._process_in_memory(audio_path)
+            
             processed_path = audio_path
             
             # Add background and sound effects if enabled
@@ -75,6 +92,175 @@ class AudioProcessor:
             logger.error(f"Error processing audio {audio_path}: {e}")
             return None
     
+    def _process_in_memory(self, audio_path: Path) -> Path:
+        """
+        Run the full effects chain on NumPy arrays and write a single final file.
+        
+        Args:
+            audio_path: Path to the combined audio file
+            
+        Returns:
+            Path to the final phone-quality audio file
+        """
+        index = get_audio_index(audio_path.parent.parent)
+        call_audio = decode_audio(audio_path, self.input_sample_rate)
+        return self.process_samples(
+            call_audio, self.final_path(audio_path), self._indexed_loudness(index, audio_path)
+        )
+    
+    def process_samples(self, call_audio: np.ndarray, output_path: Path,
+                        call_loudness: Optional[float] = None) -> Path:
+        """
+        Run the effects chain on combined samples already in memory and write the final file.
+        
+        This is the only write of the numpy chain, so no intermediate file is
+        needed between combining and packaging.
+        
+        Args:
+            call_audio: Combined int16 samples at the TTS output rate
+            output_path: Final file path
+            call_loudness: dBFS of call_audio if already known
+            
+        Returns:
+            Path to the final phone-quality audio file
+        """
+        processed, sample_rate = self.apply_effects_chain(
+            to_float32(call_audio), self.input_sample_rate, call_loudness
+        )
+        
+        write_wav(output_path, processed, sample_rate)
+        get_audio_index(output_path.parent.parent).record(output_path, processed, sample_rate)
+        
+        logger.debug(f"Saved processed audio: {output_path} ({sample_rate} Hz)")
+        return output_path
+    
+    @staticmethod
+    def final_path(audio_path: Path) -> Path:
+        """
+        Path of the final processed file for a combined audio file.
+        
+        Args:
+            audio_path: Combined audio file path
+            
+        Returns:
+            Final file path
+        """
+        return audio_path.parent / audio_path.name.replace('.wav', '_final.wav')
+    
+    def apply_effects_chain(self, call_audio: np.ndarray, sample_rate: int,
+                            call_loudness: Optional[float] = None) -> Tuple[np.ndarray, int]:
+        """
+        Apply background overlay, leveling, call end effect, bandpass and resampling.
+        
+        Args:
+            call_audio: Mono float32 call audio in [-1.0, 1.0]
+            sample_rate: Sample rate of call_audio
+            call_loudness: dBFS of call_audio if already known (e.g. from the audio index)
+            
+        Returns:
+            Tuple of (processed float32 audio, output sample rate)
+        """
+        processed = call_audio
+        
+        bank = get_sound_effect_bank(self.sound_effects_dir, sample_rate)
+        
+        if self.effects_config.get('enable_background_noise'):
+            sampled = bank.random_background(len(call_audio))
+            if sampled is not None:
+                background, background_loudness = sampled
+                background = apply_gain_db(
+                    background, self._background_gain_db(background_loudness, call_audio, call_loudness)
+                )
+                processed = call_audio + background
+                logger.debug("Background audio added to call audio")
+        
+        if self.effects_config.get('enable_call_end_effect'):
+            effect = bank.call_end()
+            if effect is not None:
+                call_end = to_float32(np.asarray(effect.samples))
+                end_volume = self.effects_config.get('call_end_volume', 0.5)
+                if end_volume < 1.0:
+                    call_end = apply_gain_db(call_end, -20 * (1.0 - end_volume))
+                processed = np.concatenate([processed, call_end])
+                logger.debug("Call end effect added to combined audio")
+        
+        if self.effects_config.get('enable_bandpass_filter'):
+            processed = self._bandpass_array(processed, sample_rate)
+        
+        if self.output_sample_rate and self.output_sample_rate != sample_rate:
+            processed = resample(processed, sample_rate, self.output_sample_rate)
+            sample_rate = self.output_sample_rate
+        
+        return processed.astype(np.float32, copy=False), sample_rate
+    
+    def _background_gain_db(self, background_loudness: float, call_audio: np.ndarray,
+                            call_loudness: Optional[float] = None) -> float:
+        """
+        Compute the gain that puts the background below the call audio.
+        
+        Mirrors _reduce_background_volume plus the background_noise_level setting.
+        
+        Args:
+            background_loudness: Precomputed dBFS of the background effect
+            call_audio: Call audio
+            call_loudness: dBFS of call_audio if already known
+            
+        Returns:
+            Gain in dB to apply to the background
+        """
+        gain = 0.0
+        if call_loudness is None:
+            call_loudness = dbfs(call_audio)
+        if np.isfinite(call_loudness) and np.isfinite(background_loudness):
+            target_difference = self.config.background_volume_reduction_db
+            gain -= (background_loudness - call_loudness) + target_difference
+        
+        noise_level = self.effects_config.get('background_noise_level', 0.3)
+        if noise_level < 1.0:
+            gain += -20 * (1.0 - noise_level)
+        return gain
+    
+    def _indexed_loudness(self, index, audio_path: Path) -> Optional[float]:
+        """
+        Look up a file's dBFS in the audio index.
+        
+        Args:
+            index: AudioIndex for the output directory
+            audio_path: Audio file
+            
+        Returns:
+            dBFS (-inf for silence) or None if the file is not indexed
+        """
+        row = index.get(audio_path)
+        if row is None:
+            return None
+        return row["rms_dbfs"] if row.get("rms_dbfs") is not None else float('-inf')
+    
+    def _bandpass_array(self, samples: np.ndarray, sample_rate: int) -> np.ndarray:
+        """
+        Apply a Butterworth bandpass (second-order sections) for phone quality.
+        
+        Args:
+            samples: Float audio samples
+            sample_rate: Sample rate in Hz
+            
+        Returns:
+            Filtered float32 samples
+        """
+        from scipy.signal import butter, sosfilt
+        
+        if sample_rate not in self._sos_cache:
+            nyquist = sample_rate / 2
+            high = min(self.config.bandpass_high_freq, nyquist * 0.99)
+            self._sos_cache[sample_rate] = butter(
+                self.filter_order,
+                [self.config.bandpass_low_freq, high],
+                btype='bandpass',
+                fs=sample_rate,
+                output='sos'
+            )
+        return sosfilt(self._sos_cache[sample_rate], samples).astype(np.float32)
+    
     def _add_background_and_effects(self, audio_path: Path) -> Optional[Path]:
         """
         Add background noise and call end effects to the audio.
@@ -113,7 +299,10 @@ class AudioProcessor:
                 background_audio = self._adjust_background_length(background_audio, call_audio)
                 
                 # Reduce background volume
-                background_audio = self._reduce_background_volume(background_audio, call_audio)
+                background_audio = self._reduce_background_volume(
+                    background_audio, call_audio,
+                    self._indexed_loudness(get_audio_index(audio_path.parent.parent), audio_path)
+                )
                 
                 # Apply additional level adjustment from config
                 noise_level = self.effects_config.get('background_noise_level', 0.3)
@@ -186,22 +375,17 @@ class AudioProcessor:
         Returns:
             AudioSegment of background sound or None if not found
         """
-        background_dir = self.sound_effects_dir / "backgrounds"
-        
-        if not background_dir.exists():
-            logger.warning(f"Background sounds directory not found: {background_dir}")
-            return None
+        bank = get_sound_effect_bank(self.sound_effects_dir, self.input_sample_rate)
+        bank.load()
         
-        background_files = list(background_dir.glob("*.mp3"))
-        
-        if not background_files:
+        if not bank.backgrounds:
             logger.warning("No background sound files found")
             return None
         
-        selected_file = random.choice(background_files)
-        logger.debug(f"Selected background: {selected_file.name}")
+        effect = random.choice(bank.backgrounds)
+        logger.debug(f"Selected background: {effect.name}")
         
-        return AudioSegment.from_file(selected_file)
+        return self._effect_to_segment(effect)
     
     def _get_call_end_effect(self) -> Optional[AudioSegment]:
         """
@@ -210,20 +394,30 @@ class AudioProcessor:
         Returns:
             AudioSegment of call end effect or None if not found
         """
-        call_effects_dir = self.sound_effects_dir / "call_effects"
-        
-        if not call_effects_dir.exists():
-            logger.warning(f"Call effects directory not found: {call_effects_dir}")
-            return None
-        
-        call_end_files = list(call_effects_dir.glob("call_end_*.mp3"))
+        effect = get_sound_effect_bank(self.sound_effects_dir, self.input_sample_rate).call_end()
         
-        if not call_end_files:
+        if effect is None:
             logger.warning("No call end effect files found")
             return None
         
-        # Use the first call end effect found
-        return AudioSegment.from_file(call_end_files[0])
+        return self._effect_to_segment(effect)
+    
+    def _effect_to_segment(self, effect) -> AudioSegment:
+        """
+        Wrap a pre-decoded sound effect in an AudioSegment without re-decoding.
+        
+        Args:
+            effect: SoundEffect from the bank
+            
+        Returns:
+            Mono 16-bit AudioSegment
+        """
+        return AudioSegment(
+            data=np.asarray(effect.samples).tobytes(),
+            sample_width=2,
+            frame_rate=effect.sample_rate,
+            channels=1
+        )
     
     def _adjust_background_length(self, background: AudioSegment, 
                                  call_audio: AudioSegment) -> AudioSegment:
@@ -254,19 +448,22 @@ class AudioProcessor:
         return background
     
     def _reduce_background_volume(self, background: AudioSegment,
-                                 call_audio: AudioSegment) -> AudioSegment:
+                                 call_audio: AudioSegment,
+                                 call_loudness: Optional[float] = None) -> AudioSegment:
         """
         Reduce background volume to be lower than call audio.
         
         Args:
             background: Background audio
             call_audio: Call audio
+            call_loudness: dBFS of call_audio if already known (e.g. from the audio index)
             
         Returns:
             Background audio with reduced volume
         """
         # Calculate volume difference
-        call_loudness = call_audio.dBFS
+        if call_loudness is None:
+            call_loudness = call_audio.dBFS
         background_loudness = background.dBFS
         
         # Calculate required reduction to achieve target difference
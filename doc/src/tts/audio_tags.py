@@ -2,7 +2,8 @@
 Audio tags for ElevenLabs v3 TTS model to add emotional context and expressiveness.
 """
 
-from typing import Dict, List, Optional
+import re
+from typing import Dict, List, Optional, Tuple
 import random
 
 
@@ -50,72 +51,149 @@ class AudioTagManager:
         "disagreeing": ["objects politely", "disputes", "questions"]
     }
     
+    # Keyword cues that classify middle turns, checked in order (substring match)
+    CONTENT_CUES = [
+        ("creating_urgency", ["urgent", "important", "immediately", "now"]),
+        ("building_trust", ["understand", "help", "support"]),
+        ("extracting_info", ["tell", "give", "provide", "confirm"])
+    ]
+    
+    # Fallback categories for middle turns without a keyword cue
+    DEFAULT_MIDDLE_CATEGORIES = ["building_trust", "informing", "requesting"]
+    
+    QUESTION_TAGS = ("curious", "questioning")
+    EXCLAMATION_TAGS = ("excited", "emphatic")
+    REACTION_PROBABILITY = 0.1
+    MAX_TAGS = 2
+    
+    _CUE_PATTERNS = [
+        (category, re.compile("|".join(re.escape(word) for word in words)))
+        for category, words in CONTENT_CUES
+    ]
+    
     def __init__(self):
-        """Initialize the audio tag manager."""
-        pass
+        """Initialize the audio tag manager and precompute tag tables."""
+        self._tag_tables: Dict[Tuple[str, str], Dict[str, Tuple[str, ...]]] = {}
+        for conversation_type in self.EMOTIONAL_TAGS:
+            for role in ("caller", "callee"):
+                self._tag_tables[(conversation_type, role)] = self._build_tag_table(conversation_type)
+    
+    def _build_tag_table(self, conversation_type: str) -> Dict[str, Tuple[str, ...]]:
+        """
+        Flatten the emotional tag categories into a lookup table for one conversation type.
+        
+        Keys are "opening", "closing", each content cue category and "middle_default";
+        values are the candidate tags (empty when the type has no such category).
+        
+        Args:
+            conversation_type: "scam" or "legit"
+            
+        Returns:
+            Mapping of table key to candidate tags
+        """
+        categories = self.EMOTIONAL_TAGS[conversation_type]
+        table = {
+            "opening": tuple(categories.get("opener", ())),
+            "closing": tuple(categories.get("closing", ()))
+        }
+        for category, _ in self.CONTENT_CUES:
+            table[category] = tuple(categories.get(category, ()))
+        
+        default_tags = []
+        for category in self.DEFAULT_MIDDLE_CATEGORIES:
+            default_tags.extend(categories.get(category, ()))
+        table["middle_default"] = tuple(default_tags)
+        return table
+    
+    def _classify_middle_turn(self, text_lower: str) -> str:
+        """
+        Pick the tag table key for a middle turn from its content.
+        
+        Args:
+            text_lower: Lower-cased turn text
+            
+        Returns:
+            Tag table key
+        """
+        for category, pattern in self._CUE_PATTERNS:
+            if pattern.search(text_lower):
+                return category
+        return "middle_default"
     
     def get_contextual_tags(self, 
                           conversation_type: str,
                           turn_position: str,
                           role: str,
-                          text_content: str) -> List[str]:
+                          text_content: str,
+                          rng: Optional[random.Random] = None) -> List[str]:
         """
         Get appropriate audio tags based on conversation context.
         
+        Pure lookup over the precomputed tag tables: no instance state is written,
+        so it is safe to call from many concurrent turns.
+        
         Args:
             conversation_type: "scam" or "legit"
             turn_position: "opening", "middle", "closing"
             role: "caller" or "callee"
             text_content: The actual text being spoken
+            rng: Random generator to draw from (module random if None)
             
         Returns:
             List of appropriate audio tags
         """
+        rng = rng or random
         tags = []
         
         # Get emotional context tags
-        if conversation_type in self.EMOTIONAL_TAGS:
-            emotional_categories = self.EMOTIONAL_TAGS[conversation_type]
-            
-            if turn_position == "opening" and "opener" in emotional_categories:
-                tags.extend(random.sample(emotional_categories["opener"], 1))
-            elif turn_position == "middle":
-                # Choose based on content analysis
-                if any(word in text_content.lower() for word in ["urgent", "important", "immediately", "now"]):
-                    if "creating_urgency" in emotional_categories:
-                        tags.extend(random.sample(emotional_categories["creating_urgency"], 1))
-                elif any(word in text_content.lower() for word in ["understand", "help", "support"]):
-                    if "building_trust" in emotional_categories:
-                        tags.extend(random.sample(emotional_categories["building_trust"], 1))
-                elif any(word in text_content.lower() for word in ["tell", "give", "provide", "confirm"]):
-                    if "extracting_info" in emotional_categories:
-                        tags.extend(random.sample(emotional_categories["extracting_info"], 1))
-                else:
-                    # Default middle conversation tags
-                    available_tags = []
-                    for category in ["building_trust", "informing", "requesting"]:
-                        if category in emotional_categories:
-                            available_tags.extend(emotional_categories[category])
-                    if available_tags:
-                        tags.extend(random.sample(available_tags, 1))
-            elif turn_position == "closing" and "closing" in emotional_categories:
-                tags.extend(random.sample(emotional_categories["closing"], 1))
+        table = self._tag_tables.get((conversation_type, role))
+        if table is None and conversation_type in self.EMOTIONAL_TAGS:
+            table = self._tag_tables[(conversation_type, "caller")]
+        
+        if table is not None:
+            if turn_position == "middle":
+                candidates = table[self._classify_middle_turn(text_content.lower())]
+            else:
+                candidates = table.get(turn_position, ())
+            if candidates:
+                tags.append(rng.choice(candidates))
         
         # Add voice modulation based on content
         if "?" in text_content:
             # Questions get inquisitive tags
-            tags.extend(random.sample(["curious", "questioning"], 1))
+            tags.append(rng.choice(self.QUESTION_TAGS))
         
         if "!" in text_content:
             # Exclamations get excited or urgent tags
-            tags.extend(random.sample(["excited", "emphatic"], 1))
+            tags.append(rng.choice(self.EXCLAMATION_TAGS))
         
         # Add conversational reactions occasionally (10% chance)
-        if random.random() < 0.1:
-            reaction_tags = random.sample(self.CONVERSATIONAL_TAGS["reactions"], 1)
-            tags.extend(reaction_tags)
+        if rng.random() < self.REACTION_PROBABILITY:
+            tags.append(rng.choice(self.CONVERSATIONAL_TAGS["reactions"]))
+        
+        return tags[:self.MAX_TAGS]  # Limit to 2 tags maximum for best results
+    
+    def enhance_text(self,
+                     text: str,
+                     conversation_type: str,
+                     turn_position: str,
+                     role: str,
+                     rng: Optional[random.Random] = None) -> Tuple[str, List[str]]:
+        """
+        Choose tags for a turn and apply them to its text.
         
-        return tags[:2]  # Limit to 2 tags maximum for best results
+        Args:
+            text: Original text
+            conversation_type: "scam" or "legit"
+            turn_position: "opening", "middle", "closing"
+            role: "caller" or "callee"
+            rng: Random generator to draw from (module random if None)
+            
+        Returns:
+            Tuple of (enhanced text, tags used)
+        """
+        tags = self.get_contextual_tags(conversation_type, turn_position, role, text, rng)
+        return self.format_text_with_tags(text, tags), tags
     
     def format_text_with_tags(self, text: str, tags: List[str]) -> str:
         """
@@ -0,0 +1,139 @@
+"""
+ElevenLabs TTS backend.
+"""
+
+import base64
+import logging
+from typing import Dict, Optional
+
+from elevenlabs.client import AsyncElevenLabs
+from config.config_loader import Config
+from tts.tts_backend import BaseTTSBackend, SynthesisResult
+
+
+logger = logging.getLogger(__name__)
+
+
+class ElevenLabsBackend(BaseTTSBackend):
+    """
+    Speech synthesis through the ElevenLabs text-to-speech API.
+    """
+
+    def __init__(self, config: Config):
+        """
+        Initialize the ElevenLabs client.
+
+        Args:
+            config: Configuration object with ElevenLabs key and voice settings
+        """
+        super().__init__(config)
+        self.client = AsyncElevenLabs(api_key=config.elevenlabs_api_key)
+        self.model_id = config.voice_model_id
+        self.is_v3_model = "v3" in self.model_id.lower()
+
+    async def synthesize(self, text: str, voice_id: str, output_format: str,
+                         previous_text: Optional[str] = None,
+                         next_text: Optional[str] = None) -> bytes:
+        """
+        Synthesize speech with text_to_speech.convert.
+
+        Args:
+            text: Text to speak (may contain audio tags)
+            voice_id: ElevenLabs voice ID
+            output_format: ElevenLabs output format
+            previous_text: Preceding dialogue text for request stitching
+            next_text: Following dialogue text for request stitching
+
+        Returns:
+            Encoded audio bytes
+        """
+        audio_generator = self.client.text_to_speech.convert(
+            text=text,
+            voice_id=voice_id,
+            model_id=self.model_id,
+            voice_settings=self._build_voice_settings(),
+            output_format=output_format,
+            **self._stitching_context(previous_text, next_text)
+        )
+
+        # Collect audio bytes
+        audio_bytes = b""
+        async for chunk in audio_generator:
+            audio_bytes += chunk
+        return audio_bytes
+
+    async def synthesize_with_timestamps(self, text: str, voice_id: str, output_format: str,
+                                         previous_text: Optional[str] = None,
+                                         next_text: Optional[str] = None) -> SynthesisResult:
+        """
+        Synthesize speech with text_to_speech.convert_with_timestamps.
+
+        Args:
+            text: Text to speak (may contain audio tags)
+            voice_id: ElevenLabs voice ID
+            output_format: ElevenLabs PCM output format
+            previous_text: Preceding dialogue text for request stitching
+            next_text: Following dialogue text for request stitching
+
+        Returns:
+            Raw PCM audio and character alignment
+        """
+        response = await self.client.text_to_speech.convert_with_timestamps(
+            voice_id=voice_id,
+            text=text,
+            model_id=self.model_id,
+            voice_settings=self._build_voice_settings(),
+            output_format=output_format,
+            **self._stitching_context(previous_text, next_text)
+        )
+
+        audio_base64 = getattr(response, "audio_base_64", None) or getattr(response, "audio_base64", "")
+        alignment = response.alignment
+        if alignment is not None and not isinstance(alignment, dict):
+            alignment = {
+                "characters": list(alignment.characters),
+                "character_start_times_seconds": list(alignment.character_start_times_seconds),
+                "character_end_times_seconds": list(alignment.character_end_times_seconds)
+            }
+        return SynthesisResult(audio=base64.b64decode(audio_base64), alignment=alignment)
+
+    def _build_voice_settings(self) -> Dict:
+        """
+        Build voice settings from configuration.
+
+        Returns:
+            Voice settings dictionary
+        """
+        settings = {
+            "stability": self.config.voice_stability,
+            "similarity_boost": self.config.voice_similarity_boost,
+            "speaker_boost": self.config.voice_speaker_boost
+        }
+
+        # Add style setting for v3 models
+        if self.is_v3_model:
+            settings["style"] = self.config.voice_style
+
+        return settings
+
+    def _stitching_context(self, previous_text: Optional[str], next_text: Optional[str]) -> Dict:
+        """
+        Build the request stitching arguments for a TTS call.
+
+        v3 models do not support request stitching, so no context is sent for them.
+
+        Args:
+            previous_text: Text spoken before this request
+            next_text: Text spoken after this request
+
+        Returns:
+            Keyword arguments for the ElevenLabs convert call
+        """
+        if self.is_v3_model:
+            return {}
+        context = {}
+        if previous_text:
+            context["previous_text"] = previous_text
+        if next_text:
+            context["next_text"] = next_text
+        return context
@@ -0,0 +1,229 @@
+"""
+Offline TTS backend that synthesizes speech-like tones on the CPU.
+
+Intended for development and load testing of the audio stages without an
+ElevenLabs key. Output is deterministic per (voice, text), lasts about as long
+as the text would take to say, and follows the character timing reported in
+its alignment, so every batch mode works offline.
+"""
+
+import io
+import re
+import shutil
+import asyncio
+import hashlib
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+
+from config.config_loader import Config
+from tts.audio_io import sample_rate_from_format, to_int16
+from tts.request_stitching import PCM_SAMPLE_RATES
+from tts.tts_backend import BaseTTSBackend, SynthesisResult
+
+
+logger = logging.getLogger(__name__)
+
+
+# Speaking rate at voice_speed 1.0, in spoken characters per second
+CHARS_PER_SECOND = 14.0
+MIN_DURATION_SECONDS = 0.3
+
+# Target loudness of voiced segments and fade length at the edges
+SPEECH_RMS_DBFS = -20.0
+FADE_SECONDS = 0.01
+
+# Audio tags like [urgent] are not spoken
+AUDIO_TAG_PATTERN = re.compile(r'\[[^\]]*\]')
+
+
+class LocalToneBackend(BaseTTSBackend):
+    """
+    Deterministic tone/noise speech stand-in with a per-voice pitch.
+    """
+
+    requires_voice_validation = False
+
+    def __init__(self, config: Config):
+        """
+        Initialize the local backend.
+
+        Args:
+            config: Configuration object
+        """
+        super().__init__(config)
+        self.speed = getattr(config, 'voice_speed', 1.0) or 1.0
+        self.can_encode_mp3 = shutil.which("ffmpeg") is not None
+
+    def resolve_output_format(self, output_format: str) -> str:
+        """
+        Keep PCM formats, and MP3 when ffmpeg is available to encode it.
+
+        Anything else is produced as PCM at the closest supported rate.
+
+        Args:
+            output_format: Configured output format
+
+        Returns:
+            Output format to request and name files after
+        """
+        format_lower = output_format.lower()
+        if format_lower.startswith("pcm_") or (format_lower.startswith("mp3_") and self.can_encode_mp3):
+            return output_format
+
+        sample_rate = sample_rate_from_format(output_format)
+        if sample_rate not in PCM_SAMPLE_RATES:
+            sample_rate = min(PCM_SAMPLE_RATES, key=lambda rate: abs(rate - sample_rate))
+        resolved = f"pcm_{sample_rate}"
+        self.clogger.warning(f"Local TTS backend cannot produce {output_format}, using {resolved}")
+        return resolved
+
+    async def synthesize(self, text: str, voice_id: str, output_format: str,
+                         previous_text: Optional[str] = None,
+                         next_text: Optional[str] = None) -> bytes:
+        """
+        Synthesize speech-like audio for a text.
+
+        Args:
+            text: Text to speak (audio tags are skipped)
+            voice_id: Voice ID, which sets the pitch
+            output_format: Output format from resolve_output_format
+            previous_text: Unused, accepted for interface compatibility
+            next_text: Unused, accepted for interface compatibility
+
+        Returns:
+            Raw PCM bytes, or MP3 bytes for MP3 formats
+        """
+        sample_rate = sample_rate_from_format(output_format)
+        samples, _ = await asyncio.to_thread(self._render, text, voice_id, sample_rate)
+
+        if output_format.lower().startswith("mp3_"):
+            return await asyncio.to_thread(self._encode_mp3, samples, sample_rate, output_format)
+        return samples.astype('<i2').tobytes()
+
+    async def synthesize_with_timestamps(self, text: str, voice_id: str, output_format: str,
+                                         previous_text: Optional[str] = None,
+                                         next_text: Optional[str] = None) -> SynthesisResult:
+        """
+        Synthesize speech-like audio with the character timing it was rendered from.
+
+        Args:
+            text: Text to speak (audio tags are skipped)
+            voice_id: Voice ID, which sets the pitch
+            output_format: A PCM output format
+            previous_text: Unused, accepted for interface compatibility
+            next_text: Unused, accepted for interface compatibility
+
+        Returns:
+            Raw PCM audio and character alignment
+        """
+        sample_rate = sample_rate_from_format(output_format)
+        samples, (starts, ends) = await asyncio.to_thread(self._render, text, voice_id, sample_rate)
+        alignment = {
+            "characters": list(text),
+            "character_start_times_seconds": starts.tolist(),
+            "character_end_times_seconds": ends.tolist()
+        }
+        return SynthesisResult(audio=samples.astype('<i2').tobytes(), alignment=alignment)
+
+    def _character_timing(self, text: str) -> Tuple[np.ndarray, np.ndarray, float]:
+        """
+        Lay the text out on a timeline at the configured speaking rate.
+
+        Characters inside audio tags take no time.
+
+        Args:
+            text: Text to time
+
+        Returns:
+            Tuple of (start times, end times, total duration) in seconds
+        """
+        weights = np.ones(len(text))
+        for match in AUDIO_TAG_PATTERN.finditer(text):
+            weights[match.start():match.end()] = 0.0
+
+        spoken = weights.sum()
+        duration = max(spoken / (CHARS_PER_SECOND * self.speed), MIN_DURATION_SECONDS)
+        seconds_per_char = duration / spoken if spoken else 0.0
+
+        ends = np.cumsum(weights) * seconds_per_char
+        starts = ends - weights * seconds_per_char
+        return starts, ends, duration
+
+    def _render(self, text: str, voice_id: str, sample_rate: int) -> Tuple[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Render a harmonic tone with syllable and word envelopes plus breath noise.
+
+        Args:
+            text: Text to speak
+            voice_id: Voice ID, which sets the pitch
+            sample_rate: Output sample rate in Hz
+
+        Returns:
+            Tuple of (int16 samples, (character start times, character end times))
+        """
+        starts, ends, duration = self._character_timing(text)
+        num_samples = int(round(duration * sample_rate))
+        t = np.arange(num_samples) / sample_rate
+
+        voice_seed = int.from_bytes(hashlib.sha256(voice_id.encode('utf-8')).digest()[:8], 'little')
+        text_seed = int.from_bytes(hashlib.sha256(f"{voice_id}\x00{text}".encode('utf-8')).digest()[:8], 'little')
+        rng = np.random.default_rng(text_seed)
+
+        # Per-voice base pitch with slow intonation drift and declination
+        base_pitch = 85.0 + (voice_seed % 160)
+        pitch = base_pitch * (1.0 + 0.08 * np.sin(2 * np.pi * 0.7 * t + rng.uniform(0, 2 * np.pi))
+                              - 0.1 * t / duration)
+        phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+        voiced = sum((0.6 / k) * np.sin(k * phase) for k in range(1, 5))
+
+        # Syllable-rate amplitude modulation
+        syllables = (0.5 * (1.0 - np.cos(2 * np.pi * 4.5 * t + rng.uniform(0, 2 * np.pi)))) ** 1.5
+
+        # Silence on spaces, punctuation and tags, smoothed to avoid clicks
+        letters = np.array([char.isalnum() for char in text] or [False], dtype=np.float32)
+        if len(text):
+            char_index = np.minimum(np.searchsorted(ends, t, side='right'), len(text) - 1)
+            letters[ends - starts == 0] = 0.0
+            words = letters[char_index]
+        else:
+            words = np.zeros(num_samples, dtype=np.float32)
+        ramp = max(int(0.005 * sample_rate), 1)
+        words = np.convolve(words, np.ones(ramp) / ramp, mode='same')
+
+        signal = (0.8 * voiced + 0.15 * rng.standard_normal(num_samples)) * syllables * words
+
+        # Scale voiced segments to a speech-like level
+        active = signal[words > 0.5]
+        rms = np.sqrt(np.mean(active ** 2)) if active.size else 0.0
+        if rms > 0:
+            signal *= (10 ** (SPEECH_RMS_DBFS / 20)) / rms
+
+        fade = min(int(FADE_SECONDS * sample_rate), num_samples // 2)
+        if fade:
+            envelope = np.linspace(0.0, 1.0, fade)
+            signal[:fade] *= envelope
+            signal[-fade:] *= envelope[::-1]
+
+        return to_int16(np.clip(signal, -1.0, 1.0).astype(np.float32)), (starts, ends)
+
+    def _encode_mp3(self, samples: np.ndarray, sample_rate: int, output_format: str) -> bytes:
+        """
+        Encode samples as MP3 through pydub/ffmpeg.
+
+        Args:
+            samples: int16 samples
+            sample_rate: Sample rate in Hz
+            output_format: MP3 format string, e.g. 'mp3_44100_128'
+
+        Returns:
+            MP3 bytes
+        """
+        from pydub import AudioSegment
+
+        bitrate = output_format.split("_")[2] if output_format.count("_") >= 2 else "128"
+        segment = AudioSegment(samples.tobytes(), frame_rate=sample_rate, sample_width=2, channels=1)
+        buffer = io.BytesIO()
+        segment.export(buffer, format="mp3", bitrate=f"{bitrate}k")
+        return buffer.getvalue()
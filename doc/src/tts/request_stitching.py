@@ -0,0 +1,177 @@
+"""
+Request planning and splitting for batched TTS generation.
+
+Two batch modes are supported on top of the default one-request-per-turn flow:
+
+- ``stitch``: still one request per turn, but each request carries the
+  neighbouring turns as ``previous_text``/``next_text`` so prosody carries
+  across turn boundaries.
+- ``merge``: consecutive turns by the same speaker are sent as one request.
+  The character alignment returned with the audio is used to find the cut
+  points, so each turn still ends up in its own ``turn_*`` file.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from tts.audio_io import sample_rate_from_format
+
+
+BATCH_MODES = ("off", "stitch", "merge")
+
+# Joins merged turn texts; cut points fall inside this gap
+TURN_SEPARATOR = " "
+
+# Output sample rates ElevenLabs offers for raw PCM
+PCM_SAMPLE_RATES = (16000, 22050, 24000, 44100)
+
+
+@dataclass
+class SynthesisRequest:
+    """A single TTS request covering one or more consecutive turns by one speaker."""
+    role: str
+    turn_indexes: List[int]
+    previous_text: Optional[str] = None
+    next_text: Optional[str] = None
+
+
+def plan_requests(dialogue: Sequence[Dict], mode: str) -> List[SynthesisRequest]:
+    """
+    Group dialogue turns into TTS requests for a batch mode.
+
+    Args:
+        dialogue: Dialogue turns with "role" and "text"
+        mode: One of BATCH_MODES
+
+    Returns:
+        Requests in dialogue order
+    """
+    if mode not in BATCH_MODES:
+        raise ValueError(f"Unsupported batch mode '{mode}'. Use one of: {', '.join(BATCH_MODES)}")
+
+    if mode == "merge":
+        groups: List[List[int]] = []
+        for index, turn in enumerate(dialogue):
+            if groups and dialogue[groups[-1][-1]]["role"] == turn["role"]:
+                groups[-1].append(index)
+            else:
+                groups.append([index])
+    else:
+        groups = [[index] for index in range(len(dialogue))]
+
+    requests = []
+    for group in groups:
+        request = SynthesisRequest(role=dialogue[group[0]]["role"], turn_indexes=group)
+        if mode != "off":
+            if group[0] > 0:
+                request.previous_text = dialogue[group[0] - 1]["text"]
+            if group[-1] < len(dialogue) - 1:
+                request.next_text = dialogue[group[-1] + 1]["text"]
+        requests.append(request)
+    return requests
+
+
+def join_turn_texts(texts: Sequence[str]) -> Tuple[str, List[Tuple[int, int]]]:
+    """
+    Join turn texts into one request text, remembering where each turn sits.
+
+    Args:
+        texts: Turn texts in order
+
+    Returns:
+        Tuple of (merged text, [(start, end) character span per turn])
+    """
+    spans = []
+    position = 0
+    for text in texts:
+        spans.append((position, position + len(text)))
+        position += len(text) + len(TURN_SEPARATOR)
+    return TURN_SEPARATOR.join(texts), spans
+
+
+def _alignment_field(alignment, name: str) -> List:
+    """Read a field from an SDK alignment object or a plain dict."""
+    if isinstance(alignment, dict):
+        return list(alignment.get(name) or [])
+    return list(getattr(alignment, name, None) or [])
+
+
+def alignment_cut_points(alignment, spans: Sequence[Tuple[int, int]], text_length: int) -> List[float]:
+    """
+    Find where to cut merged audio between turns.
+
+    Each cut sits halfway between the last character of one turn and the first
+    character of the next. If the alignment does not cover the text one to one
+    (the service may normalize or drop characters), indexes are scaled to it.
+
+    Args:
+        alignment: Character alignment with characters and start/end times in seconds
+        spans: Character span of each turn in the merged text
+        text_length: Length of the merged text
+
+    Returns:
+        Cut times in seconds, one per boundary between turns
+    """
+    starts = _alignment_field(alignment, "character_start_times_seconds")
+    ends = _alignment_field(alignment, "character_end_times_seconds")
+    count = min(len(starts), len(ends))
+    if count == 0:
+        raise ValueError("TTS response has no character alignment to split on")
+
+    scale = count / text_length if text_length and count != text_length else 1.0
+
+    def aligned(index: int) -> int:
+        return max(0, min(count - 1, int(round(index * scale))))
+
+    cuts = []
+    for (_, previous_end), (next_start, _) in zip(spans, spans[1:]):
+        end_time = ends[aligned(previous_end - 1)]
+        start_time = starts[aligned(next_start)]
+        cuts.append((end_time + max(start_time, end_time)) / 2)
+    return cuts
+
+
+def split_samples(samples: np.ndarray, sample_rate: int,
+                  cut_points: Sequence[float]) -> List[Tuple[np.ndarray, int, int]]:
+    """
+    Split audio at the given times.
+
+    Args:
+        samples: Audio samples
+        sample_rate: Sample rate in Hz
+        cut_points: Cut times in seconds, ascending
+
+    Returns:
+        List of (samples, start_ms, end_ms) per segment
+    """
+    bounds = [0]
+    for cut in cut_points:
+        bounds.append(min(len(samples), max(bounds[-1], int(round(cut * sample_rate)))))
+    bounds.append(len(samples))
+
+    return [
+        (samples[start:end], start * 1000 // sample_rate, end * 1000 // sample_rate)
+        for start, end in zip(bounds, bounds[1:])
+    ]
+
+
+def pcm_format_for(output_format: str) -> str:
+    """
+    Pick the raw PCM output format used for merged requests.
+
+    Keeps the configured sample rate when ElevenLabs offers it as PCM.
+
+    Args:
+        output_format: Configured ElevenLabs output format
+
+    Returns:
+        PCM format string such as 'pcm_24000'
+    """
+    if output_format.lower().startswith("pcm_"):
+        return output_format
+    sample_rate = sample_rate_from_format(output_format)
+    if sample_rate in PCM_SAMPLE_RATES:
+        return f"pcm_{sample_rate}"
+    return "pcm_24000"
@@ -0,0 +1,255 @@
+"""
+Pre-decoded sound effect bank for background noise and call effects.
+"""
+
+import os
+import json
+import random
+import logging
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from tts.audio_io import decode_audio, dbfs, to_float32
+
+
+logger = logging.getLogger(__name__)
+
+
+def _write_atomic(path: Path, write: Callable):
+    """
+    Write a file through a temporary file in the same directory, then rename it into place.
+
+    Other processes sharing the cache see either the old file or the complete
+    new one, never a partly written file.
+
+    Args:
+        path: Destination file
+        write: Function writing the content to a binary file object
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+@dataclass
+class SoundEffect:
+    """A decoded sound effect backed by a memory-mapped PCM array."""
+    name: str
+    samples: np.ndarray  # int16, memory-mapped
+    sample_rate: int
+    dbfs: float
+
+    @property
+    def duration_ms(self) -> int:
+        """Duration of the effect in milliseconds."""
+        return int(len(self.samples) * 1000 / self.sample_rate)
+
+
+class SoundEffectBank:
+    """
+    Decodes sound effects once into memory-mapped PCM caches.
+
+    Each MP3 is decoded to mono int16 at the target rate and stored as a .npy file
+    under ``<sound_effects_dir>/.cache/<rate>/``. A small index keeps the source
+    size/mtime and precomputed dBFS so later runs only memory-map the arrays.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, sound_effects_dir: Path, sample_rate: int):
+        """
+        Initialize the sound effect bank.
+
+        Args:
+            sound_effects_dir: Root directory with backgrounds/ and call_effects/
+            sample_rate: Sample rate to decode effects at
+        """
+        self.sound_effects_dir = Path(sound_effects_dir)
+        self.sample_rate = sample_rate
+        self.cache_dir = self.sound_effects_dir / ".cache" / str(sample_rate)
+        self.backgrounds: List[SoundEffect] = []
+        self.call_end_effects: List[SoundEffect] = []
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        """
+        Decode (or memory-map cached) effects. Safe to call from multiple threads.
+        """
+        if self._loaded:
+            return
+
+        with self._lock:
+            if self._loaded:
+                return
+
+            index = self._read_index()
+            self.backgrounds = self._load_group("backgrounds", "*.mp3", index)
+            self.call_end_effects = self._load_group("call_effects", "call_end_*.mp3", index)
+            self._write_index(index)
+            self._loaded = True
+
+            logger.debug(
+                f"Sound effect bank ready at {self.sample_rate} Hz: "
+                f"{len(self.backgrounds)} backgrounds, {len(self.call_end_effects)} call end effects"
+            )
+
+    def random_background(self, length: int) -> Optional[Tuple[np.ndarray, float]]:
+        """
+        Sample a background of an exact length by slicing a random effect.
+
+        Args:
+            length: Number of samples required
+
+        Returns:
+            Tuple of (float32 samples, dBFS of the source effect) or None if unavailable
+        """
+        self.load()
+        if not self.backgrounds or length <= 0:
+            return None
+
+        effect = random.choice(self.backgrounds)
+        logger.debug(f"Selected background: {effect.name}")
+
+        source = effect.samples
+        if len(source) < length:
+            repeats = (length // len(source)) + 1
+            sliced = np.tile(source, repeats)[:length]
+        else:
+            start = random.randint(0, len(source) - length)
+            sliced = source[start:start + length]
+
+        return to_float32(np.asarray(sliced)), effect.dbfs
+
+    def call_end(self) -> Optional[SoundEffect]:
+        """
+        Get the call end effect.
+
+        Returns:
+            The first call end effect or None if unavailable
+        """
+        self.load()
+        return self.call_end_effects[0] if self.call_end_effects else None
+
+    def _load_group(self, subdir: str, pattern: str, index: Dict) -> List[SoundEffect]:
+        """
+        Load all effects in a subdirectory, decoding only stale entries.
+
+        Args:
+            subdir: Subdirectory of the sound effects directory
+            pattern: Glob pattern for effect files
+            index: Cache index, updated in place
+
+        Returns:
+            List of loaded effects
+        """
+        effects_dir = self.sound_effects_dir / subdir
+        if not effects_dir.exists():
+            logger.warning(f"Sound effects directory not found: {effects_dir}")
+            return []
+
+        effects = []
+        for source in sorted(effects_dir.glob(pattern)):
+            try:
+                effects.append(self._load_effect(source, subdir, index))
+            except Exception as e:
+                logger.warning(f"Failed to load sound effect {source.name}: {e}")
+
+        if not effects:
+            logger.warning(f"No sound effect files matching {pattern} in {effects_dir}")
+        return effects
+
+    def _load_effect(self, source: Path, subdir: str, index: Dict) -> SoundEffect:
+        """
+        Memory-map a cached effect, decoding the source if the cache is stale.
+
+        Args:
+            source: Source audio file
+            subdir: Subdirectory the effect belongs to
+            index: Cache index, updated in place
+
+        Returns:
+            Loaded effect
+        """
+        key = f"{subdir}/{source.name}"
+        cache_path = self.cache_dir / subdir / f"{source.stem}.npy"
+        stat = source.stat()
+        entry = index.get(key)
+
+        fresh = (
+            entry is not None
+            and entry.get("size") == stat.st_size
+            and entry.get("mtime") == stat.st_mtime
+            and cache_path.exists()
+        )
+
+        if not fresh:
+            samples = decode_audio(source, self.sample_rate)
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            _write_atomic(cache_path, lambda f: np.save(f, samples))
+            entry = {
+                "size": stat.st_size,
+                "mtime": stat.st_mtime,
+                "dbfs": dbfs(samples)
+            }
+            index[key] = entry
+            logger.debug(f"Decoded sound effect {key} into {cache_path}")
+
+        return SoundEffect(
+            name=source.name,
+            samples=np.load(cache_path, mmap_mode='r'),
+            sample_rate=self.sample_rate,
+            dbfs=entry["dbfs"]
+        )
+
+    def _read_index(self) -> Dict:
+        """Read the cache index, returning an empty one if missing or corrupt."""
+        index_path = self.cache_dir / self.INDEX_FILE
+        if not index_path.exists():
+            return {}
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _write_index(self, index: Dict):
+        """Persist the cache index."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            data = json.dumps(index, indent=2).encode('utf-8')
+            _write_atomic(self.cache_dir / self.INDEX_FILE, lambda f: f.write(data))
+        except OSError as e:
+            logger.warning(f"Could not write sound effect cache index: {e}")
+
+
+_banks: Dict[Tuple[str, int], SoundEffectBank] = {}
+_banks_lock = threading.Lock()
+
+
+def get_sound_effect_bank(sound_effects_dir: Path, sample_rate: int) -> SoundEffectBank:
+    """
+    Get the process-wide sound effect bank for a directory and sample rate.
+
+    Args:
+        sound_effects_dir: Root sound effects directory
+        sample_rate: Sample rate to decode effects at
+
+    Returns:
+        Shared SoundEffectBank instance
+    """
+    key = (str(Path(sound_effects_dir).resolve()), sample_rate)
+    with _banks_lock:
+        if key not in _banks:
+            _banks[key] = SoundEffectBank(sound_effects_dir, sample_rate)
+        return _banks[key]
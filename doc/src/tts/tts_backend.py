@@ -0,0 +1,125 @@
+"""
+Base TTS backend interface and factory for speech synthesis engines.
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from config.config_loader import Config
+from utils.logging_utils import ConditionalLogger
+
+
+logger = logging.getLogger(__name__)
+
+
+TTS_BACKENDS = ("elevenlabs", "local")
+
+
+@dataclass
+class SynthesisResult:
+    """Raw PCM audio with per-character timing, as returned by timestamped synthesis."""
+    audio: bytes
+    alignment: Optional[Dict[str, List]] = None
+
+
+class BaseTTSBackend(ABC):
+    """
+    Abstract base class for TTS engines used by VoiceSynthesizer.
+
+    Backends return audio bytes in the requested ElevenLabs-style output format
+    ('mp3_44100_128', 'pcm_22050', ...); PCM formats are raw little-endian 16-bit
+    mono samples.
+    """
+
+    # Whether voice IDs must be checked against the provider before synthesis
+    requires_voice_validation = True
+
+    def __init__(self, config: Config):
+        """
+        Initialize the backend.
+
+        Args:
+            config: Configuration object
+        """
+        self.config = config
+        self.clogger = ConditionalLogger(__name__, config.verbose)
+
+    def resolve_output_format(self, output_format: str) -> str:
+        """
+        Map the configured output format to one this backend can produce.
+
+        Args:
+            output_format: Configured output format
+
+        Returns:
+            Output format to request and name files after
+        """
+        return output_format
+
+    @abstractmethod
+    async def synthesize(self, text: str, voice_id: str, output_format: str,
+                         previous_text: Optional[str] = None,
+                         next_text: Optional[str] = None) -> bytes:
+        """
+        Synthesize speech for a text.
+
+        Args:
+            text: Text to speak (may contain audio tags)
+            voice_id: Voice to speak with
+            output_format: Output format from resolve_output_format
+            previous_text: Preceding dialogue text for request stitching
+            next_text: Following dialogue text for request stitching
+
+        Returns:
+            Encoded audio bytes
+        """
+        pass
+
+    @abstractmethod
+    async def synthesize_with_timestamps(self, text: str, voice_id: str, output_format: str,
+                                         previous_text: Optional[str] = None,
+                                         next_text: Optional[str] = None) -> SynthesisResult:
+        """
+        Synthesize speech with character alignment.
+
+        Args:
+            text: Text to speak (may contain audio tags)
+            voice_id: Voice to speak with
+            output_format: A PCM output format
+            previous_text: Preceding dialogue text for request stitching
+            next_text: Following dialogue text for request stitching
+
+        Returns:
+            Raw PCM audio and alignment with character_start_times_seconds and
+            character_end_times_seconds
+        """
+        pass
+
+
+class TTSBackendFactory:
+    """
+    Factory for creating TTS backend instances.
+    """
+
+    @staticmethod
+    def create(backend: str, config: Config) -> BaseTTSBackend:
+        """
+        Create a TTS backend instance based on the backend type.
+
+        Args:
+            backend: Backend type ('elevenlabs' or 'local')
+            config: Configuration object
+
+        Returns:
+            TTS backend instance
+        """
+        if backend == "elevenlabs":
+            from tts.elevenlabs_backend import ElevenLabsBackend
+            return ElevenLabsBackend(config)
+        elif backend == "local":
+            from tts.local_backend import LocalToneBackend
+            return LocalToneBackend(config)
+        else:
+            raise ValueError(f"Unknown TTS backend: {backend}. Use one of: {', '.join(TTS_BACKENDS)}")
@@ -0,0 +1,278 @@
+"""
+Worker processes for the queued TTS stage.
+
+A coordinator plans TTS requests with VoiceSynthesizer.enqueue_audio; workers
+on this or other hosts lease jobs from the shared TTSWorkQueue, synthesize them
+and acknowledge them. The last acked request of a conversation queues its
+finalize job (combine, effects, metadata), which any worker can pick up.
+"""
+
+import os
+import socket
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config.config_loader import Config
+from tts.voice_synthesizer import VoiceSynthesizer
+from tts.artifact_manifest import get_artifact_manifest
+from tts.request_stitching import SynthesisRequest
+from tts.work_queue import TTSWorkQueue, Job, REQUEST_JOB
+from utils.logging_utils import ConditionalLogger
+
+
+logger = logging.getLogger(__name__)
+
+
+# Longest wait between polls while jobs are leased by other workers or backing off
+POLL_INTERVAL_SECONDS = 2.0
+
+
+class TTSWorker:
+    """
+    Leases jobs from a TTS work queue and runs them with a VoiceSynthesizer.
+    """
+
+    def __init__(self, config: Config, queue_path: Path, worker_id: Optional[str] = None):
+        """
+        Initialize a worker.
+
+        Args:
+            config: Configuration object (TTS backend, voices, audio settings)
+            queue_path: Queue database shared with the coordinator
+            worker_id: Unique worker name (defaults to host and process ID)
+        """
+        self.config = config
+        self.clogger = ConditionalLogger(__name__, config.verbose)
+        self.queue = TTSWorkQueue(
+            queue_path,
+            visibility_timeout=getattr(config, 'voice_queue_visibility_timeout', 300.0),
+            max_attempts=getattr(config, 'voice_queue_max_attempts', 3)
+        )
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.concurrency = max(1, getattr(config, 'voice_worker_concurrency', 5))
+        self.synthesizer = VoiceSynthesizer(config)
+        self._conversations: Dict[str, Dict] = {}
+        self.stats = {"done": 0, "retried": 0, "failed": 0, "lost": 0}
+
+    async def run(self) -> Dict[str, int]:
+        """
+        Process jobs until the queue has no pending or leased jobs left.
+
+        Returns:
+            Counts of jobs this worker finished, retried, failed or lost to an expired lease
+        """
+        if not await self.synthesizer.validate_voices():
+            raise ValueError("Invalid voice IDs detected. Please check your configuration.")
+
+        self.clogger.info(f"Worker {self.worker_id} started on {self.queue.path}")
+        in_flight = set()
+        try:
+            while True:
+                free_slots = self.concurrency - len(in_flight)
+                if free_slots > 0:
+                    jobs = await asyncio.to_thread(self.queue.lease, self.worker_id, free_slots)
+                    in_flight.update(asyncio.create_task(self._run_job(job)) for job in jobs)
+
+                if in_flight:
+                    _, in_flight = await asyncio.wait(
+                        in_flight, timeout=POLL_INTERVAL_SECONDS, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    continue
+
+                delay = await asyncio.to_thread(self.queue.next_available_in)
+                if delay is None:
+                    break
+                await asyncio.sleep(min(max(delay, 0.05), POLL_INTERVAL_SECONDS))
+        finally:
+            self.queue.close()
+            self.synthesizer._save_voice_scheduler()
+
+        self.clogger.info(f"Worker {self.worker_id} finished: {self.stats}")
+        return self.stats
+
+    async def _run_job(self, job: Job):
+        """
+        Run one leased job, keep its lease alive, and ack or nack it.
+
+        Args:
+            job: Leased job
+        """
+        heartbeat = asyncio.create_task(self._keep_leased(job))
+        try:
+            if job.kind == REQUEST_JOB:
+                result = await self._run_request(job)
+            else:
+                result = await self._run_finalize(job)
+        except Exception as e:
+            status = await asyncio.to_thread(self.queue.nack, job, str(e))
+            self.stats["retried" if status == "pending" else status] += 1
+            self.clogger.warning(f"Job {job.id} ({job.kind}, attempt {job.attempts}) {status}: {str(e)[:100]}")
+            if status == "failed":
+                await asyncio.to_thread(self._record_failure, job)
+            return
+        finally:
+            heartbeat.cancel()
+
+        if await asyncio.to_thread(self.queue.ack, job, result):
+            self.stats["done"] += 1
+        else:
+            self.stats["lost"] += 1
+            self.clogger.warning(f"Job {job.id} finished after its lease expired; result discarded")
+
+    async def _keep_leased(self, job: Job):
+        """Extend a job's lease periodically while it runs."""
+        interval = max(self.queue.visibility_timeout / 3, 1.0)
+        while True:
+            await asyncio.sleep(interval)
+            if not await asyncio.to_thread(self.queue.heartbeat, job):
+                return
+
+    def _conversation(self, conv_key: str) -> Dict:
+        """Conversation payload for a job, cached per worker."""
+        if conv_key not in self._conversations:
+            self._conversations[conv_key] = self.queue.conversation(conv_key)
+        return self._conversations[conv_key]
+
+    def _conversation_dir(self, conversation: Dict) -> Path:
+        """Output directory of a queued conversation."""
+        conv_dir = Path(conversation["output_dir"]) / f"conversation_{conversation['conversation_id']:03d}"
+        conv_dir.mkdir(parents=True, exist_ok=True)
+        return conv_dir
+
+    async def _run_request(self, job: Job) -> List[Dict]:
+        """
+        Synthesize the turns of one planned TTS request.
+
+        Args:
+            job: Leased request job
+
+        Returns:
+            Audio file info per turn of the request
+
+        Raises:
+            ValueError: If the voice for the request is not validated
+        """
+        conversation = await asyncio.to_thread(self._conversation, job.conv_key)
+        request = SynthesisRequest(**job.payload)
+        dialogue = conversation["dialogue"]
+        conv_dir = self._conversation_dir(conversation)
+        caller_voice, callee_voice = conversation["caller_voice"], conversation["callee_voice"]
+
+        if conversation["batch_mode"] == "merge":
+            turn_infos = await self.synthesizer._generate_request_audio_async(
+                dialogue, request, caller_voice, callee_voice, conv_dir, conversation["conversation_type"]
+            )
+        else:
+            index = request.turn_indexes[0]
+            turn_info = await self.synthesizer._generate_turn_audio_async(
+                dialogue[index], caller_voice, callee_voice, conv_dir,
+                self.synthesizer._get_turn_position(index, len(dialogue)),
+                conversation["conversation_type"],
+                previous_text=request.previous_text, next_text=request.next_text
+            )
+            turn_infos = [turn_info] if turn_info else None
+
+        if not turn_infos:
+            raise ValueError(f"Voice for {request.role} in conversation {conversation['conversation_id']} is not validated")
+        return turn_infos
+
+    async def _run_finalize(self, job: Job) -> Dict:
+        """
+        Combine and process a conversation once all its requests are done.
+
+        Args:
+            job: Leased finalize job
+
+        Returns:
+            Name of the final audio file
+
+        Raises:
+            RuntimeError: If combining or processing failed
+        """
+        conversation = await asyncio.to_thread(self._conversation, job.conv_key)
+        results = await asyncio.to_thread(self.queue.request_results, job.conv_key)
+        audio_files = [info for _, _, turn_infos in results for info in turn_infos]
+        conv_dir = self._conversation_dir(conversation)
+
+        produced = await self.synthesizer._finalize_conversation_async(
+            conv_dir, conversation["conversation_id"],
+            conversation["caller_voice"], conversation["callee_voice"],
+            audio_files, len(conversation["dialogue"]), len(results)
+        )
+        if not produced:
+            raise RuntimeError(f"Combining or processing conversation {conversation['conversation_id']} failed")
+        self.clogger.info(f"Finalized conversation {conversation['conversation_id']} ({job.conv_key})")
+        return {"conversation_id": conversation["conversation_id"]}
+
+    def _record_failure(self, job: Job):
+        """
+        Record a conversation as incomplete after one of its jobs failed for good.
+
+        Args:
+            job: Job that used up its attempts
+        """
+        conversation = self._conversation(job.conv_key)
+        dialogue = conversation["dialogue"]
+        manifest = get_artifact_manifest(Path(conversation["output_dir"]))
+        if job.kind == REQUEST_JOB:
+            missing = [dialogue[index]["sent_id"] for index in job.payload["turn_indexes"]]
+        else:
+            # Keep turn files reported missing by the finalize step
+            row = manifest.conversations().get(str(conversation["conversation_id"]), {})
+            missing = row.get("missing_turns", [])
+        manifest.record_conversation(
+            conversation["conversation_id"], "incomplete", len(dialogue), missing
+        )
+
+
+def run_worker_process(config: Config, queue_path: str, worker_id: Optional[str] = None) -> Dict[str, int]:
+    """
+    Run a TTS worker to completion in its own event loop.
+
+    Module-level so it can be the target of a worker process.
+
+    Args:
+        config: Configuration object
+        queue_path: Queue database path
+        worker_id: Unique worker name
+
+    Returns:
+        Job counts from TTSWorker.run
+    """
+    return asyncio.run(TTSWorker(config, Path(queue_path), worker_id).run())
+
+
+def run_local_workers(config: Config, queue_path: Path, count: int) -> Dict[str, int]:
+    """
+    Drain a work queue with worker processes on this host.
+
+    Workers are spawned rather than forked, since the caller usually has an
+    event loop running.
+
+    Args:
+        config: Configuration object
+        queue_path: Queue database path
+        count: Number of worker processes
+
+    Returns:
+        Job counts summed over all workers
+    """
+    totals: Dict[str, int] = {}
+    if count < 1:
+        return totals
+
+    host = socket.gethostname()
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=count, mp_context=context) as executor:
+        futures = [
+            executor.submit(run_worker_process, config, str(queue_path), f"{host}-{os.getpid()}-w{index}")
+            for index in range(count)
+        ]
+        for future in futures:
+            for status, jobs in future.result().items():
+                totals[status] = totals.get(status, 0) + jobs
+    return totals
@@ -0,0 +1,241 @@
+"""
+Persistent on-disk catalog of ElevenLabs voices with TTL-based refresh.
+"""
+
+import json
+import time
+import hashlib
+import logging
+import os
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from tts.models import VoiceInfo
+
+
+logger = logging.getLogger(__name__)
+
+
+# Default location for cached voice catalogs (one file per API key)
+DEFAULT_CATALOG_DIR = Path("data/cache")
+DEFAULT_TTL_HOURS = 24.0
+
+# Voice attributes that get a secondary index
+INDEXED_FIELDS = ("language", "accent", "gender", "age", "category")
+
+
+def normalize_value(field_name: str, value: Optional[str]) -> Optional[str]:
+    """
+    Normalize an attribute value for index keys and lookups.
+
+    Languages are reduced to their primary subtag so 'en-US', 'en_us' and 'en'
+    share an index entry.
+
+    Args:
+        field_name: Attribute name
+        value: Raw value
+
+    Returns:
+        Normalized value or None
+    """
+    if value is None:
+        return None
+    value = str(value).strip().lower()
+    if not value:
+        return None
+    if field_name == "language":
+        value = value.replace("_", "-").split("-")[0]
+    return value
+
+
+def voice_attribute(voice: VoiceInfo, field_name: str) -> Optional[str]:
+    """
+    Read an indexable attribute from a voice, falling back to its labels.
+
+    Args:
+        voice: Voice to read from
+        field_name: One of INDEXED_FIELDS
+
+    Returns:
+        Normalized attribute value or None if unset
+    """
+    value = getattr(voice, field_name, None)
+    if value is None and voice.labels:
+        value = voice.labels.get(field_name)
+    return normalize_value(field_name, value)
+
+
+class VoiceCatalog:
+    """
+    Voice catalog persisted as JSON with a voice_id index and secondary indexes.
+
+    The catalog is considered fresh for ``ttl_hours`` after the last fetch. When it
+    expires, callers re-fetch the voice list and pass it to ``update``; a content
+    fingerprint (our ETag equivalent, since the voices endpoint has no conditional
+    requests) lets an unchanged list just extend the TTL without rewriting indexes.
+    """
+
+    VERSION = 2
+
+    def __init__(self, path: Path, ttl_hours: float = DEFAULT_TTL_HOURS):
+        """
+        Initialize the catalog and load it from disk if present.
+
+        Args:
+            path: JSON file backing the catalog
+            ttl_hours: Hours before the catalog needs refreshing
+        """
+        self.path = Path(path)
+        self.ttl_seconds = ttl_hours * 3600
+        self.fetched_at: Optional[float] = None
+        self.etag: Optional[str] = None
+        self.voices: Dict[str, VoiceInfo] = {}
+        self.indexes: Dict[str, Dict[str, Set[str]]] = {name: {} for name in INDEXED_FIELDS}
+        self._load()
+
+    @classmethod
+    def for_api_key(cls, api_key: str, catalog_dir: Optional[Path] = None,
+                    ttl_hours: float = DEFAULT_TTL_HOURS) -> 'VoiceCatalog':
+        """
+        Open the catalog for an API key (voice libraries differ per account).
+
+        Args:
+            api_key: ElevenLabs API key
+            catalog_dir: Directory for catalog files
+            ttl_hours: Hours before the catalog needs refreshing
+
+        Returns:
+            VoiceCatalog instance
+        """
+        key_hash = hashlib.sha256((api_key or "").encode('utf-8')).hexdigest()[:12]
+        directory = Path(catalog_dir) if catalog_dir else DEFAULT_CATALOG_DIR
+        return cls(directory / f"voice_catalog_{key_hash}.json", ttl_hours)
+
+    @property
+    def is_fresh(self) -> bool:
+        """Whether the catalog is populated and within its TTL."""
+        if self.fetched_at is None or not self.voices:
+            return False
+        return (time.time() - self.fetched_at) < self.ttl_seconds
+
+    def invalidate(self):
+        """Mark the catalog as expired so the next access refreshes it."""
+        self.fetched_at = None
+
+    def get(self, voice_id: str) -> Optional[VoiceInfo]:
+        """
+        Look up a voice by ID.
+
+        Args:
+            voice_id: Voice ID
+
+        Returns:
+            VoiceInfo or None if not in the catalog
+        """
+        return self.voices.get(voice_id)
+
+    def lookup(self, field_name: str, value: str) -> Set[str]:
+        """
+        Look up voice IDs by a secondary index.
+
+        Args:
+            field_name: One of INDEXED_FIELDS
+            value: Attribute value (case-insensitive)
+
+        Returns:
+            Set of matching voice IDs
+        """
+        return self.indexes.get(field_name, {}).get(normalize_value(field_name, value), set())
+
+    def update(self, voices: List[VoiceInfo]) -> bool:
+        """
+        Replace the catalog contents with a freshly fetched voice list.
+
+        Args:
+            voices: Voices returned by the API
+
+        Returns:
+            True if the contents changed, False if only the TTL was extended
+        """
+        etag = self._fingerprint(voices)
+        changed = etag != self.etag or not self.voices
+
+        if changed:
+            self.voices = {voice.voice_id: voice for voice in voices}
+            self._build_indexes()
+            self.etag = etag
+
+        self.fetched_at = time.time()
+        self._save()
+
+        if changed:
+            logger.debug(f"Voice catalog updated with {len(self.voices)} voices")
+        else:
+            logger.debug("Voice catalog unchanged, TTL extended")
+        return changed
+
+    def _build_indexes(self):
+        """Rebuild all secondary indexes from the voice_id index."""
+        self.indexes = {name: {} for name in INDEXED_FIELDS}
+        for voice_id, voice in self.voices.items():
+            for field_name in INDEXED_FIELDS:
+                value = voice_attribute(voice, field_name)
+                if value is not None:
+                    self.indexes[field_name].setdefault(value, set()).add(voice_id)
+
+    def _fingerprint(self, voices: List[VoiceInfo]) -> str:
+        """Hash the voice list in a stable order."""
+        payload = json.dumps(
+            sorted((asdict(voice) for voice in voices), key=lambda v: v["voice_id"]),
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _load(self):
+        """Load the catalog from disk, ignoring missing or incompatible files."""
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION:
+                return
+            self.voices = {
+                voice_id: VoiceInfo(**voice_data)
+                for voice_id, voice_data in data.get("voices", {}).items()
+            }
+            self.indexes = {
+                name: {value: set(ids) for value, ids in data.get("indexes", {}).get(name, {}).items()}
+                for name in INDEXED_FIELDS
+            }
+            self.fetched_at = data.get("fetched_at")
+            self.etag = data.get("etag")
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable voice catalog {self.path}: {e}")
+            self.voices = {}
+            self.indexes = {name: {} for name in INDEXED_FIELDS}
+            self.fetched_at = None
+            self.etag = None
+
+    def _save(self):
+        """Write the catalog atomically."""
+        data = {
+            "version": self.VERSION,
+            "fetched_at": self.fetched_at,
+            "etag": self.etag,
+            "voices": {voice_id: asdict(voice) for voice_id, voice in self.voices.items()},
+            "indexes": {
+                name: {value: sorted(ids) for value, ids in index.items()}
+                for name, index in self.indexes.items()
+            }
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write voice catalog {self.path}: {e}")
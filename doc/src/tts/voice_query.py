@@ -0,0 +1,137 @@
+"""
+In-memory query engine for discovering voices in the voice catalog.
+"""
+
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+from tts.models import VoiceInfo, VoiceDiscoveryFilter
+from tts.voice_catalog import INDEXED_FIELDS, normalize_value, voice_attribute
+
+
+logger = logging.getLogger(__name__)
+
+
+# Ranking weights: preferred attributes dominate, catalog metadata breaks ties
+PREFERENCE_WEIGHT = 2.0
+PREVIEW_WEIGHT = 0.5
+DESCRIPTION_WEIGHT = 0.25
+CATEGORY_WEIGHTS = {
+    "professional": 1.0,
+    "premade": 0.8,
+    "generated": 0.5,
+    "cloned": 0.5
+}
+
+
+class VoiceQueryEngine:
+    """
+    Inverted indexes over the voice catalog with set-intersection queries and ranking.
+    """
+
+    def __init__(self, voices: Dict[str, VoiceInfo],
+                 indexes: Optional[Dict[str, Dict[str, Set[str]]]] = None):
+        """
+        Build (or adopt) inverted indexes over a voice catalog.
+
+        Args:
+            voices: Mapping of voice_id to VoiceInfo
+            indexes: Prebuilt indexes keyed by field then normalized value,
+                e.g. VoiceCatalog.indexes; built from voices when omitted
+        """
+        self.voices = voices
+        self.all_ids: Set[str] = set(voices)
+        if indexes is not None:
+            self.indexes = indexes
+        else:
+            self.indexes = {name: {} for name in INDEXED_FIELDS}
+            for voice_id, voice in voices.items():
+                for field_name in INDEXED_FIELDS:
+                    value = voice_attribute(voice, field_name)
+                    if value is not None:
+                        self.indexes[field_name].setdefault(value, set()).add(voice_id)
+
+        logger.debug(f"Built voice query engine over {len(voices)} voices")
+
+    def match(self, filter_criteria: VoiceDiscoveryFilter) -> Set[str]:
+        """
+        Find voice IDs matching every criterion by intersecting posting sets.
+
+        Args:
+            filter_criteria: Required attributes and exclusions
+
+        Returns:
+            Set of matching voice IDs
+        """
+        postings = []
+        for field_name in INDEXED_FIELDS:
+            value = normalize_value(field_name, getattr(filter_criteria, field_name, None))
+            if value is None:
+                continue
+            posting = self.indexes.get(field_name, {}).get(value)
+            if not posting:
+                return set()
+            postings.append(posting)
+
+        if postings:
+            # Intersect smallest sets first
+            postings.sort(key=len)
+            matches = set(postings[0])
+            for posting in postings[1:]:
+                matches &= posting
+                if not matches:
+                    return matches
+        else:
+            matches = set(self.all_ids)
+
+        if filter_criteria.exclude_voice_ids:
+            matches.difference_update(filter_criteria.exclude_voice_ids)
+        return matches
+
+    def score(self, voice: VoiceInfo, preferences: Optional[Dict[str, str]] = None) -> float:
+        """
+        Score a voice for ranking.
+
+        Args:
+            voice: Voice to score
+            preferences: Soft attribute preferences (e.g. {"gender": "female"})
+
+        Returns:
+            Ranking score (higher is better)
+        """
+        total = CATEGORY_WEIGHTS.get(normalize_value("category", voice.category), 0.0)
+        if voice.preview_url:
+            total += PREVIEW_WEIGHT
+        if voice.description:
+            total += DESCRIPTION_WEIGHT
+
+        for field_name, wanted in (preferences or {}).items():
+            wanted = normalize_value(field_name, wanted)
+            if wanted is not None and voice_attribute(voice, field_name) == wanted:
+                total += PREFERENCE_WEIGHT
+        return total
+
+    def max_score(self, preferences: Optional[Dict[str, str]] = None) -> float:
+        """Highest score achievable with the given preferences."""
+        return (max(CATEGORY_WEIGHTS.values()) + PREVIEW_WEIGHT + DESCRIPTION_WEIGHT
+                + PREFERENCE_WEIGHT * len(preferences or {}))
+
+    def query(self, filter_criteria: VoiceDiscoveryFilter, limit: int = 10,
+              preferences: Optional[Dict[str, str]] = None) -> List[Tuple[VoiceInfo, float]]:
+        """
+        Find and rank voices matching the filter.
+
+        Args:
+            filter_criteria: Required attributes and exclusions
+            limit: Maximum number of results
+            preferences: Soft attribute preferences used for ranking
+
+        Returns:
+            List of (VoiceInfo, score) sorted by descending score
+        """
+        ranked = [
+            (self.voices[voice_id], self.score(self.voices[voice_id], preferences))
+            for voice_id in self.match(filter_criteria)
+        ]
+        ranked.sort(key=lambda item: (-item[1], item[0].name or "", item[0].voice_id))
+        return ranked[:limit]
@@ -0,0 +1,326 @@
+"""
+Voice scheduler that spreads conversations across a locale's voices.
+"""
+
+import os
+import json
+import time
+import random
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are not serialized across processes
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+
+# TTS outcomes kept per voice for the error rate
+RECENT_WINDOW = 50
+# Pseudo-successes added to the error rate so a single failure does not sink a voice
+ERROR_PRIOR = 5
+# Consecutive failures that take a voice out of rotation, and for how long
+COOLDOWN_ERRORS = 3
+COOLDOWN_SECONDS = 600.0
+# Floor on the health factor so failing voices keep a trickle of traffic
+MIN_HEALTH = 0.05
+
+AGE_RANGES = ("young", "middle-aged", "senior")
+
+
+def voice_age_range(age) -> Optional[str]:
+    """
+    Normalize a voice profile age ("40", "young", "elderly", ...) to a character age range.
+
+    Args:
+        age: Age field from voice_profiles.json
+
+    Returns:
+        "young", "middle-aged", "senior" or None if unknown
+    """
+    if age is None:
+        return None
+    text = str(age).strip().lower()
+    if text.isdigit():
+        years = int(text)
+        return "young" if years < 30 else "middle-aged" if years < 55 else "senior"
+    if text in ("old", "elderly", "senior"):
+        return "senior"
+    return text if text in AGE_RANGES else None
+
+
+def _empty_stats() -> Dict:
+    """Per-voice state row."""
+    return {"assigned": 0, "requests": 0, "errors": 0, "recent": [], "cooldown_until": 0.0}
+
+
+class VoiceScheduler:
+    """
+    Assigns voices by least load, weighted by recent TTS health.
+
+    Each candidate scores (assignments + 1) / health, where health falls with
+    the voice's recent error rate, and the lowest score wins. Voices that fail
+    COOLDOWN_ERRORS times in a row sit out for COOLDOWN_SECONDS unless nothing
+    else fits. Gender must match when both sides know it; age range is
+    preferred but dropped when no voice of that age is available.
+
+    Counters are keyed by voice ID and saved to a JSON file. Saves merge this
+    process's changes into what is on disk, so concurrent runs (e.g. TTS
+    worker processes) do not overwrite each other.
+    """
+
+    def __init__(self, voice_profiles: Optional[Dict] = None, state_path: Optional[Path] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            voice_profiles: Locale voice profiles (uses "available_voices")
+            state_path: JSON file to load and save state, or None to keep it in memory
+        """
+        self.voices: Dict[str, Dict] = dict((voice_profiles or {}).get("available_voices", {}))
+        self._profiles_by_id = {info["id"]: info for info in self.voices.values() if info.get("id")}
+        self.state_path = Path(state_path) if state_path else None
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict] = self._read_state()
+        self._deltas: Dict[str, Dict] = {}
+
+    def add_profiles(self, voice_profiles: Optional[Dict]):
+        """
+        Add voice profiles to a scheduler first created without them.
+
+        Args:
+            voice_profiles: Locale voice profiles (uses "available_voices")
+        """
+        voices = (voice_profiles or {}).get("available_voices", {})
+        with self._lock:
+            for name, info in voices.items():
+                self.voices.setdefault(name, info)
+                if info.get("id"):
+                    self._profiles_by_id.setdefault(info["id"], info)
+
+    def _profile(self, voice: str) -> Dict:
+        """Voice profile for a voice name or ID (empty if unknown)."""
+        return self.voices.get(voice) or self._profiles_by_id.get(voice) or {}
+
+    def _key(self, voice: str) -> str:
+        """State key for a voice name or ID: its ID when known."""
+        return self._profile(voice).get("id") or voice
+
+    def voice_gender(self, voice: Optional[str]) -> Optional[str]:
+        """Gender of a voice from its profile, if known."""
+        return self._profile(voice).get("gender") if voice else None
+
+    def voice_age(self, voice: Optional[str]) -> Optional[str]:
+        """Age range of a voice from its profile, if known."""
+        return voice_age_range(self._profile(voice).get("age")) if voice else None
+
+    def _matches(self, voice: str, gender: Optional[str], age_range: Optional[str]) -> bool:
+        """Whether a voice fits the constraints; unknown attributes always fit."""
+        if gender and gender != "any":
+            voice_gender = self.voice_gender(voice)
+            if voice_gender and voice_gender != gender:
+                return False
+        if age_range and age_range != "any":
+            voice_age = self.voice_age(voice)
+            if voice_age and voice_age != age_range:
+                return False
+        return True
+
+    def _stats(self, key: str) -> Dict:
+        """Current state of a voice including unsaved changes (caller holds the lock)."""
+        stats = dict(self._state.get(key) or _empty_stats())
+        delta = self._deltas.get(key)
+        if delta:
+            for field in ("assigned", "requests", "errors"):
+                stats[field] += delta[field]
+            stats["recent"] = sorted(stats["recent"] + delta["recent"], key=lambda row: row[0])[-RECENT_WINDOW:]
+            stats["cooldown_until"] = max(stats["cooldown_until"], delta["cooldown_until"])
+        return stats
+
+    def _delta(self, key: str) -> Dict:
+        """Unsaved changes for a voice (caller holds the lock)."""
+        if key not in self._deltas:
+            self._deltas[key] = _empty_stats()
+        return self._deltas[key]
+
+    def _health(self, stats: Dict) -> float:
+        """Traffic weight in [MIN_HEALTH, 1] from the recent error rate."""
+        recent = stats["recent"]
+        errors = sum(1 for _, ok in recent if not ok)
+        error_rate = errors / (len(recent) + ERROR_PRIOR)
+        return max(MIN_HEALTH, (1.0 - error_rate) ** 2)
+
+    def is_cooling_down(self, voice: str) -> bool:
+        """
+        Check whether a voice is out of rotation after consecutive failures.
+
+        Args:
+            voice: Voice name or ID
+
+        Returns:
+            True while the voice's cooldown lasts
+        """
+        with self._lock:
+            return self._stats(self._key(voice))["cooldown_until"] > time.time()
+
+    def choose(self, pool: Iterable[str], gender: Optional[str] = None, age_range: Optional[str] = None,
+               exclude: Iterable[str] = ()) -> Optional[str]:
+        """
+        Pick the least loaded healthy voice that fits the constraints and count the assignment.
+
+        Args:
+            pool: Candidate voice names or IDs
+            gender: Required gender ("male", "female", "any" or None)
+            age_range: Preferred age range ("young", "middle-aged", "senior", "any" or None)
+            exclude: Voices not to use (e.g. the other speaker)
+
+        Returns:
+            Chosen entry from pool, or None if no voice fits
+        """
+        excluded = {self._key(voice) for voice in exclude}
+        available = [voice for voice in dict.fromkeys(pool) if self._key(voice) not in excluded]
+        candidates = ([voice for voice in available if self._matches(voice, gender, age_range)]
+                      or [voice for voice in available if self._matches(voice, gender, None)])
+        if not candidates:
+            return None
+
+        now = time.time()
+        with self._lock:
+            stats = {voice: self._stats(self._key(voice)) for voice in candidates}
+            healthy = [voice for voice in candidates if stats[voice]["cooldown_until"] <= now] or candidates
+            chosen = min(
+                healthy,
+                key=lambda voice: ((stats[voice]["assigned"] + 1) / self._health(stats[voice]), random.random())
+            )
+            self._delta(self._key(chosen))["assigned"] += 1
+        return chosen
+
+    def choose_like(self, voice: str, pool: Iterable[str], exclude: Iterable[str] = ()) -> Optional[str]:
+        """
+        Pick a replacement with the same gender and age range as a voice.
+
+        Args:
+            voice: Voice being replaced
+            pool: Candidate voice names or IDs
+            exclude: Voices not to use
+
+        Returns:
+            Chosen entry from pool, or None if no voice fits
+        """
+        return self.choose(pool, self.voice_gender(voice), self.voice_age(voice), exclude=[voice, *exclude])
+
+    def record_result(self, voice: str, ok: bool):
+        """
+        Record the outcome of a TTS request.
+
+        Args:
+            voice: Voice name or ID used
+            ok: Whether the request succeeded
+        """
+        key = self._key(voice)
+        now = time.time()
+        with self._lock:
+            delta = self._delta(key)
+            delta["requests"] += 1
+            delta["recent"].append([round(now, 3), ok])
+            if not ok:
+                delta["errors"] += 1
+                recent = self._stats(key)["recent"][-COOLDOWN_ERRORS:]
+                if len(recent) == COOLDOWN_ERRORS and not any(success for _, success in recent):
+                    delta["cooldown_until"] = now + COOLDOWN_SECONDS
+                    logger.warning(f"Voice {voice} failed {COOLDOWN_ERRORS} times in a row; "
+                                   f"shifting traffic away for {COOLDOWN_SECONDS:.0f}s")
+
+    def summary(self) -> Dict[str, Dict]:
+        """
+        Per-voice counters for reporting.
+
+        Returns:
+            Dictionary mapping voice IDs to assigned, requests, errors, recent error rate and cooldown flag
+        """
+        now = time.time()
+        with self._lock:
+            keys = set(self._state) | set(self._deltas)
+            report = {}
+            for key in sorted(keys):
+                stats = self._stats(key)
+                recent = stats["recent"]
+                report[key] = {
+                    "assigned": stats["assigned"],
+                    "requests": stats["requests"],
+                    "errors": stats["errors"],
+                    "recent_error_rate": round(sum(1 for _, ok in recent if not ok) / len(recent), 3) if recent else 0.0,
+                    "cooling_down": stats["cooldown_until"] > now
+                }
+        return report
+
+    def _read_state(self) -> Dict[str, Dict]:
+        """Load saved state, treating a missing or unreadable file as empty."""
+        if not self.state_path or not self.state_path.exists():
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get("voices", {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read voice scheduler state {self.state_path}: {e}")
+            return {}
+
+    def save(self):
+        """Merge unsaved changes into the state file and write it atomically."""
+        if not self.state_path:
+            return
+        with self._lock:
+            if not self._deltas:
+                return
+            try:
+                self.state_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.state_path.with_suffix(".lock"), 'w') as lock_file:
+                    if fcntl:
+                        fcntl.flock(lock_file, fcntl.LOCK_EX)
+                    self._state = self._read_state()
+                    merged = {key: self._stats(key) for key in set(self._state) | set(self._deltas)}
+                    fd, tmp_path = tempfile.mkstemp(dir=self.state_path.parent, suffix=".tmp")
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        json.dump({"voices": merged}, f, ensure_ascii=False, indent=2)
+                    os.replace(tmp_path, self.state_path)
+                self._state = merged
+                self._deltas = {}
+            except OSError as e:
+                logger.warning(f"Could not save voice scheduler state {self.state_path}: {e}")
+
+
+_schedulers: Dict[str, VoiceScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_voice_scheduler(state_path: Optional[Path], voice_profiles: Optional[Dict] = None) -> VoiceScheduler:
+    """
+    Get the process-wide voice scheduler for a state file.
+
+    Conversation generation and TTS in one process share it, so assignments
+    and TTS errors feed the same counters. The registry lives in this module,
+    so callers must import it as tts.voice_scheduler (as the tts package
+    does); importing it as src.tts.voice_scheduler loads a second copy with
+    its own registry.
+
+    Args:
+        state_path: Scheduler state file (None for an in-memory scheduler)
+        voice_profiles: Locale voice profiles (added to an existing instance that lacks them)
+
+    Returns:
+        Shared VoiceScheduler instance
+    """
+    key = str(Path(state_path).resolve()) if state_path else ""
+    with _schedulers_lock:
+        if key not in _schedulers:
+            _schedulers[key] = VoiceScheduler(voice_profiles, state_path)
+        elif voice_profiles:
+            # An earlier caller may have created it without profiles
+            _schedulers[key].add_profiles(voice_profiles)
+        return _schedulers[key]
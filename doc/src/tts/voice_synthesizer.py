@@ -7,26 +7,45 @@ import os
 import random
 import asyncio
 import logging
+from dataclasses import asdict
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 from tqdm import tqdm
 import sys
 
-from elevenlabs.client import AsyncElevenLabs
+import numpy as np
+
 from config.config_loader import Config
 from tts.audio_processor import AudioProcessor
-from tts.audio_combiner import AudioCombiner
+from tts.audio_combiner import AudioCombiner, TURN_AUDIO_EXTENSIONS
 from tts.voice_validator import VoiceValidator
 from tts.audio_tags import AudioTagManager
+from tts.tts_backend import TTSBackendFactory
+from tts.audio_io import sample_rate_from_format, write_wav, write_flac
+from tts.audio_index import get_audio_index
+from tts.artifact_manifest import get_artifact_manifest
+from tts.work_queue import TTSWorkQueue
+from tts.voice_scheduler import get_voice_scheduler
+from tts.request_stitching import (
+    BATCH_MODES, SynthesisRequest, plan_requests, join_turn_texts,
+    alignment_cut_points, split_samples, pcm_format_for
+)
 from utils.logging_utils import ConditionalLogger, create_progress_bar, format_completion_message
 
 
 logger = logging.getLogger(__name__)
 
 
+# Where intermediate audio lives between the TTS and packaging stages
+INTERMEDIATE_STORAGE_MODES = ("memory", "files")
+
+
 class VoiceSynthesizer:
     """
-    Enhanced voice synthesizer using ElevenLabs with v3 support, audio tags, and improved quality settings.
+    Enhanced voice synthesizer with v3 support, audio tags, and improved quality settings.
+    
+    Speech comes from a pluggable TTS backend: ElevenLabs by default, or the
+    offline local backend for development and load testing.
     """
     
     def __init__(self, config: Config):
@@ -37,7 +56,9 @@ class VoiceSynthesizer:
             config: Configuration object with enhanced voice settings
         """
         self.config = config
-        self.client = AsyncElevenLabs(api_key=config.elevenlabs_api_key)
+        self.backend_name = getattr(config, 'voice_backend', 'elevenlabs')
+        self.backend = TTSBackendFactory.create(self.backend_name, config)
+        self.output_format = self.backend.resolve_output_format(config.voice_output_format)
         self.api_key = config.elevenlabs_api_key
         self.audio_processor = AudioProcessor(config)
         self.audio_combiner = AudioCombiner(config)
@@ -48,6 +69,13 @@ class VoiceSynthesizer:
         self.voice_profiles = None  # Will be loaded lazily
         self._load_voice_profiles()
         
+        # Load-balanced voice assignment with per-voice error tracking (None = random selection)
+        self.voice_scheduler = None
+        if getattr(config, 'voice_scheduler_enabled', False):
+            self.voice_scheduler = get_voice_scheduler(
+                getattr(config, 'voice_scheduler_state_file', None), self.voice_profiles
+            )
+        
         # Enhanced features
         self.audio_tag_manager = AudioTagManager()
         self.current_conversation_type = None  # Track if processing scam or legit conversations
@@ -58,6 +86,29 @@ class VoiceSynthesizer:
         # Check if using a v3 model
         self.is_v3_model = "v3" in self.model_id.lower()
         
+        # Request batching: "off", "stitch" (previous/next text) or "merge" (same-speaker runs)
+        self.batch_mode = getattr(config, 'voice_batch_mode', 'off')
+        if self.batch_mode not in BATCH_MODES:
+            raise ValueError(
+                f"Unsupported voice batch mode '{self.batch_mode}'. Use one of: {', '.join(BATCH_MODES)}"
+            )
+        
+        # Intermediate audio: "memory" runs combine -> effects -> resample without writing
+        # the combined file; the legacy pydub stages only work on files
+        self.intermediate_storage = getattr(config, 'voice_intermediate_storage', 'memory')
+        if self.intermediate_storage not in INTERMEDIATE_STORAGE_MODES:
+            raise ValueError(
+                f"Unsupported intermediate audio storage '{self.intermediate_storage}'. "
+                f"Use one of: {', '.join(INTERMEDIATE_STORAGE_MODES)}"
+            )
+        if self.intermediate_storage == "memory" and (
+                self.audio_combiner.backend == "pydub" or self.audio_processor.engine == "pydub"):
+            self.clogger.info("Intermediate audio kept on disk: pydub audio stages need files")
+            self.intermediate_storage = "files"
+        self.keep_combined_wav = getattr(config, 'voice_keep_combined_wav', False)
+        self.debug_flac = getattr(config, 'voice_debug_flac', False)
+        self._warned_no_flac = False
+        
         # Log enhancement features being used
         if self.is_v3_model:
             self.clogger.info(f"Using v3 model: {self.model_id}")
@@ -67,6 +118,10 @@ class VoiceSynthesizer:
             # v3 features are ignored when not using a v3 model
             if config.use_audio_tags:
                 self.clogger.info("Audio tags configured but ignored (requires v3 model)")
+        if self.batch_mode != "off":
+            self.clogger.info(f"TTS batch mode: {self.batch_mode}")
+        if self.backend_name != "elevenlabs":
+            self.clogger.info(f"TTS backend: {self.backend_name} ({self.output_format})")
     
     
     async def validate_voices(self) -> bool:
@@ -86,6 +141,11 @@ class VoiceSynthesizer:
         if set(voice_ids).issubset(self.validated_voices):
             return True
         
+        # Offline backends accept any voice ID
+        if not self.backend.requires_voice_validation:
+            self.validated_voices.update(voice_ids)
+            return True
+        
         self.clogger.info(f"Validating {len(voice_ids)} voice IDs for {self.config.voice_language}")
         
         results = await self.voice_validator.validate_voice_ids(voice_ids)
@@ -144,23 +204,7 @@ class VoiceSynthesizer:
         # Create output directory
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Load conversations
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Extract conversations list from the data structure
-        # Handle both dict format (with 'conversations' key) and plain array format
-        if isinstance(data, dict):
-            conversations = data.get('conversations', [])
-        elif isinstance(data, list):
-            conversations = data
-        else:
-            raise ValueError(f"Unexpected data format in {input_file}: {type(data)}")
-        
-        self.clogger.info(f"Found {len(conversations)} conversations to process")
-        
-        # Limit conversations based on config
-        conversations_to_process = conversations[:self.config.sample_limit] if hasattr(self.config, 'sample_limit') else conversations
+        conversations_to_process = self._load_conversations(input_file)
         
         # Create simplified progress bar
         audio_type = "scam" if is_scam else "legit" 
@@ -183,7 +227,9 @@ class VoiceSynthesizer:
             nonlocal completed_count, failed_count
             async with semaphore:
                 try:
-                    await self._process_conversation_async(conversation, output_dir, pbar)
+                    await self._process_conversation_async(
+                        conversation, output_dir, pbar, self.current_conversation_type
+                    )
                     completed_count += 1
                 except Exception as e:
                     failed_count += 1
@@ -204,6 +250,7 @@ class VoiceSynthesizer:
         await asyncio.gather(*tasks)
         
         pbar.close()
+        self._save_voice_scheduler()
         
         # Final summary
         duration = asyncio.get_event_loop().time() - start_time
@@ -221,7 +268,89 @@ class VoiceSynthesizer:
         elif self.config.verbose:
             self.clogger.info(f"Completed audio generation: {completed_count} successful, {failed_count} failed, {total_processed} total")
     
-    async def _process_conversation_async(self, conversation: Dict, output_dir: Path, pbar: tqdm):
+    def _load_conversations(self, input_file: Path) -> List[Dict]:
+        """
+        Load conversations from a JSON file, applying the configured sample limit.
+        
+        Args:
+            input_file: Path to JSON file containing conversations
+            
+        Returns:
+            Conversations to process
+        """
+        with open(input_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        # Extract conversations list from the data structure
+        # Handle both dict format (with 'conversations' key) and plain array format
+        if isinstance(data, dict):
+            conversations = data.get('conversations', [])
+        elif isinstance(data, list):
+            conversations = data
+        else:
+            raise ValueError(f"Unexpected data format in {input_file}: {type(data)}")
+        
+        self.clogger.info(f"Found {len(conversations)} conversations to process")
+        
+        # Limit conversations based on config
+        return conversations[:self.config.sample_limit] if hasattr(self.config, 'sample_limit') else conversations
+    
+    def enqueue_audio(self, input_file: Path, output_dir: Path, queue: TTSWorkQueue,
+                      is_scam: bool = True) -> int:
+        """
+        Plan TTS requests for all conversations in a file and add them to a work queue.
+        
+        Voices are chosen here so that every worker uses the same pair for a
+        conversation. Workers are started separately (see tts.tts_worker).
+        
+        Args:
+            input_file: Path to JSON file containing conversations
+            output_dir: Directory to save audio files
+            queue: Work queue shared with the workers
+            is_scam: Whether these are scam conversations
+            
+        Returns:
+            Number of jobs added (conversations already queued are skipped)
+        """
+        conversation_type = "scam" if is_scam else "legit"
+        output_dir = Path(output_dir).resolve()
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        added = 0
+        manifest = get_artifact_manifest(output_dir)
+        for conversation in self._load_conversations(input_file):
+            conversation_id = conversation["conversation_id"]
+            caller_voice, callee_voice = self._select_voices_for_conversation(conversation)
+            requests = plan_requests(conversation["dialogue"], self.batch_mode)
+            payload = {
+                "conversation_id": conversation_id,
+                "dialogue": conversation["dialogue"],
+                "conversation_type": conversation_type,
+                "output_dir": str(output_dir),
+                "caller_voice": caller_voice,
+                "callee_voice": callee_voice,
+                "batch_mode": self.batch_mode
+            }
+            jobs = queue.enqueue_conversation(
+                f"{output_dir}/{conversation_id}", payload, [asdict(request) for request in requests]
+            )
+            if jobs:
+                manifest.record_conversation(conversation_id, "queued", len(conversation["dialogue"]))
+            added += jobs
+        
+        self._save_voice_scheduler()
+        self.clogger.info(f"Queued {added} TTS jobs for {conversation_type} conversations from {input_file}")
+        return added
+    
+    def _save_voice_scheduler(self):
+        """Persist voice scheduler counters, if scheduling is enabled."""
+        if self.voice_scheduler:
+            self.voice_scheduler.save()
+            for voice_id, stats in self.voice_scheduler.summary().items():
+                self.clogger.debug(f"Voice {voice_id}: {stats}")
+    
+    async def _process_conversation_async(self, conversation: Dict, output_dir: Path, pbar: tqdm,
+                                          conversation_type: Optional[str] = None):
         """
         Process a single conversation to generate enhanced audio asynchronously.
         
@@ -229,13 +358,17 @@ class VoiceSynthesizer:
             conversation: Conversation dictionary
             output_dir: Output directory
             pbar: Progress bar for safe logging
+            conversation_type: "scam" or "legit" (defaults to the current run's type)
         """
+        conversation_type = conversation_type or self.current_conversation_type
         conversation_id = conversation["conversation_id"]
         dialogue = conversation["dialogue"]
         
         # Create conversation directory
         conv_dir = output_dir / f"conversation_{conversation_id:03d}"
         conv_dir.mkdir(exist_ok=True)
+        manifest = get_artifact_manifest(output_dir)
+        manifest.record_conversation(conversation_id, "started", len(dialogue))
         
         # Select voices for caller and callee based on mapping or random
         caller_voice, callee_voice = self._select_voices_for_conversation(conversation)
@@ -247,22 +380,25 @@ class VoiceSynthesizer:
         audio_files = []
         failed_turns = []
         
-        # Generate audio for each turn concurrently with enhanced context
-        turn_tasks = []
-        for i, turn in enumerate(dialogue):
-            # Determine turn position for context-aware tagging
-            if i == 0:
-                turn_position = "opening"
-            elif i == len(dialogue) - 1:
-                turn_position = "closing"
-            else:
-                turn_position = "middle"
+        requests = plan_requests(dialogue, self.batch_mode)
+        if self.batch_mode == "merge":
+            # One request per same-speaker run, split back into turn files
+            turn_results = await self._generate_merged_turns_async(
+                dialogue, requests, caller_voice, callee_voice, conv_dir, conversation_type
+            )
+        else:
+            # Generate audio for each turn concurrently with enhanced context
+            turn_tasks = []
+            for i, (turn, request) in enumerate(zip(dialogue, requests)):
+                task = self._generate_turn_audio_async(
+                    turn, caller_voice, callee_voice, conv_dir,
+                    self._get_turn_position(i, len(dialogue)), conversation_type,
+                    previous_text=request.previous_text, next_text=request.next_text
+                )
+                turn_tasks.append(task)
             
-            task = self._generate_turn_audio_async(turn, caller_voice, callee_voice, conv_dir, turn_position)
-            turn_tasks.append(task)
-        
-        # Wait for all turns to complete
-        turn_results = await asyncio.gather(*turn_tasks, return_exceptions=True)
+            # Wait for all turns to complete
+            turn_results = await asyncio.gather(*turn_tasks, return_exceptions=True)
         
         # Process results
         for idx, result in enumerate(turn_results):
@@ -285,25 +421,340 @@ class VoiceSynthesizer:
                 f"Conv {conversation_id}: Only {actual_turns}/{expected_turns} turns generated. Missing: {failed_turns}", 
                 pbar
             )
+            manifest.record_conversation(conversation_id, "incomplete", expected_turns, failed_turns)
             # Raise exception to mark conversation as failed
             raise ValueError(f"Incomplete audio generation: {actual_turns}/{expected_turns} turns")
         
         # Combine audio files only if all turns are present
-        combined_path = await asyncio.to_thread(
-            self.audio_combiner.combine_conversation, conv_dir, conversation_id
+        await self._finalize_conversation_async(
+            conv_dir, conversation_id, caller_voice, callee_voice, audio_files, expected_turns, len(requests)
         )
+    
+    async def _finalize_conversation_async(self, conv_dir: Path, conversation_id: int,
+                                           caller_voice: str, callee_voice: str,
+                                           audio_files: List[Dict], expected_turns: int,
+                                           tts_requests: int) -> bool:
+        """
+        Combine and process a conversation whose turns are all generated, then record the outcome.
         
-        if combined_path:
-            # Apply audio processing (run in thread to not block)
-            processed_path = await asyncio.to_thread(
-                self.audio_processor.process_conversation_audio, combined_path
-            )
+        Turn files are checked on disk first; if any is gone the conversation is
+        recorded incomplete instead of being combined from the remaining turns.
+        
+        Args:
+            conv_dir: Conversation directory
+            conversation_id: Conversation ID
+            caller_voice: Caller voice ID
+            callee_voice: Callee voice ID
+            audio_files: Audio file info per turn
+            expected_turns: Number of dialogue turns
+            tts_requests: Number of TTS requests planned for the conversation
             
+        Returns:
+            True if the final audio file was produced
+        """
+        manifest = get_artifact_manifest(conv_dir.parent)
+        
+        # Every turn must still be on disk: the combiner uses whatever turn files it finds
+        missing_turns = await asyncio.to_thread(self._missing_turn_files, conv_dir, audio_files)
+        if len(audio_files) < expected_turns or missing_turns:
+            self.clogger.warning(
+                f"Conversation {conversation_id}: {len(audio_files) - len(missing_turns)}/{expected_turns} "
+                f"turn files on disk. Missing: {missing_turns}"
+            )
+            manifest.record_conversation(conversation_id, "incomplete", expected_turns, missing_turns)
+            return False
+        
+        await asyncio.to_thread(self._remove_stale_turn_files, conv_dir, audio_files)
+        
+        if self.intermediate_storage == "memory":
+            combined_path, processed_path = await asyncio.to_thread(
+                self._combine_and_process_in_memory, conv_dir, conversation_id
+            )
+        else:
+            combined_path = await asyncio.to_thread(
+                self.audio_combiner.combine_conversation, conv_dir, conversation_id
+            )
+            processed_path = None
+            if combined_path:
+                # Apply audio processing (run in thread to not block)
+                processed_path = await asyncio.to_thread(
+                    self.audio_processor.process_conversation_audio, combined_path
+                )
+        
+        if processed_path:
             # Save metadata
             await asyncio.to_thread(
                 self._save_metadata, conv_dir, conversation_id, 
-                caller_voice, callee_voice, audio_files, processed_path
+                caller_voice, callee_voice, audio_files, processed_path, tts_requests
+            )
+        
+        # Record conversation-level artifacts, then the outcome
+        for artifact in (combined_path, processed_path):
+            if artifact:
+                await asyncio.to_thread(self._record_artifact, conv_dir, artifact)
+        status = "complete" if processed_path else "incomplete"
+        manifest.record_conversation(conversation_id, status, expected_turns)
+        return processed_path is not None
+    
+    def _combine_and_process_in_memory(self, conv_dir: Path,
+                                       conversation_id: int) -> Tuple[Optional[Path], Optional[Path]]:
+        """
+        Combine turns and run the effects chain on one in-memory buffer.
+        
+        Only the final 16 kHz file is written unless the combined WAV or the
+        FLAC debug copy are enabled in the intermediate_audio config.
+        
+        Args:
+            conv_dir: Conversation directory with turn files
+            conversation_id: Conversation ID for naming
+            
+        Returns:
+            Tuple of (combined WAV path if written, final file path), with None
+            for the final path if combining or processing failed
+        """
+        combined_path = self.audio_combiner.combined_path(conv_dir, conversation_id)
+        try:
+            combined = self.audio_combiner.combine_to_array(conv_dir)
+            if combined is None:
+                return None, None
+            samples, audio_files = combined
+            
+            written_combined = None
+            if self.keep_combined_wav:
+                self.audio_combiner.write_combined(combined_path, samples, len(audio_files))
+                written_combined = combined_path
+            if self.debug_flac:
+                self._write_debug_flac(combined_path.with_suffix('.flac'), samples)
+            
+            final_path = self.audio_processor.process_samples(
+                samples, self.audio_processor.final_path(combined_path)
+            )
+            return written_combined, final_path
+        except Exception as e:
+            self.clogger.error(f"Error processing audio for conversation {conversation_id}: {e}")
+            return None, None
+    
+    def _write_debug_flac(self, filepath: Path, samples: np.ndarray):
+        """
+        Write a FLAC copy of the combined audio for debugging.
+        
+        Args:
+            filepath: FLAC file path inside a conversation directory
+            samples: Combined int16 samples
+        """
+        if write_flac(filepath, samples, self.audio_combiner.sample_rate):
+            self._record_artifact(filepath.parent, filepath)
+        elif not self._warned_no_flac:
+            self.clogger.warning("FLAC debug copies need soundfile or ffmpeg; skipping them")
+            self._warned_no_flac = True
+    
+    def _artifact_exists(self, conv_dir: Path, filepath: Path) -> bool:
+        """
+        Check whether a file was already produced, using the artifact manifest.
+        
+        The manifest says whether the file was written completely; a stat
+        confirms it is still on disk, so a file deleted after it was recorded is
+        produced again. While the manifest is empty the file alone counts, so
+        output from before manifests existed can still be resumed.
+        
+        Args:
+            conv_dir: Conversation directory
+            filepath: Expected file
+            
+        Returns:
+            True if the file was produced and is still present
+        """
+        if not filepath.exists():
+            return False
+        manifest = get_artifact_manifest(conv_dir.parent)
+        return manifest.has_artifact(filepath) or manifest.is_empty
+    
+    @staticmethod
+    def _missing_turn_files(conv_dir: Path, audio_files: List[Dict]) -> List[int]:
+        """
+        Turn IDs whose audio file is not on disk.
+        
+        Args:
+            conv_dir: Conversation directory
+            audio_files: Audio file info per turn
+            
+        Returns:
+            Turn IDs of missing files
+        """
+        return [
+            info["turn_id"] for info in audio_files
+            if not (conv_dir / info["filename"]).exists()
+        ]
+    
+    def _remove_stale_turn_files(self, conv_dir: Path, audio_files: List[Dict]):
+        """
+        Delete turn files that are not part of the current output.
+        
+        The combiner picks up every turn_* audio file, so a turn left in another
+        format by an earlier run (e.g. .mp3 before switching to merge mode,
+        which writes .wav) would otherwise be combined twice.
+        
+        Args:
+            conv_dir: Conversation directory
+            audio_files: Audio file info per turn of the current run
+        """
+        current = {info["filename"] for info in audio_files if info and info.get("filename")}
+        for turn_file in conv_dir.glob("turn_*.*"):
+            if turn_file.name not in current and turn_file.suffix.lower() in TURN_AUDIO_EXTENSIONS:
+                self.clogger.debug(f"Removing stale turn file {turn_file}")
+                turn_file.unlink(missing_ok=True)
+    
+    def _record_artifact(self, conv_dir: Path, filepath: Path, turn_id: Optional[int] = None):
+        """
+        Record a produced file in the artifact manifest.
+        
+        Args:
+            conv_dir: Conversation directory (named conversation_<id>)
+            filepath: File that was written
+            turn_id: Turn number for turn files
+        """
+        conversation_id = int(conv_dir.name.rsplit('_', 1)[-1])
+        get_artifact_manifest(conv_dir.parent).record_artifact(conversation_id, filepath, turn_id)
+    
+    @staticmethod
+    def _get_turn_position(index: int, total_turns: int) -> str:
+        """
+        Determine turn position for context-aware tagging.
+        
+        Args:
+            index: Turn index in the dialogue
+            total_turns: Number of turns in the dialogue
+            
+        Returns:
+            "opening", "middle" or "closing"
+        """
+        if index == 0:
+            return "opening"
+        if index == total_turns - 1:
+            return "closing"
+        return "middle"
+    
+    async def _generate_merged_turns_async(self, dialogue: List[Dict], requests: List[SynthesisRequest],
+                                           caller_voice: str, callee_voice: str, conv_dir: Path,
+                                           conversation_type: Optional[str]) -> List:
+        """
+        Generate audio for merged same-speaker requests and map results back to turns.
+        
+        Args:
+            dialogue: Dialogue turns
+            requests: Requests planned in "merge" mode
+            caller_voice: Voice ID for caller
+            callee_voice: Voice ID for callee
+            conv_dir: Conversation directory
+            conversation_type: "scam" or "legit"
+            
+        Returns:
+            Per-turn results in dialogue order: audio info dict, exception or None
+        """
+        request_results = await asyncio.gather(*[
+            self._generate_request_audio_async(
+                dialogue, request, caller_voice, callee_voice, conv_dir, conversation_type
+            )
+            for request in requests
+        ], return_exceptions=True)
+        
+        turn_results = [None] * len(dialogue)
+        for request, result in zip(requests, request_results):
+            for position, turn_index in enumerate(request.turn_indexes):
+                if isinstance(result, Exception):
+                    turn_results[turn_index] = result
+                elif result:
+                    turn_results[turn_index] = result[position]
+        return turn_results
+    
+    async def _generate_request_audio_async(self, dialogue: List[Dict], request: SynthesisRequest,
+                                            caller_voice: str, callee_voice: str, conv_dir: Path,
+                                            conversation_type: Optional[str]) -> Optional[List[Dict]]:
+        """
+        Generate one merged request and split it into per-turn WAV files.
+        
+        The request asks for raw PCM with character timestamps; cut points between
+        turns come from the alignment and are recorded in each turn's "segment".
+        
+        Args:
+            dialogue: Dialogue turns
+            request: Same-speaker request to generate
+            caller_voice: Voice ID for caller
+            callee_voice: Voice ID for callee
+            conv_dir: Conversation directory
+            conversation_type: "scam" or "legit"
+            
+        Returns:
+            Audio file info per turn of the request, or None if the voice is not validated
+        """
+        turns = [dialogue[index] for index in request.turn_indexes]
+        role = request.role
+        voice_id = caller_voice if role == "caller" else callee_voice
+        sent_ids = [turn["sent_id"] for turn in turns]
+        
+        # Skip if voice is not validated (safety check)
+        if voice_id not in self.validated_voices:
+            self.clogger.progress_write(f"Skipping turns {sent_ids} ({role}): Voice {voice_id} not validated")
+            return None
+        
+        enhanced = [
+            self._enhance_text_with_tags(
+                turn["text"], role, self._get_turn_position(index, len(dialogue)), conversation_type
             )
+            for index, turn in zip(request.turn_indexes, turns)
+        ]
+        filenames = [f"turn_{sent_id:02d}_{role}.wav" for sent_id in sent_ids]
+        
+        turn_infos = [
+            {
+                "turn_id": turn["sent_id"],
+                "role": role,
+                "text": turn["text"],
+                "enhanced_text": enhanced_text,
+                "voice_id": voice_id,
+                "filename": filename,
+                "audio_tags_used": tags
+            }
+            for turn, (enhanced_text, tags), filename in zip(turns, enhanced, filenames)
+        ]
+        
+        # Skip the request if every turn file was already produced
+        if all(self._artifact_exists(conv_dir, conv_dir / filename) for filename in filenames):
+            self.clogger.progress_write(f"Skipping existing files: {', '.join(filenames)}")
+            return turn_infos
+        
+        merged_text, spans = join_turn_texts([enhanced_text for enhanced_text, _ in enhanced])
+        output_format = pcm_format_for(self.output_format)
+        sample_rate = sample_rate_from_format(output_format)
+        
+        try:
+            result = await self.backend.synthesize_with_timestamps(
+                merged_text, voice_id, output_format,
+                previous_text=request.previous_text, next_text=request.next_text
+            )
+        except Exception:
+            self._record_voice_result(voice_id, False)
+            raise
+        self._record_voice_result(voice_id, True)
+        samples = np.frombuffer(result.audio, dtype='<i2')
+        
+        if len(turns) > 1:
+            cut_points = alignment_cut_points(result.alignment, spans, len(merged_text))
+        else:
+            cut_points = []
+        segments = split_samples(samples, sample_rate, cut_points)
+        
+        for info, filename, (segment, start_ms, end_ms) in zip(turn_infos, filenames, segments):
+            await asyncio.to_thread(self._write_turn_wav, conv_dir / filename, segment, sample_rate)
+            await asyncio.to_thread(self._record_artifact, conv_dir, conv_dir / filename, info["turn_id"])
+            info["segment"] = {
+                "request_turn_ids": sent_ids,
+                "start_ms": start_ms,
+                "end_ms": end_ms
+            }
+        
+        self.clogger.progress_write(f"Generated: {', '.join(filenames)} (1 request)")
+        return turn_infos
     
     def _load_voice_profiles(self):
         """
@@ -370,16 +821,49 @@ class VoiceSynthesizer:
             
             if caller_id and callee_id:
                 self.clogger.info(f"Using mapped voices: {caller_name}→{caller_id}, {callee_name}→{callee_id}")
-                return caller_id, callee_id
+                return self._replace_cooling_voices(caller_id, callee_id)
             else:
                 self.clogger.warning(f"Voice mapping incomplete, falling back to random selection")
         
         # Fall back to random selection
         return self._select_voices()
     
+    def _replace_cooling_voices(self, caller_id: str, callee_id: str) -> Tuple[str, str]:
+        """
+        Swap mapped voices that the scheduler took out of rotation for similar validated voices.
+        
+        Replacements come from the validated voices, or from the configured
+        voice IDs when nothing has been validated yet (the queued path plans
+        voices without validating them).
+        
+        Args:
+            caller_id: Mapped caller voice ID
+            callee_id: Mapped callee voice ID
+            
+        Returns:
+            Tuple of (caller_voice_id, callee_voice_id)
+        """
+        if not self.voice_scheduler:
+            return caller_id, callee_id
+        candidates = self.validated_voices or set(self.config.voice_ids.get(self.config.voice_language, []))
+        if not candidates:
+            return caller_id, callee_id
+        
+        voices = [caller_id, callee_id]
+        for index, voice_id in enumerate(voices):
+            if self.voice_scheduler.is_cooling_down(voice_id):
+                other = voices[1 - index]
+                replacement = self.voice_scheduler.choose_like(voice_id, candidates, exclude=[other])
+                if replacement:
+                    self.clogger.info(f"Voice {voice_id} is failing, using {replacement} instead")
+                    voices[index] = replacement
+        return voices[0], voices[1]
+    
     def _select_voices(self) -> Tuple[str, str]:
         """
-        Randomly select two different voices for caller and callee.
+        Select two different voices for caller and callee.
+        
+        Uses the voice scheduler when enabled, otherwise picks at random.
         
         Returns:
             Tuple of (caller_voice_id, callee_voice_id)
@@ -389,6 +873,11 @@ class VoiceSynthesizer:
         if len(voice_ids) < 2:
             raise ValueError(f"Need at least 2 voices, but only {len(voice_ids)} available")
         
+        if self.voice_scheduler:
+            caller_voice = self.voice_scheduler.choose(voice_ids)
+            callee_voice = self.voice_scheduler.choose(voice_ids, exclude=[caller_voice])
+            return caller_voice, callee_voice
+        
         selected = random.sample(voice_ids, 2)
         return selected[0], selected[1]
     
@@ -439,7 +928,10 @@ class VoiceSynthesizer:
         raise last_error if last_error else ValueError("Generation failed")
     
     async def _generate_turn_audio_async(self, turn: Dict, caller_voice: str, 
-                                       callee_voice: str, conv_dir: Path, turn_position: str = "middle") -> Optional[Dict]:
+                                       callee_voice: str, conv_dir: Path, turn_position: str = "middle",
+                                       conversation_type: Optional[str] = None,
+                                       previous_text: Optional[str] = None,
+                                       next_text: Optional[str] = None) -> Optional[Dict]:
         """
         Generate enhanced audio for a single dialogue turn asynchronously.
         
@@ -449,6 +941,9 @@ class VoiceSynthesizer:
             callee_voice: Voice ID for callee
             conv_dir: Conversation directory
             turn_position: Position in conversation (opening, middle, closing)
+            conversation_type: "scam" or "legit" (defaults to the current run's type)
+            previous_text: Preceding dialogue text for request stitching
+            next_text: Following dialogue text for request stitching
             
         Returns:
             Audio file info dictionary or None if generation failed
@@ -466,15 +961,17 @@ class VoiceSynthesizer:
             return None
         
         # Enhance text with audio tags if enabled
-        enhanced_text = self._enhance_text_with_tags(text, role, turn_position)
+        enhanced_text, audio_tags = self._enhance_text_with_tags(
+            text, role, turn_position, conversation_type or self.current_conversation_type
+        )
         
         # Generate filename with correct extension based on format
-        file_extension = self._get_file_extension_from_format(self.config.voice_output_format)
+        file_extension = self._get_file_extension_from_format(self.output_format)
         filename = f"turn_{sent_id:02d}_{role}.{file_extension}"
         filepath = conv_dir / filename
         
-        # Skip if file already exists
-        if filepath.exists():
+        # Skip if the manifest says the file was already produced
+        if self._artifact_exists(conv_dir, filepath):
             self.clogger.progress_write(f"Skipping existing file: {filename}")
             return {
                 "turn_id": sent_id,
@@ -486,28 +983,19 @@ class VoiceSynthesizer:
             }
         
         try:
-            # Build enhanced voice settings
-            voice_settings = self._build_voice_settings()
-            
-            # Use configured output format
-            output_format = self.config.voice_output_format
-            
-            # Use the enhanced ElevenLabs SDK client
-            audio_generator = self.client.text_to_speech.convert(
-                text=enhanced_text,
-                voice_id=voice_id,
-                model_id=self.model_id,
-                voice_settings=voice_settings,
-                output_format=output_format
-            )
-            
-            # Collect audio bytes
-            audio_bytes = b""
-            async for chunk in audio_generator:
-                audio_bytes += chunk
+            try:
+                audio_bytes = await self.backend.synthesize(
+                    enhanced_text, voice_id, self.output_format,
+                    previous_text=previous_text, next_text=next_text
+                )
+            except Exception:
+                self._record_voice_result(voice_id, False)
+                raise
+            self._record_voice_result(voice_id, True)
             
             # Save audio file (run in thread to not block)
             await asyncio.to_thread(self._save_audio_file, filepath, audio_bytes)
+            await asyncio.to_thread(self._record_artifact, conv_dir, filepath, sent_id)
             
             self.clogger.progress_write(f"Generated: {filename}")
             
@@ -518,27 +1006,59 @@ class VoiceSynthesizer:
                 "enhanced_text": enhanced_text,
                 "voice_id": voice_id,
                 "filename": filename,
-                "audio_tags_used": self._get_last_used_tags()
+                "audio_tags_used": audio_tags
             }
                     
         except Exception as e:
             # Don't log here, let retry handler manage logging
             raise e
     
+    def _record_voice_result(self, voice_id: str, ok: bool):
+        """
+        Report a TTS request outcome to the voice scheduler.
+        
+        Args:
+            voice_id: Voice used for the request
+            ok: Whether the request succeeded
+        """
+        if self.voice_scheduler:
+            self.voice_scheduler.record_result(voice_id, ok)
+    
     def _save_audio_file(self, filepath: Path, audio_bytes: bytes):
         """
         Save audio bytes to file.
         
+        Raw PCM output is wrapped in a WAV header so .wav turn files are readable.
+        
         Args:
             filepath: Path to save the file
             audio_bytes: Audio data
         """
+        if filepath.suffix.lower() == '.wav' and not audio_bytes.startswith(b'RIFF'):
+            samples = np.frombuffer(audio_bytes, dtype='<i2')
+            self._write_turn_wav(filepath, samples, sample_rate_from_format(self.output_format))
+            return
+        
+        # Encoded turns are indexed by the combiner, which decodes them anyway
         with open(filepath, 'wb') as f:
             f.write(audio_bytes)
     
+    def _write_turn_wav(self, filepath: Path, samples: np.ndarray, sample_rate: int):
+        """
+        Write a PCM turn file and record its duration and loudness in the audio index.
+        
+        Args:
+            filepath: Turn file path inside a conversation directory
+            samples: int16 samples
+            sample_rate: Sample rate in Hz
+        """
+        write_wav(filepath, samples, sample_rate)
+        get_audio_index(filepath.parent.parent).record(filepath, samples, sample_rate)
+    
     def _save_metadata(self, conv_dir: Path, conversation_id: int,
                       caller_voice: str, callee_voice: str,
-                      audio_files: List[Dict], processed_path: Optional[Path]):
+                      audio_files: List[Dict], processed_path: Optional[Path],
+                      tts_requests: Optional[int] = None):
         """
         Save conversation metadata.
         
@@ -549,6 +1069,7 @@ class VoiceSynthesizer:
             callee_voice: Callee voice ID
             audio_files: List of audio file info
             processed_path: Path to processed audio file
+            tts_requests: Number of TTS requests planned for the conversation
         """
         metadata = {
             "conversation_id": conversation_id,
@@ -558,7 +1079,10 @@ class VoiceSynthesizer:
             "combined_audio_file": processed_path.name if processed_path else None,
             "model_used": self.model_id,
             "audio_tags_enabled": self.config.use_audio_tags and self.is_v3_model,
-            "output_format": self.config.voice_output_format
+            "output_format": self.output_format,
+            "tts_backend": self.backend_name,
+            "batch_mode": self.batch_mode,
+            "tts_requests": tts_requests
         }
         
         metadata_file = conv_dir / "metadata.json"
@@ -575,6 +1099,12 @@ class VoiceSynthesizer:
         Returns:
             Dictionary mapping conversation IDs to lists of missing turn IDs
         """
+        # One manifest read instead of opening every metadata.json; conversations
+        # stopped before their outcome was recorded still have a queued/started row
+        manifest = get_artifact_manifest(output_dir)
+        if manifest.exists:
+            return manifest.incomplete_conversations()
+        
         incomplete_conversations = {}
         
         for conv_dir in sorted(output_dir.glob("conversation_*")):
@@ -604,60 +1134,39 @@ class VoiceSynthesizer:
         
         return incomplete_conversations
     
-    def _enhance_text_with_tags(self, text: str, role: str, turn_position: str) -> str:
+    def _enhance_text_with_tags(self, text: str, role: str, turn_position: str,
+                                conversation_type: Optional[str]) -> Tuple[str, List[str]]:
         """
         Enhance text with audio tags based on context.
         
+        Returns the tags alongside the text instead of storing them on the
+        synthesizer, so concurrent turns cannot see each other's tags.
+        
         Args:
             text: Original text
             role: Speaker role (caller/callee)
             turn_position: Position in conversation
+            conversation_type: "scam" or "legit"
             
         Returns:
-            Enhanced text with audio tags
+            Tuple of (enhanced text, audio tags used)
         """
         # Audio tags only work with v3 models
-        if not self.is_v3_model or not self.config.use_audio_tags or not self.current_conversation_type:
-            return text
+        if not self.is_v3_model or not self.config.use_audio_tags or not conversation_type:
+            return text, []
         
-        # Get contextual tags
-        tags = self.audio_tag_manager.get_contextual_tags(
-            conversation_type=self.current_conversation_type,
+        enhanced_text, tags = self.audio_tag_manager.enhance_text(
+            text,
+            conversation_type=conversation_type,
             turn_position=turn_position,
-            role=role,
-            text_content=text
+            role=role
         )
         
-        # Store tags for metadata
-        self._last_used_tags = tags
-        
-        # Format text with tags
-        enhanced_text = self.audio_tag_manager.format_text_with_tags(text, tags)
-        
         # Log tag usage in verbose mode
         if self.config.verbose and tags:
             self.clogger.info(f"Applied tags {tags} to {role} text: '{text[:50]}...'")
         
-        return enhanced_text
-    
-    def _build_voice_settings(self) -> Dict:
-        """
-        Build voice settings from configuration.
-        
-        Returns:
-            Voice settings dictionary
-        """
-        settings = {
-            "stability": self.config.voice_stability,
-            "similarity_boost": self.config.voice_similarity_boost,
-            "speaker_boost": self.config.voice_speaker_boost
-        }
-        
-        # Add style setting for v3 models
-        if self.is_v3_model:
-            settings["style"] = self.config.voice_style
-        
-        return settings
+        return enhanced_text, tags
     
     def _get_file_extension_from_format(self, format_str: str) -> str:
         """
@@ -681,12 +1190,3 @@ class VoiceSynthesizer:
         else:
             # Default to mp3 for unknown formats
             return 'mp3'
-    
-    def _get_last_used_tags(self) -> List[str]:
-        """
-        Get the last used audio tags for metadata.
-        
-        Returns:
-            List of last used tags
-        """
-        return getattr(self, '_last_used_tags', [])
\ No newline at end of file
@@ -4,6 +4,7 @@ ElevenLabs voice ID validation utility with both async and sync support.
 
 import asyncio
 import logging
+from pathlib import Path
 from typing import List, Dict, Set, Optional, Tuple
 from dataclasses import dataclass
 
@@ -13,6 +14,8 @@ from tts.models import (
     VoiceInfo, VoiceValidationResult, VoiceDiscoveryFilter, 
     VoiceSuggestion, LocaleVoiceStatus, ValidationSummary
 )
+from tts.voice_catalog import VoiceCatalog, DEFAULT_TTL_HOURS, voice_attribute
+from tts.voice_query import VoiceQueryEngine
 
 logger = logging.getLogger(__name__)
 
@@ -23,13 +26,17 @@ class VoiceValidator:
     Supports both async and synchronous operations.
     """
     
-    def __init__(self, api_key: str, verbose: bool = False):
+    def __init__(self, api_key: str, verbose: bool = False,
+                 catalog_dir: Optional[Path] = None,
+                 catalog_ttl_hours: float = DEFAULT_TTL_HOURS):
         """
         Initialize the voice validator.
         
         Args:
             api_key: ElevenLabs API key
             verbose: Whether to show verbose output
+            catalog_dir: Directory for the persistent voice catalog
+            catalog_ttl_hours: Hours before the persistent catalog is refreshed
         """
         self.api_key = api_key
         self.async_client = AsyncElevenLabs(api_key=api_key)
@@ -37,6 +44,9 @@ class VoiceValidator:
         self.base_url = "https://api.elevenlabs.io/v1"  # Keep for backwards compatibility
         self._voice_cache: Dict[str, VoiceValidationResult] = {}
         self._all_voices_cache: Optional[Dict[str, VoiceInfo]] = None
+        self.catalog = VoiceCatalog.for_api_key(api_key, catalog_dir, catalog_ttl_hours)
+        self._query_engine: Optional[VoiceQueryEngine] = None
+        self._query_engine_etag: Optional[str] = None
         self.clogger = ConditionalLogger(__name__, verbose)
     
     async def validate_voice_ids(self, voice_ids: List[str]) -> List[VoiceValidationResult]:
@@ -58,9 +68,16 @@ class VoiceValidator:
         cached_results = []
         uncached_ids = []
         
+        catalog_fresh = self.catalog.is_fresh
         for voice_id in voice_ids:
             if voice_id in self._voice_cache:
                 cached_results.append(self._voice_cache[voice_id])
+            elif catalog_fresh and self.catalog.get(voice_id):
+                # Warm persistent catalog: no network call needed
+                voice_info = self.catalog.get(voice_id)
+                result = VoiceValidationResult(voice_id, True, voice_info.name, voice_info=voice_info)
+                self._voice_cache[voice_id] = result
+                cached_results.append(result)
             else:
                 uncached_ids.append(voice_id)
         
@@ -109,36 +126,63 @@ class VoiceValidator:
     
     async def get_available_voices(self) -> List[Dict]:
         """
-        Get all available voices from ElevenLabs API using SDK.
+        Get all available voices, served from the persistent catalog when fresh.
         
         Returns:
             List of voice information dictionaries
         """
-        try:
-            voices_response = await self.async_client.voices.get_all()
-            voices = []
-            
-            if hasattr(voices_response, 'voices'):
-                for voice in voices_response.voices:
-                    voice_dict = {
-                        'voice_id': voice.voice_id,
-                        'name': voice.name,
-                        'category': getattr(voice, 'category', 'unknown'),
-                        'description': getattr(voice, 'description', ''),
-                        'preview_url': getattr(voice, 'preview_url', None),
-                        'labels': getattr(voice, 'labels', {})
-                    }
-                    voices.append(voice_dict)
-                
-                self.clogger.info(f"Retrieved {len(voices)} available voices")
-                return voices
-            else:
-                self.clogger.error("Unexpected response format from voices API")
-                return []
+        if not self.catalog.is_fresh:
+            try:
+                voices_response = await self.async_client.voices.get_all()
                 
-        except Exception as e:
-            self.clogger.error(f"Exception getting available voices: {e}")
-            return []
+                if hasattr(voices_response, 'voices'):
+                    self.catalog.update([self._to_voice_info(voice) for voice in voices_response.voices])
+                    self._all_voices_cache = None
+                else:
+                    self.clogger.error("Unexpected response format from voices API")
+                    return []
+                    
+            except Exception as e:
+                self.clogger.error(f"Exception getting available voices: {e}")
+                if not self.catalog.voices:
+                    return []
+                self.clogger.warning("Using stale voice catalog")
+        
+        voices = [
+            {
+                'voice_id': voice.voice_id,
+                'name': voice.name,
+                'category': voice.category,
+                'description': voice.description,
+                'preview_url': voice.preview_url,
+                'labels': voice.labels or {}
+            }
+            for voice in self.catalog.voices.values()
+        ]
+        self.clogger.info(f"Retrieved {len(voices)} available voices")
+        return voices
+    
+    def _to_voice_info(self, voice_data) -> VoiceInfo:
+        """
+        Convert an SDK voice object into a VoiceInfo.
+        
+        Args:
+            voice_data: Voice object returned by the ElevenLabs SDK
+            
+        Returns:
+            VoiceInfo instance
+        """
+        labels = getattr(voice_data, 'labels', None) or {}
+        return VoiceInfo(
+            voice_id=voice_data.voice_id,
+            name=voice_data.name,
+            category=getattr(voice_data, 'category', 'unknown'),
+            description=getattr(voice_data, 'description', ''),
+            preview_url=getattr(voice_data, 'preview_url', None),
+            labels=dict(labels),
+            language=labels.get('language'),
+            accent=labels.get('accent')
+        )
     
     def get_invalid_voices(self, results: List[VoiceValidationResult]) -> List[VoiceValidationResult]:
         """
@@ -168,6 +212,8 @@ class VoiceValidator:
         """Clear the voice validation cache."""
         self._voice_cache.clear()
         self._all_voices_cache = None
+        self._query_engine = None
+        self.catalog.invalidate()
         self.clogger.debug("Voice validation cache cleared")
     
     # Synchronous Methods for CLI and Testing
@@ -205,7 +251,7 @@ class VoiceValidator:
     
     def get_all_voices_sync(self) -> Dict[str, VoiceInfo]:
         """
-        Synchronously fetch all available voices from ElevenLabs API using SDK.
+        Synchronously get all available voices, using the persistent catalog when fresh.
         
         Returns:
             Dictionary mapping voice_id to VoiceInfo objects
@@ -213,34 +259,30 @@ class VoiceValidator:
         if self._all_voices_cache is not None:
             return self._all_voices_cache
         
+        if self.catalog.is_fresh:
+            self.clogger.info(f"Using cached voice catalog ({len(self.catalog.voices)} voices)")
+            self._all_voices_cache = self.catalog.voices
+            return self._all_voices_cache
+        
         self.clogger.info("Fetching all voices from ElevenLabs API (sync)...")
         
         try:
             voices_response = self.sync_client.voices.get_all()
-            voices = {}
             
             if hasattr(voices_response, 'voices'):
-                for voice_data in voices_response.voices:
-                    voice_info = VoiceInfo(
-                        voice_id=voice_data.voice_id,
-                        name=voice_data.name,
-                        category=getattr(voice_data, 'category', 'unknown'),
-                        description=getattr(voice_data, 'description', ''),
-                        preview_url=getattr(voice_data, 'preview_url', None),
-                        labels=getattr(voice_data, 'labels', {}),
-                        language=getattr(voice_data, 'labels', {}).get('language') if hasattr(voice_data, 'labels') else None,
-                        accent=getattr(voice_data, 'labels', {}).get('accent') if hasattr(voice_data, 'labels') else None
-                    )
-                    voices[voice_info.voice_id] = voice_info
-                
-                self._all_voices_cache = voices
-                self.clogger.info(f"Fetched {len(voices)} voices from ElevenLabs API")
-                return voices
+                self.catalog.update([self._to_voice_info(voice) for voice in voices_response.voices])
+                self._all_voices_cache = self.catalog.voices
+                self.clogger.info(f"Fetched {len(self._all_voices_cache)} voices from ElevenLabs API")
+                return self._all_voices_cache
             else:
                 self.clogger.error("Unexpected response format from voices API")
                 raise RuntimeError("Failed to fetch voices: unexpected response format")
             
         except Exception as e:
+            if self.catalog.voices:
+                self.clogger.warning(f"Error fetching voices ({e}), using stale voice catalog")
+                self._all_voices_cache = self.catalog.voices
+                return self._all_voices_cache
             self.clogger.error(f"Error fetching voices from ElevenLabs API: {e}")
             raise
     
@@ -260,13 +302,27 @@ class VoiceValidator:
     
     # Voice Discovery and Suggestion Methods
     
+    def get_query_engine(self) -> VoiceQueryEngine:
+        """
+        Get the voice query engine, rebuilding it only when the catalog changes.
+        
+        Returns:
+            VoiceQueryEngine over the current voice catalog
+        """
+        all_voices = self.get_all_voices_sync()
+        if self._query_engine is None or self._query_engine_etag != self.catalog.etag:
+            indexes = self.catalog.indexes if all_voices is self.catalog.voices else None
+            self._query_engine = VoiceQueryEngine(all_voices, indexes)
+            self._query_engine_etag = self.catalog.etag
+        return self._query_engine
+    
     def find_compatible_voices(
         self, 
         filter_criteria: VoiceDiscoveryFilter, 
         limit: int = 10
     ) -> List[VoiceInfo]:
         """
-        Find voices that match the given criteria.
+        Find voices that match the given criteria, best-ranked first.
         
         Args:
             filter_criteria: Criteria for filtering voices
@@ -275,48 +331,8 @@ class VoiceValidator:
         Returns:
             List of matching VoiceInfo objects
         """
-        all_voices = self.get_all_voices_sync()
-        compatible_voices = []
-        
-        for voice_info in all_voices.values():
-            # Skip excluded voices
-            if (filter_criteria.exclude_voice_ids and 
-                voice_info.voice_id in filter_criteria.exclude_voice_ids):
-                continue
-            
-            # Check language match
-            if (filter_criteria.language and 
-                voice_info.language != filter_criteria.language):
-                continue
-            
-            # Check accent match
-            if (filter_criteria.accent and 
-                voice_info.accent != filter_criteria.accent):
-                continue
-            
-            # Check category match
-            if (filter_criteria.category and 
-                voice_info.category != filter_criteria.category):
-                continue
-            
-            # Check gender match (extracted from labels)
-            if filter_criteria.gender:
-                voice_gender = voice_info.labels.get('gender') if voice_info.labels else None
-                if voice_gender != filter_criteria.gender:
-                    continue
-            
-            # Check age match (extracted from labels)
-            if filter_criteria.age:
-                voice_age = voice_info.labels.get('age') if voice_info.labels else None
-                if voice_age != filter_criteria.age:
-                    continue
-            
-            compatible_voices.append(voice_info)
-            
-            if len(compatible_voices) >= limit:
-                break
-        
-        return compatible_voices
+        ranked = self.get_query_engine().query(filter_criteria, limit=limit)
+        return [voice_info for voice_info, _ in ranked]
     
     def suggest_voices_for_locale(
         self, 
@@ -328,6 +344,9 @@ class VoiceValidator:
         """
         Suggest additional voices for a locale that needs more voice IDs.
         
+        Candidates are ranked to favour the gender that is least represented
+        among the locale's current voices, so caller and callee can differ.
+        
         Args:
             locale_id: Locale identifier
             language_code: Language code for the locale
@@ -337,20 +356,33 @@ class VoiceValidator:
         Returns:
             List of voice suggestions
         """
+        engine = self.get_query_engine()
+        
         filter_criteria = VoiceDiscoveryFilter(
             language=language_code,
             exclude_voice_ids=current_voice_ids
         )
         
-        compatible_voices = self.find_compatible_voices(
-            filter_criteria, 
-            limit=needed_count * 3  # Get more options than needed
-        )
+        preferences = {}
+        current_genders = [
+            voice_attribute(engine.voices[voice_id], 'gender')
+            for voice_id in current_voice_ids if voice_id in engine.voices
+        ]
+        if current_genders:
+            male_count = current_genders.count('male')
+            female_count = current_genders.count('female')
+            if male_count != female_count:
+                preferences['gender'] = 'female' if male_count > female_count else 'male'
+        
+        ranked = engine.query(filter_criteria, limit=needed_count, preferences=preferences)
+        max_score = engine.max_score(preferences) or 1.0
         
         suggestions = []
-        for i, voice_info in enumerate(compatible_voices[:needed_count]):
-            confidence = max(0.5, 1.0 - (i * 0.1))  # Decrease confidence for later suggestions
+        for voice_info, score in ranked:
+            confidence = max(0.5, min(1.0, score / max_score))
             reason = f"Compatible {language_code} voice with {voice_info.accent or 'standard'} accent"
+            if preferences.get('gender') and voice_attribute(voice_info, 'gender') == preferences['gender']:
+                reason += f", balances locale with a {preferences['gender']} voice"
             
             suggestion = VoiceSuggestion(
                 voice_id=voice_info.voice_id,
@@ -0,0 +1,373 @@
+"""
+SQLite-backed job queue for running the TTS stage on several worker processes.
+"""
+
+import json
+import time
+import sqlite3
+import logging
+import functools
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+# Queue database kept next to the run's output by default
+QUEUE_FILENAME = "tts_queue.sqlite"
+
+# Job kinds: one per planned TTS request, plus one per conversation to combine and process
+REQUEST_JOB = "request"
+FINALIZE_JOB = "finalize"
+
+# Seconds to wait for another process holding the write lock
+BUSY_TIMEOUT_SECONDS = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    conv_key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    conv_key TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    request_index INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL,
+    UNIQUE (conv_key, kind, request_index)
+);
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, available_at);
+CREATE INDEX IF NOT EXISTS jobs_by_conversation ON jobs (conv_key, kind);
+"""
+
+# Condition (id, owner, attempts) that a lease is still held by the caller; a job
+# re-leased after expiry has a new attempt count, so stale acks match nothing
+_LEASE_HELD = "id = ? AND status = 'leased' AND lease_owner = ? AND attempts = ?"
+
+
+def _locked(method):
+    """Serialize calls on the queue's connection, which worker threads share."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+@dataclass
+class Job:
+    """
+    A leased job.
+
+    Attributes:
+        id: Job row ID
+        conv_key: Conversation the job belongs to
+        kind: REQUEST_JOB or FINALIZE_JOB
+        request_index: Position of the request in the conversation plan
+        payload: Job parameters
+        attempts: Number of leases so far, including this one
+        lease_owner: Worker holding the lease
+    """
+    id: int
+    conv_key: str
+    kind: str
+    request_index: int
+    payload: Dict
+    attempts: int
+    lease_owner: str
+
+
+class TTSWorkQueue:
+    """
+    Durable job queue shared by a coordinator and any number of worker processes.
+
+    Jobs are leased for a visibility timeout. A job whose lease runs out without
+    an ack becomes available again, so work held by a crashed or stalled worker
+    is picked up by another one. Failed jobs are retried with exponential backoff
+    until max_attempts, then marked failed. Acking the last request job of a
+    conversation enqueues its finalize job in the same transaction, so exactly
+    one worker combines and processes each conversation.
+
+    All state lives in one SQLite database in WAL mode. Workers on other hosts
+    can share it only over storage with working file locks.
+    """
+
+    def __init__(self, path: Path, visibility_timeout: float = 300.0, max_attempts: int = 3):
+        """
+        Open (and create if needed) a queue database.
+
+        Args:
+            path: SQLite database file
+            visibility_timeout: Seconds a lease lasts before the job is handed out again
+            max_attempts: Leases per job before it is marked failed
+        """
+        self.path = Path(path)
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @_locked
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+
+    def _transaction(self):
+        """Start a write transaction that holds the lock from the first statement."""
+        self._conn.execute("BEGIN IMMEDIATE")
+
+    @_locked
+    def enqueue_conversation(self, conv_key: str, payload: Dict, requests: Iterable[Dict]) -> int:
+        """
+        Add a conversation and its TTS request jobs.
+
+        Enqueuing the same conversation again is a no-op, so a coordinator can be
+        re-run against an existing queue to resume.
+
+        Args:
+            conv_key: Unique conversation key (output directory and ID)
+            payload: Conversation data the workers need
+            requests: Job payload per planned TTS request, in order
+
+        Returns:
+            Number of jobs added
+        """
+        now = time.time()
+        self._transaction()
+        try:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO conversations (conv_key, payload) VALUES (?, ?)",
+                (conv_key, json.dumps(payload, ensure_ascii=False))
+            )
+            added = 0
+            for request_index, request in enumerate(requests):
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO jobs (conv_key, kind, request_index, payload, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (conv_key, REQUEST_JOB, request_index, json.dumps(request, ensure_ascii=False), now)
+                )
+                added += cursor.rowcount
+            self._conn.execute("COMMIT")
+            return added
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    @_locked
+    def conversation(self, conv_key: str) -> Dict:
+        """
+        Conversation payload stored by the coordinator.
+
+        Args:
+            conv_key: Conversation key
+
+        Returns:
+            Payload dictionary
+        """
+        row = self._conn.execute(
+            "SELECT payload FROM conversations WHERE conv_key = ?", (conv_key,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown conversation {conv_key}")
+        return json.loads(row[0])
+
+    @_locked
+    def lease(self, worker_id: str, limit: int = 1) -> List[Job]:
+        """
+        Lease up to limit available jobs.
+
+        Jobs whose lease expired after their last attempt are marked failed
+        instead of being handed out again.
+
+        Args:
+            worker_id: Unique worker name, stored as the lease owner
+            limit: Maximum number of jobs
+
+        Returns:
+            Leased jobs (possibly empty)
+        """
+        now = time.time()
+        self._transaction()
+        try:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'lease expired', updated_at = ? "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, now, self.max_attempts)
+            )
+            rows = self._conn.execute(
+                "SELECT id, conv_key, kind, request_index, payload, attempts FROM jobs "
+                "WHERE (status = 'pending' AND available_at <= ?) "
+                "OR (status = 'leased' AND lease_expires < ?) "
+                "ORDER BY kind = ? DESC, id LIMIT ?",
+                (now, now, FINALIZE_JOB, limit)
+            ).fetchall()
+            jobs = []
+            for job_id, conv_key, kind, request_index, payload, attempts in rows:
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'leased', attempts = ?, lease_owner = ?, "
+                    "lease_expires = ?, updated_at = ? WHERE id = ?",
+                    (attempts + 1, worker_id, now + self.visibility_timeout, now, job_id)
+                )
+                jobs.append(Job(job_id, conv_key, kind, request_index, json.loads(payload), attempts + 1, worker_id))
+            self._conn.execute("COMMIT")
+            return jobs
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    @_locked
+    def heartbeat(self, job: Job) -> bool:
+        """
+        Extend a lease by another visibility timeout.
+
+        Args:
+            job: Leased job
+
+        Returns:
+            False if the lease was lost to another worker
+        """
+        now = time.time()
+        cursor = self._conn.execute(
+            f"UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE {_LEASE_HELD}",
+            (now + self.visibility_timeout, now, job.id, job.lease_owner, job.attempts)
+        )
+        return cursor.rowcount == 1
+
+    @_locked
+    def ack(self, job: Job, result=None) -> bool:
+        """
+        Mark a job done and store its result.
+
+        Acking the last outstanding request job of a conversation enqueues the
+        conversation's finalize job.
+
+        Args:
+            job: Leased job
+            result: JSON-serializable result
+
+        Returns:
+            False if the lease had expired and was taken by another worker; the
+            result is discarded in that case
+        """
+        now = time.time()
+        self._transaction()
+        try:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET status = 'done', result = ?, error = NULL, lease_expires = NULL, "
+                f"updated_at = ? WHERE {_LEASE_HELD}",
+                (json.dumps(result, ensure_ascii=False), now, job.id, job.lease_owner, job.attempts)
+            )
+            if cursor.rowcount != 1:
+                self._conn.execute("ROLLBACK")
+                return False
+
+            if job.kind == REQUEST_JOB:
+                outstanding = self._conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE conv_key = ? AND kind = ? AND status != 'done'",
+                    (job.conv_key, REQUEST_JOB)
+                ).fetchone()[0]
+                if outstanding == 0:
+                    self._conn.execute(
+                        "INSERT OR IGNORE INTO jobs (conv_key, kind, request_index, payload, updated_at) "
+                        "VALUES (?, ?, 0, '{}', ?)",
+                        (job.conv_key, FINALIZE_JOB, now)
+                    )
+            self._conn.execute("COMMIT")
+            return True
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    @_locked
+    def nack(self, job: Job, error: str) -> str:
+        """
+        Report a failed attempt.
+
+        The job is retried after 2^(attempts - 1) seconds, or marked failed once
+        it has used max_attempts.
+
+        Args:
+            job: Leased job
+            error: Error message to store
+
+        Returns:
+            New job status: "pending", "failed", or "lost" if the lease had expired
+        """
+        now = time.time()
+        status = "failed" if job.attempts >= self.max_attempts else "pending"
+        cursor = self._conn.execute(
+            f"UPDATE jobs SET status = ?, error = ?, available_at = ?, lease_expires = NULL, "
+            f"updated_at = ? WHERE {_LEASE_HELD}",
+            (status, error[:500], now + 2 ** (job.attempts - 1), now, job.id, job.lease_owner, job.attempts)
+        )
+        return status if cursor.rowcount == 1 else "lost"
+
+    @_locked
+    def request_results(self, conv_key: str) -> List[Tuple[int, Optional[str], object]]:
+        """
+        Results of a conversation's request jobs in plan order.
+
+        Args:
+            conv_key: Conversation key
+
+        Returns:
+            List of (request index, status, result) tuples
+        """
+        rows = self._conn.execute(
+            "SELECT request_index, status, result FROM jobs WHERE conv_key = ? AND kind = ? "
+            "ORDER BY request_index",
+            (conv_key, REQUEST_JOB)
+        ).fetchall()
+        return [(index, status, json.loads(result) if result else None) for index, status, result in rows]
+
+    @_locked
+    def counts(self) -> Dict[str, int]:
+        """
+        Number of jobs per status.
+
+        Returns:
+            Dictionary mapping status to job count
+        """
+        rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    @_locked
+    def is_drained(self) -> bool:
+        """Whether no job is pending or leased."""
+        row = self._conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN ('pending', 'leased')"
+        ).fetchone()
+        return row[0] == 0
+
+    @_locked
+    def next_available_in(self) -> Optional[float]:
+        """
+        Seconds until the next pending job or lease expiry, for idle workers.
+
+        Returns:
+            Delay in seconds (0 if a job is available now) or None if drained
+        """
+        row = self._conn.execute(
+            "SELECT MIN(CASE WHEN status = 'pending' THEN available_at ELSE lease_expires END) "
+            "FROM jobs WHERE status IN ('pending', 'leased')"
+        ).fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - time.time())
@@ -0,0 +1,106 @@
+"""
+Compiled placeholder substitution shared by translation and generation.
+"""
+
+import re
+import random
+import logging
+from typing import Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+# Joins the turns of a conversation so one regex pass covers all of them
+TURN_SEPARATOR = "\x1f"
+
+
+class PlaceholderEngine:
+    """
+    Fills placeholders ("{00001}" codes or "<tag>" names) from a fixed map.
+
+    The map is compiled once: every key becomes its own capturing group in a
+    single alternation regex, and substitutions are stored in a list indexed
+    by group number, so a match resolves to its candidates without any dict
+    lookups. All turns of a conversation are filled in one pass, and each
+    placeholder keeps the same value across the conversation. Choices come
+    from an RNG seeded with the engine seed and the conversation key, so
+    output does not depend on the order conversations finish in.
+    """
+
+    def __init__(self, substitutions: Dict[str, List[str]], seed: Optional[int] = None):
+        """
+        Compile a placeholder map.
+
+        Args:
+            substitutions: Mapping of placeholder keys to candidate values
+            seed: Base seed for reproducible choices (None for unseeded)
+        """
+        self.keys: List[str] = [key for key, values in substitutions.items() if values]
+        self.substitutions: List[List[str]] = [list(substitutions[key]) for key in self.keys]
+        self.seed = seed
+        # Longest keys first so a key never loses to one of its prefixes
+        order = sorted(range(len(self.keys)), key=lambda index: len(self.keys[index]), reverse=True)
+        self._group_to_index = order
+        self._pattern = re.compile("|".join(f"({re.escape(self.keys[index])})" for index in order)) if order else None
+
+    @classmethod
+    def from_code_map(cls, placeholder_map: Dict[str, Dict], seed: Optional[int] = None) -> "PlaceholderEngine":
+        """
+        Build an engine from a translation placeholder map ({"{00001}": {"substitutions": [...]}}).
+
+        Args:
+            placeholder_map: Mapping of codes to entries with substitutions
+            seed: Base seed for reproducible choices
+
+        Returns:
+            Compiled engine
+        """
+        return cls({code: entry.get('substitutions', []) for code, entry in placeholder_map.items()}, seed)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def rng_for(self, conversation_key) -> random.Random:
+        """
+        RNG for one conversation.
+
+        Args:
+            conversation_key: Conversation ID or other stable key
+
+        Returns:
+            Random instance seeded from the engine seed and the key (unseeded without an engine seed)
+        """
+        if self.seed is None:
+            return random.Random()
+        return random.Random(f"{self.seed}:{conversation_key}")
+
+    def fill_conversation(self, texts: List[str], conversation_key=None) -> List[str]:
+        """
+        Fill placeholders in all turns of a conversation in one pass.
+
+        Args:
+            texts: Turn texts
+            conversation_key: Stable key for the seeded RNG (e.g. conversation ID)
+
+        Returns:
+            Turn texts with known placeholders replaced; unknown ones are left as is
+        """
+        if not self._pattern or not texts:
+            return list(texts)
+        rng = self.rng_for(conversation_key)
+        chosen: List[Optional[str]] = [None] * len(self.keys)
+        group_to_index = self._group_to_index
+        substitutions = self.substitutions
+
+        def replace(match):
+            index = group_to_index[match.lastindex - 1]
+            value = chosen[index]
+            if value is None:
+                value = chosen[index] = rng.choice(substitutions[index])
+            return value
+
+        if any(TURN_SEPARATOR in text for text in texts):
+            return [self._pattern.sub(replace, text) for text in texts]
+        joined = TURN_SEPARATOR.join(texts)
+        return self._pattern.sub(replace, joined).split(TURN_SEPARATOR)
@@ -23,7 +23,8 @@ from cli.commands import (
     validate_voices,
     show_pipeline_steps,
     ensure_minimum_voices,
-    suggest_voices_for_locale
+    suggest_voices_for_locale,
+    run_tts_worker
 )
 from cli.utils import setup_logging, print_banner
 from cli.ui import InteractiveUI
@@ -47,6 +48,7 @@ Examples:
   %(prog)s --validate-all-voices                # Validate all voice IDs across all locales
   %(prog)s --ensure-minimum-voices              # Check all locales have ≥2 voices
   %(prog)s --suggest-voices ar-sa               # Get voice suggestions for Arabic Saudi
+  %(prog)s --locale ms-my --tts-worker output/ms-my/0909_2040/tts_queue.sqlite  # Drain a shared TTS queue
         """
     )
     
@@ -124,6 +126,13 @@ Examples:
         help='Suggest additional voices for a specific locale (e.g., ar-sa, ja-jp)'
     )
     
+    parser.add_argument(
+        '--tts-worker',
+        type=str,
+        metavar='QUEUE',
+        help='Run a TTS worker that drains a queue database created by a queued tts step (requires --locale)'
+    )
+    
     parser.add_argument(
         '--show-steps',
         action='store_true',
@@ -303,6 +312,11 @@ Examples:
     if args.show_steps:
         return show_pipeline_steps()
     
+    if args.tts_worker:
+        if not args.locale:
+            parser.error("--tts-worker requires --locale")
+        return run_tts_worker(args.locale, args.tts_worker, args.config_dir, args.output_dir, args.verbose)
+    
     # Determine which identifier to use
     if not args.locale:
         parser.error("--locale is required to run the pipeline. Use --help for more information.")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Audio Combiner Benchmark
+
+Compares the legacy pydub concatenation path of AudioCombiner against the
+NumPy single-buffer path on synthetic 24-turn conversations.
+"""
+
+import argparse
+import sys
+import os
+import time
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add doc and doc/src to Python path (package code lives under doc/src)
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(repo_root, 'doc'))
+sys.path.insert(0, os.path.join(repo_root, 'doc', 'src'))
+
+from tts.audio_combiner import AudioCombiner
+from tts.audio_io import write_wav
+
+
+def create_conversation(conv_dir: Path, num_turns: int, sample_rate: int, rng: np.random.Generator):
+    """
+    Write synthetic turn files that look like TTS output.
+
+    Args:
+        conv_dir: Directory to write turn files into
+        num_turns: Number of turns
+        sample_rate: Sample rate of the turn files
+        rng: Random generator
+    """
+    conv_dir.mkdir(parents=True, exist_ok=True)
+    for turn in range(1, num_turns + 1):
+        duration = rng.uniform(2.0, 8.0)
+        t = np.arange(int(duration * sample_rate)) / sample_rate
+        tone = 0.3 * np.sin(2 * np.pi * rng.uniform(120, 300) * t) + 0.02 * rng.standard_normal(len(t))
+        role = "caller" if turn % 2 else "callee"
+        write_wav(conv_dir / f"turn_{turn:02d}_{role}.wav", tone, sample_rate)
+
+
+def time_backend(backend: str, conv_dirs, sample_rate: int) -> float:
+    """
+    Combine every conversation with the given backend.
+
+    Args:
+        backend: "numpy" or "pydub"
+        conv_dirs: Conversation directories to combine
+        sample_rate: Sample rate of the turn files
+
+    Returns:
+        Elapsed wall time in seconds
+    """
+    config = SimpleNamespace(
+        verbose=False,
+        voice_output_format=f"pcm_{sample_rate}",
+        silence_duration_ms=500,
+        audio_combiner_backend=backend
+    )
+    combiner = AudioCombiner(config)
+
+    start = time.perf_counter()
+    for conversation_id, conv_dir in enumerate(conv_dirs, start=1):
+        if combiner.combine_conversation(conv_dir, conversation_id) is None:
+            raise RuntimeError(f"{backend} backend failed on {conv_dir}")
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AudioCombiner backends")
+    parser.add_argument("--conversations", type=int, default=10, help="Number of conversations")
+    parser.add_argument("--turns", type=int, default=24, help="Turns per conversation")
+    parser.add_argument("--sample-rate", type=int, default=44100, help="Turn sample rate")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conv_dirs = [Path(tmp) / f"conversation_{i:03d}" for i in range(1, args.conversations + 1)]
+        for conv_dir in conv_dirs:
+            create_conversation(conv_dir, args.turns, args.sample_rate, rng)
+
+        print("\n" + "="*80)
+        print("AUDIO COMBINER BENCHMARK")
+        print("="*80)
+        print(f"{args.conversations} conversations x {args.turns} turns @ {args.sample_rate} Hz\n")
+
+        results = {}
+        for backend in ("pydub", "numpy"):
+            elapsed = time_backend(backend, conv_dirs, args.sample_rate)
+            results[backend] = elapsed
+            per_conv = elapsed / args.conversations * 1000
+            print(f"{backend:.<50} {elapsed:>8.2f}s ({per_conv:>7.1f} ms/conversation)")
+
+        print("-"*80)
+        if results["numpy"] > 0:
+            print(f"{'Speedup (pydub / numpy)':.<50} {results['pydub'] / results['numpy']:>8.2f}x")
+        print("="*80)
+
+
+if __name__ == "__main__":
+    main()
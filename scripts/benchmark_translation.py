@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Translation Benchmark
+
+Compares translation backends created through TranslatorFactory (Google,
+Qwen-MT turbo/plus, Argos) on throughput, per-line latency, token spend and
+agreement with a reference translation. Network services are replaced by
+local stubs that answer from the cached outputs in data/translation_cache
+after a simulated request latency, so no API calls are made and each
+backend's output is its real cached translation. Argos is offline and runs
+for real when argostranslate and the source file are available.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+import types
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add doc and doc/src to Python path (package code lives under doc/src)
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(repo_root, 'doc'))
+sys.path.insert(0, os.path.join(repo_root, 'doc', 'src'))
+
+
+BACKENDS = ["google", "qwen-mt-turbo", "qwen-mt-plus", "argos"]
+
+# Simulated request latency for stubbed backends: fixed overhead plus time per output character
+SERVICE_LATENCY = {
+    "google": {"overhead_ms": 150.0, "ms_per_char": 0.2},
+    "qwen-mt-turbo": {"overhead_ms": 450.0, "ms_per_char": 1.0},
+    "qwen-mt-plus": {"overhead_ms": 800.0, "ms_per_char": 2.5},
+}
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\d{5}\}")
+CJK_PATTERN = re.compile(r"[　-鿿豈-﫿]")
+
+# Character n-gram orders and recall weight for chrF
+CHRF_ORDER = 6
+CHRF_BETA = 2.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: one per CJK character, one per four other characters."""
+    cjk = len(CJK_PATTERN.findall(text))
+    return cjk + max(1, (len(text) - cjk) // 4)
+
+
+class StubService:
+    """
+    Answers translation requests for one backend from its cached output file.
+
+    Requests are matched by source line (up to whitespace); unknown text is
+    echoed back. Every request waits for the backend's simulated latency,
+    multiplied by time_scale to keep the run short.
+    """
+
+    def __init__(self, sources: List[str], outputs: List[str], overhead_ms: float,
+                 ms_per_char: float, time_scale: float):
+        self.answers = {" ".join(source.split()): output for source, output in zip(sources, outputs)}
+        self.overhead_ms = overhead_ms
+        self.ms_per_char = ms_per_char
+        self.time_scale = time_scale
+        self.requests = 0
+
+    def answer(self, text: str) -> str:
+        return self.answers.get(" ".join(text.split()), text)
+
+    def delay(self, output_chars: int) -> float:
+        """Count a request and return its scaled latency in seconds."""
+        self.requests += 1
+        return (self.overhead_ms + output_chars * self.ms_per_char) / 1000 * self.time_scale
+
+
+def install_stubs(services: Dict[str, StubService]):
+    """
+    Register stand-ins for deep_translator and openai before the translators import them.
+
+    Args:
+        services: Stub per backend name ("google", "qwen-mt-turbo", "qwen-mt-plus")
+    """
+
+    class GoogleTranslatorClient:
+        """Blocking, like deep_translator's client."""
+
+        def __init__(self, source: str = "auto", target: str = "en"):
+            self.source, self.target = source, target
+
+        def translate(self, text: str) -> str:
+            service = services["google"]
+            translated = service.answer(text)
+            time.sleep(service.delay(len(translated)))
+            return translated
+
+        def translate_batch(self, texts: List[str]) -> List[str]:
+            # deep_translator sends one request per text in a batch
+            return [self.translate(text) for text in texts]
+
+    class Completions:
+        async def create(self, model: str, messages: List[Dict], extra_body: Optional[Dict] = None):
+            from translation.qwen_translator import SEGMENT_DELIMITER, SEGMENT_SPLIT_PATTERN
+            service = services[model]
+            content = messages[-1]["content"]
+            segments = SEGMENT_SPLIT_PATTERN.split(content.strip())
+            translated = SEGMENT_DELIMITER.join(service.answer(segment) for segment in segments)
+            await asyncio.sleep(service.delay(len(translated)))
+            prompt_tokens, completion_tokens = estimate_tokens(content), estimate_tokens(translated)
+            return types.SimpleNamespace(
+                choices=[types.SimpleNamespace(message=types.SimpleNamespace(content=translated))],
+                usage=types.SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                                            total_tokens=prompt_tokens + completion_tokens)
+            )
+
+    class OpenAIClient:
+        def __init__(self, api_key: str = "", base_url: str = ""):
+            self.chat = types.SimpleNamespace(completions=Completions())
+
+    deep_translator = types.ModuleType("deep_translator")
+    deep_translator.GoogleTranslator = GoogleTranslatorClient
+    openai = types.ModuleType("openai")
+    openai.OpenAI = OpenAIClient
+    openai.AsyncOpenAI = OpenAIClient
+    sys.modules["deep_translator"] = deep_translator
+    sys.modules["openai"] = openai
+
+
+def read_lines(path: Path, limit: Optional[int]) -> List[str]:
+    """Read stripped lines from a text file, up to limit."""
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = [line.strip() for line in f]
+    return lines[:limit] if limit else lines
+
+
+def chrf(hypothesis: str, reference: str) -> float:
+    """
+    Character n-gram F-score (chrF) of one line against its reference.
+
+    Args:
+        hypothesis: Translated line
+        reference: Reference line
+
+    Returns:
+        Score between 0 and 100
+    """
+    hypothesis, reference = "".join(hypothesis.split()), "".join(reference.split())
+    precisions, recalls = [], []
+    for n in range(1, CHRF_ORDER + 1):
+        hyp = Counter(hypothesis[i:i + n] for i in range(len(hypothesis) - n + 1))
+        ref = Counter(reference[i:i + n] for i in range(len(reference) - n + 1))
+        if not hyp or not ref:
+            continue
+        overlap = sum((hyp & ref).values())
+        precisions.append(overlap / sum(hyp.values()))
+        recalls.append(overlap / sum(ref.values()))
+    if not precisions:
+        return 100.0 if hypothesis == reference else 0.0
+    precision, recall = sum(precisions) / len(precisions), sum(recalls) / len(recalls)
+    if precision + recall == 0:
+        return 0.0
+    beta2 = CHRF_BETA ** 2
+    return 100 * (1 + beta2) * precision * recall / (beta2 * precision + recall)
+
+
+def agreement(outputs: List[str], references: List[str]) -> Dict:
+    """
+    Agreement of a backend's output with the reference set.
+
+    Args:
+        outputs: Translated lines
+        references: Reference lines, aligned with outputs
+
+    Returns:
+        Dictionary with exact-match rate, mean chrF and placeholder agreement
+    """
+    pairs = [(out, ref) for out, ref in zip(outputs, references) if ref]
+    if not pairs:
+        return {"exact_match": 0.0, "chrf": 0.0, "placeholder_match": 0.0}
+    return {
+        "exact_match": sum(out == ref for out, ref in pairs) / len(pairs),
+        "chrf": sum(chrf(out, ref) for out, ref in pairs) / len(pairs),
+        # Same placeholder codes, in the same order, as the reference
+        "placeholder_match": sum(
+            PLACEHOLDER_PATTERN.findall(out) == PLACEHOLDER_PATTERN.findall(ref) for out, ref in pairs
+        ) / len(pairs),
+    }
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+def build_config(args, model: str):
+    """
+    Translator settings for the benchmark.
+
+    The translators read their settings with getattr defaults, so a plain
+    namespace stands in for the locale Config. The translation memory and
+    resume are off so every run sends its requests.
+    """
+    return types.SimpleNamespace(
+        verbose=False,
+        translation_track_tokens=True,
+        translation_memory_enabled=False,
+        translation_resume=False,
+        translation_batch_size=args.batch_size,
+        max_concurrent_translations=args.concurrency,
+        qwen_model=model,
+        dashscope_api_key="benchmark",
+        translation_argos_offline=True,
+        translation_argos_workers=args.argos_workers,
+    )
+
+
+async def run_backend(translator, lines: List[str], args) -> Dict:
+    """
+    Translate lines in chunks and time each chunk.
+
+    Chunks hold the translator's file batch (or translation_batch_size
+    segments, whichever is larger); at most --concurrency chunks run at once.
+    Every line in a chunk gets the chunk's latency.
+
+    Returns:
+        Dictionary with outputs, per-line latencies and wall time in seconds
+    """
+    chunk_size = max(translator.file_batch_lines, args.batch_size)
+    chunks = [list(range(start, min(start + chunk_size, len(lines))))
+              for start in range(0, len(lines), chunk_size)]
+    outputs = list(lines)
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def translate_chunk(indexes: List[int]):
+        async with semaphore:
+            start = time.perf_counter()
+            translated = await translator.translate_batch(
+                [lines[i] for i in indexes], args.from_code, args.to_code
+            )
+            elapsed = time.perf_counter() - start
+        for i, text in zip(indexes, translated):
+            outputs[i] = text
+        latencies.extend([elapsed] * len(indexes))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(translate_chunk(chunk) for chunk in chunks))
+    return {"outputs": outputs, "latencies": latencies, "wall": time.perf_counter() - start}
+
+
+def benchmark(name: str, sources: List[str], references: List[str],
+              stubs: Dict[str, StubService], args) -> Optional[Dict]:
+    """
+    Benchmark one backend.
+
+    Returns:
+        Result row, or None if the backend is unavailable
+    """
+    from translation.translator import TranslatorFactory
+
+    service = "qwen" if name.startswith("qwen") else name
+    try:
+        translator = TranslatorFactory.create(service, build_config(args, name))
+    except ImportError as e:
+        print(f"{name:.<30} skipped ({e})")
+        return None
+
+    with translator:
+        run = asyncio.run(run_backend(translator, sources, args))
+        token_summary = translator.get_token_summary() if service == "qwen" else None
+
+    # Stub latencies are scaled down; report them at full size
+    scale = stubs[name].time_scale if name in stubs else 1.0
+    wall = run["wall"] / scale
+    latencies = [latency / scale for latency in run["latencies"]]
+    row = {
+        "backend": name,
+        "lines": len(sources),
+        "requests": stubs[name].requests if name in stubs else None,
+        "lines_per_sec": len(sources) / wall if wall else 0.0,
+        "p50_latency_ms": percentile(latencies, 0.5) * 1000,
+        "p95_latency_ms": percentile(latencies, 0.95) * 1000,
+        "agreement": agreement(run["outputs"], references),
+    }
+    if token_summary:
+        summary, cost = token_summary["summary"], token_summary.get("cost") or {}
+        row["tokens"] = {
+            "input": summary["total_input_tokens"],
+            "output": summary["total_output_tokens"],
+            "calls": summary["total_calls"],
+        }
+        if cost:
+            row["cost_usd"] = cost["total_cost"]
+            row["cost_per_1k_lines_usd"] = cost["total_cost"] / len(sources) * 1000
+    return row
+
+
+def report(rows: List[Dict], reference_name: str):
+    """Print throughput, latency, cost and agreement per backend."""
+    print(f"\n{'backend':<15} {'lines/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'requests':>9} "
+          f"{'tokens':>9} {'$/1k lines':>11}")
+    print("-"*80)
+    for row in rows:
+        tokens = row.get("tokens")
+        cost = row.get("cost_per_1k_lines_usd")
+        print(f"{row['backend']:<15} {row['lines_per_sec']:>8.1f} {row['p50_latency_ms']:>8.0f} "
+              f"{row['p95_latency_ms']:>8.0f} {row['requests'] if row['requests'] is not None else '-':>9} "
+              f"{tokens['input'] + tokens['output'] if tokens else '-':>9} "
+              f"{f'{cost:.4f}' if cost is not None else '-':>11}")
+
+    print(f"\nAgreement with {reference_name}")
+    print(f"{'backend':<15} {'exact':>8} {'chrF':>8} {'placeholders':>13}")
+    print("-"*80)
+    for row in rows:
+        scores = row["agreement"]
+        print(f"{row['backend']:<15} {scores['exact_match']:>8.1%} {scores['chrf']:>8.1f} "
+              f"{scores['placeholder_match']:>13.1%}")
+
+
+def main():
+    with open(Path(repo_root) / "configs" / "common.json", 'r', encoding='utf-8') as f:
+        translation_config = json.load(f).get("translation", {})
+    cache_dir = Path(repo_root) / "data" / "translation_cache"
+    output_name = translation_config.get("english_output", "scamGen_combined_first_20k_en.txt")
+    cached_outputs = {
+        "google": cache_dir / "google" / output_name,
+        "qwen-mt-turbo": cache_dir / "qwen" / "qwen-mt-turbo" / output_name,
+        "qwen-mt-plus": cache_dir / "qwen" / "qwen-mt-plus" / output_name,
+    }
+
+    parser = argparse.ArgumentParser(description="Benchmark translation backends")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=BACKENDS, help="Backends to run")
+    parser.add_argument("--source", type=Path,
+                        default=Path(repo_root) / "data" / "input" / "scamGen_combined_first_20k.txt",
+                        help="Source lines the cached outputs were translated from")
+    parser.add_argument("--reference", default="qwen-mt-plus",
+                        help="Reference translation: a backend name or a file aligned with the source")
+    parser.add_argument("--lines", type=int, default=None, help="Limit the number of lines")
+    parser.add_argument("--from-code", default=translation_config.get("chinese_code", "zh-CN"),
+                        help="Source language code")
+    parser.add_argument("--to-code", default="en", help="Target language code")
+    parser.add_argument("--batch-size", type=int, default=translation_config.get("batch_size", 1),
+                        help="translation.batch_size for the translators")
+    parser.add_argument("--concurrency", type=int,
+                        default=translation_config.get("max_concurrent_translations", 10),
+                        help="Concurrent chunks (and translation.max_concurrent_translations)")
+    parser.add_argument("--argos-workers", type=int,
+                        default=translation_config.get("argos", {}).get("workers", 0),
+                        help="translation.argos.workers")
+    parser.add_argument("--time-scale", type=float, default=0.05, help="Scale applied to simulated latency")
+    parser.add_argument("--output", type=Path, default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    if args.reference in cached_outputs:
+        reference_path = cached_outputs[args.reference]
+    else:
+        reference_path = Path(args.reference)
+    references = read_lines(reference_path, args.lines)
+
+    # Without the source file the reference lines stand in as the text sent to
+    # stubbed services; Argos needs the real source
+    has_source = args.source.exists()
+    sources = read_lines(args.source, args.lines) if has_source else list(references)
+
+    stubs = {}
+    for name, path in cached_outputs.items():
+        if name in args.backends:
+            outputs = read_lines(path, args.lines)
+            stubs[name] = StubService(sources, outputs, time_scale=args.time_scale, **SERVICE_LATENCY[name])
+    install_stubs(stubs)
+
+    print("\n" + "="*80)
+    print("TRANSLATION BENCHMARK")
+    print("="*80)
+    print(f"{len(sources)} lines ({args.from_code} -> {args.to_code}), batch size {args.batch_size}, "
+          f"concurrency {args.concurrency}")
+    if not has_source:
+        print(f"Source file {args.source} not found; stubbed services receive the reference lines")
+
+    rows = []
+    for name in args.backends:
+        if name == "argos" and not has_source:
+            print(f"{name:.<30} skipped (needs the source file)")
+            continue
+        row = benchmark(name, sources, references, stubs, args)
+        if row:
+            rows.append(row)
+
+    report(rows, args.reference)
+    print("="*80)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"lines": len(sources), "reference": args.reference, "results": rows}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+TTS Batching Benchmark
+
+Compares the TTS batch modes of VoiceSynthesizer ("off", "stitch", "merge") on
+requests per conversation and simulated wall time. Requests are planned with
+the same code the synthesizer uses; each request is then replayed as a sleep
+of fixed overhead plus per-character synthesis time under the account's
+concurrency limit, so no API calls are made.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import os
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# Add doc and doc/src to Python path (package code lives under doc/src)
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(repo_root, 'doc'))
+sys.path.insert(0, os.path.join(repo_root, 'doc', 'src'))
+
+from tts.request_stitching import BATCH_MODES, TURN_SEPARATOR, plan_requests
+
+
+def load_conversations(path: Path) -> List[Dict]:
+    """
+    Load conversations from a generated conversations JSON file.
+
+    Args:
+        path: JSON file (list or {"conversations": [...]})
+
+    Returns:
+        List of conversation dictionaries
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get('conversations', []) if isinstance(data, dict) else data
+
+
+def synthetic_conversations(count: int, turns: int, same_speaker_prob: float,
+                            rng: random.Random) -> List[Dict]:
+    """
+    Build dialogues where a speaker sometimes keeps the floor for several turns.
+
+    Args:
+        count: Number of conversations
+        turns: Turns per conversation
+        same_speaker_prob: Probability that a turn has the same speaker as the previous one
+        rng: Random generator
+
+    Returns:
+        List of conversation dictionaries
+    """
+    conversations = []
+    for conversation_id in range(1, count + 1):
+        role = "caller"
+        dialogue = []
+        for sent_id in range(1, turns + 1):
+            if dialogue and rng.random() >= same_speaker_prob:
+                role = "callee" if role == "caller" else "caller"
+            text = " ".join("word" for _ in range(rng.randint(6, 30)))
+            dialogue.append({"sent_id": sent_id, "role": role, "text": text})
+        conversations.append({"conversation_id": conversation_id, "dialogue": dialogue})
+    return conversations
+
+
+async def simulate(conversations: List[Dict], mode: str, concurrency: int,
+                   overhead_ms: float, ms_per_char: float, time_scale: float) -> float:
+    """
+    Replay every planned request as a sleep under a concurrency limit.
+
+    Args:
+        conversations: Conversations to synthesize
+        mode: Batch mode
+        concurrency: Maximum requests in flight
+        overhead_ms: Fixed per-request latency
+        ms_per_char: Synthesis time per character
+        time_scale: Factor applied to every sleep to keep the run short
+
+    Returns:
+        Simulated wall time in seconds (unscaled)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request(chars: int):
+        async with semaphore:
+            await asyncio.sleep((overhead_ms + chars * ms_per_char) / 1000 * time_scale)
+
+    tasks = []
+    for conversation in conversations:
+        dialogue = conversation["dialogue"]
+        for planned in plan_requests(dialogue, mode):
+            chars = sum(len(dialogue[index]["text"]) for index in planned.turn_indexes)
+            chars += len(TURN_SEPARATOR) * (len(planned.turn_indexes) - 1)
+            tasks.append(request(chars))
+
+    start = time.perf_counter()
+    await asyncio.gather(*tasks)
+    return (time.perf_counter() - start) / time_scale
+
+
+def report(label: str, conversations: List[Dict], args):
+    """Print requests/conversation and simulated wall time for every mode."""
+    print(f"\n{label}: {len(conversations)} conversations, "
+          f"{sum(len(c['dialogue']) for c in conversations)} turns")
+    print("-"*80)
+
+    baseline = None
+    for mode in BATCH_MODES:
+        requests = sum(len(plan_requests(c["dialogue"], mode)) for c in conversations)
+        elapsed = asyncio.run(simulate(
+            conversations, mode, args.concurrency, args.overhead_ms, args.ms_per_char, args.time_scale
+        ))
+        baseline = baseline or elapsed
+        per_conv = requests / max(len(conversations), 1)
+        print(f"{mode:.<50} {per_conv:>8.2f} req/conv {elapsed:>8.2f}s "
+              f"({baseline / elapsed if elapsed else 0:>5.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TTS batch modes")
+    parser.add_argument("--input", type=Path, default=None,
+                        help="Conversations JSON to plan against (e.g. output/<locale>/scam_conversations.json)")
+    parser.add_argument("--conversations", type=int, default=50, help="Synthetic conversations")
+    parser.add_argument("--turns", type=int, default=24, help="Turns per synthetic conversation")
+    parser.add_argument("--same-speaker-prob", type=float, default=0.3,
+                        help="Chance a synthetic turn keeps the previous speaker")
+    parser.add_argument("--concurrency", type=int, default=5, help="Concurrent TTS requests allowed")
+    parser.add_argument("--overhead-ms", type=float, default=350.0, help="Fixed latency per request")
+    parser.add_argument("--ms-per-char", type=float, default=2.0, help="Synthesis time per character")
+    parser.add_argument("--time-scale", type=float, default=0.01, help="Scale applied to simulated sleeps")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print("TTS BATCHING BENCHMARK")
+    print("="*80)
+    print(f"Concurrency {args.concurrency}, {args.overhead_ms:.0f} ms/request + {args.ms_per_char:.1f} ms/char")
+
+    if args.input:
+        report(str(args.input), load_conversations(args.input), args)
+
+    rng = random.Random(args.seed)
+    report(
+        f"Synthetic (same-speaker p={args.same_speaker_prob})",
+        synthetic_conversations(args.conversations, args.turns, args.same_speaker_prob, rng),
+        args
+    )
+    print("="*80)
+
+
+if __name__ == "__main__":
+    main()